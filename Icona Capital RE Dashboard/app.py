@@ -2,7 +2,8 @@
 
 import streamlit as st
 from utils.session_manager import initialize_session_state
-from utils.authentication import AuthenticationService
+from core.services import services
+from config.logger import setup_logging
 from components import landing_page, dashboard, signup_page
 import time
 
@@ -14,8 +15,9 @@ def main():
         initial_sidebar_state="collapsed"
     )
 
+    setup_logging()
     initialize_session_state()
-    auth_service = AuthenticationService()
+    auth_service = services.auth_service
 
     # Handle page navigation
     if st.session_state['current_page'] == 'Login':
@@ -2,7 +2,8 @@
 
 import streamlit as st
 from utils.session_manager import initialize_session_state
-import time
+from config.settings import settings
+from components import dashboard
 from pathlib import Path
 import base64
 
@@ -16,10 +17,13 @@ def show_landing_page():
 
     # Show animation only if it hasn't been viewed yet
     if st.session_state.get('show_animation', False):
+        # The overlay dismisses itself in the browser, so render the
+        # dashboard underneath right away instead of waiting for it
         show_animation()
         st.session_state['show_animation'] = False
         st.session_state['landing_viewed'] = True
-        st.rerun()
+        st.session_state['current_page'] = 'Dashboard'
+        dashboard.show_dashboard()
     else:
         if st.session_state.get('landing_viewed', False):
             # Redirect to dashboard if landing page has been viewed
@@ -68,15 +72,24 @@ def show_animation():
         logo_contents = f.read()
         logo_data_url = f"data:image/png;base64,{base64.b64encode(logo_contents).decode()}"
 
-    st.markdown(get_animation_css(), unsafe_allow_html=True)
+    st.markdown(get_animation_css(settings.ANIMATION_DURATION), unsafe_allow_html=True)
     st.markdown(get_animation_html(logo_data_url), unsafe_allow_html=True)
 
-    # Wait for the animation duration
-    time.sleep(5)
-
 
-def get_animation_css() -> str:
-    return """
+def get_animation_css(duration: float, fade_out: float = 0.6) -> str:
+    # The overlay fades out client-side after `duration` seconds
+    return f"""
+    <style>
+        .animation-container {{
+            animation: overlayOut {fade_out}s ease-in {duration}s forwards;
+        }}
+
+        @keyframes overlayOut {{
+            from {{ opacity: 1; visibility: visible; }}
+            to {{ opacity: 0; visibility: hidden; pointer-events: none; }}
+        }}
+    </style>
+    """ + """
     <style>
         .animation-container {
             display: flex;
@@ -1,14 +1,84 @@
 # config/logger.py
+
+import atexit
+import json
 import logging
-from pathlib import Path
-
-def setup_logging():
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    logging.basicConfig(
-        filename=log_dir / "app.log",
-        level=logging.WARNING,  # Set to WARNING or ERROR to suppress INFO logs
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    logging.getLogger(__name__)
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from config.settings import settings
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that hands the raw record to the listener thread.
+
+    The stock QueueHandler formats the message in the calling thread so the
+    record can be pickled; records here never leave the process, so message
+    interpolation and exception formatting are left to the writer thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """
+    Route all logging through a background writer.
+
+    Log calls only enqueue the record; a QueueListener thread formats it as
+    JSON and writes it to a size-rotated file. Safe to call on every rerun:
+    only the first call configures anything.
+
+    Args:
+        level (Optional[str]): Root log level, defaults to settings.LOG_LEVEL
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        settings.LOG_DIR.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            settings.LOG_DIR / "app.log",
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(DeferredQueueHandler(log_queue))
+        root.setLevel(level or settings.LOG_LEVEL)
+
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
@@ -11,6 +11,7 @@ class Settings:
     BASE_DIR: pathlib.Path = pathlib.Path(__file__).parent.parent
     DATABASE_DIR: pathlib.Path = field(init=False)
     LOGO_DIR: pathlib.Path = field(init=False)
+    LOG_DIR: pathlib.Path = field(init=False)
 
     # File paths
     USERS_FILE: pathlib.Path = field(init=False)
@@ -34,6 +35,11 @@ class Settings:
     MIN_PROJECT_DESCRIPTION_LENGTH: int = 10
     MAX_PROJECT_DESCRIPTION_LENGTH: int = 1000
 
+    # Logging settings
+    LOG_LEVEL: str = "WARNING"  # Set to WARNING or ERROR to suppress INFO logs
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+
     # Cache settings
     CACHE_EXPIRY: int = 300  # 5 minutes
 
@@ -51,6 +57,7 @@ class Settings:
         """Initialize paths after BASE_DIR is set"""
         self.DATABASE_DIR = self.BASE_DIR / "data"
         self.LOGO_DIR = self.BASE_DIR / "statics" / "image"
+        self.LOG_DIR = self.BASE_DIR / "logs"
         self.USERS_FILE = self.DATABASE_DIR / "users.json"
         self.PROJECTS_FILE = self.DATABASE_DIR / "projects.json"
 
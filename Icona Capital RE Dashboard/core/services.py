@@ -0,0 +1,86 @@
+# core/services.py
+
+import threading
+from typing import Any, Callable, Dict
+
+from core.exceptions import AppException
+
+class ServiceRegistry:
+    """
+    Process-wide registry of long-lived services.
+
+    Streamlit re-executes the app script on every interaction, but imported
+    modules stay loaded, so services registered here are created once per
+    process and shared by every session and rerun. Factories run lazily on
+    first access.
+
+    Attributes:
+        _factories (Dict[str, Callable[[], Any]]): Service constructors by name
+        _instances (Dict[str, Any]): Services created so far
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register a service factory, replacing any existing instance
+
+        Args:
+            name (str): Service name
+            factory (Callable[[], Any]): Zero-argument constructor
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance of a service, creating it on first use
+
+        Args:
+            name (str): Service name
+
+        Returns:
+            Any: Service instance
+
+        Raises:
+            AppException: If no factory is registered under that name
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise AppException(f"Unknown service: {name}")
+                self._instances[name] = factory()
+            return self._instances[name]
+
+    def reset(self) -> None:
+        """Drop all created instances so they are rebuilt on next access"""
+        with self._lock:
+            self._instances.clear()
+
+    @property
+    def user_store(self):
+        return self.get("user_store")
+
+    @property
+    def auth_service(self):
+        return self.get("auth_service")
+
+def _register_defaults(registry: ServiceRegistry) -> None:
+    """Register the application's default services"""
+    from database.user_store import UserStore
+    from utils.authentication import AuthenticationService
+
+    registry.register("user_store", UserStore)
+    registry.register("auth_service", lambda: AuthenticationService(registry.user_store))
+
+services = ServiceRegistry()
+_register_defaults(services)
@@ -19,7 +19,7 @@ class User:
         try:
             return asdict(self)
         except Exception as e:
-            logging.error(f"Error converting user to dict: {str(e)}")
+            logging.error("Error converting user to dict: %s", e)
             raise DatabaseError("Failed to convert user data")
 
 class UserStore:
@@ -33,7 +33,7 @@ class UserStore:
         try:
             settings.DATABASE_DIR.mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            logging.error(f"Failed to create database directory: {str(e)}")
+            logging.error("Failed to create database directory: %s", e)
             raise DatabaseError("Could not initialize database directory")
 
     def _read_users(self) -> Dict:
@@ -55,10 +55,10 @@ class UserStore:
                     raise DatabaseError("Invalid data format in users file")
                 return data
         except json.JSONDecodeError as e:
-            logging.error(f"JSON decode error reading users file: {str(e)}")
+            logging.error("JSON decode error reading users file: %s", e)
             raise DatabaseError("Invalid JSON in users file")
         except Exception as e:
-            logging.error(f"Error reading users file: {str(e)}")
+            logging.error("Error reading users file: %s", e)
             raise DatabaseError(f"Failed to read users data: {str(e)}")
 
     def _write_users(self, users: Dict) -> None:
@@ -75,10 +75,10 @@ class UserStore:
             with open(self.file_path, 'w', encoding='utf-8') as f:
                 json.dump(users, f, indent=2, ensure_ascii=False)
         except (IOError, OSError) as e:
-            logging.error(f"IO error writing users file: {str(e)}")
+            logging.error("IO error writing users file: %s", e)
             raise DatabaseError("Failed to write to users file")
         except Exception as e:
-            logging.error(f"Unexpected error writing users file: {str(e)}")
+            logging.error("Unexpected error writing users file: %s", e)
             raise DatabaseError(f"Failed to save users data: {str(e)}")
 
     def get_user(self, username: str) -> Optional[User]:
@@ -108,10 +108,10 @@ class UserStore:
                 )
             return None
         except KeyError as e:
-            logging.error(f"Missing required user field: {str(e)}")
+            logging.error("Missing required user field: %s", e)
             raise DatabaseError("Invalid user data format")
         except Exception as e:
-            logging.error(f"Error retrieving user: {str(e)}")
+            logging.error("Error retrieving user: %s", e)
             raise DatabaseError(f"Failed to retrieve user: {str(e)}")
 
     def create_user(self, user: User) -> bool:
@@ -140,5 +140,5 @@ class UserStore:
             return True
 
         except Exception as e:
-            logging.error(f"Error creating user: {str(e)}")
+            logging.error("Error creating user: %s", e)
             raise DatabaseError(f"Failed to create user: {str(e)}")
@@ -3,12 +3,12 @@
 from database.user_store import UserStore, User
 from core.exceptions import AuthenticationError, ValidationError
 from utils.validators import InputValidator
-from typing import Tuple
+from typing import Optional, Tuple
 
 class AuthenticationService:
     """Handles user authentication"""
-    def __init__(self):
-        self.user_store = UserStore()
+    def __init__(self, user_store: Optional[UserStore] = None):
+        self.user_store = user_store or UserStore()
         self.validator = InputValidator()
 
     def login(self, username: str, password: str) -> Tuple[bool, str]:
@@ -5,9 +5,13 @@ from enum import Enum, auto
 from dataclasses import dataclass
 from ui.pages import LoginPage, SignupPage, MainPage
 from ui.page.dashboard import DashboardPage
+from ui.page.admin import AdminPerformancePage
 from core.exceptions import AppException
+from core.services import ServiceRegistry, services as default_services
+from utils.timing import Timer, render_timings
+from utils.profiler import profiler
 import logging
-from pathlib import Path
+from config.logger import setup_logging
 from streamlit_navigation_bar import st_navbar
 
 class PageID(Enum):
@@ -16,6 +20,7 @@ class PageID(Enum):
     SIGNUP = auto()
     MAIN = auto()
     DASHBOARD = auto()
+    ADMIN = auto()
 
 @dataclass
 class PageConfig:
@@ -24,6 +29,7 @@ class PageConfig:
     requires_auth: bool
     icon: Optional[str] = None
     order: Optional[int] = None
+    admin_only: bool = False
 
 class Application:
     """
@@ -32,6 +38,7 @@ class Application:
     Attributes:
         pages (Dict[PageID, Type]): Mapping of page IDs to page classes
         page_configs (Dict[PageID, PageConfig]): Page-specific configurations
+        services (ServiceRegistry): Long-lived services injected into pages
     """
     
     # Page configurations
@@ -39,25 +46,20 @@ class Application:
         PageID.LOGIN: PageConfig("Login", False, "🔑", 1),
         PageID.SIGNUP: PageConfig("Sign Up", False, "📝", 2),
         PageID.MAIN: PageConfig("Main", True, "🏠", 3),
-        PageID.DASHBOARD: PageConfig("Dashboard", True, "📊", 4)
+        PageID.DASHBOARD: PageConfig("Dashboard", True, "📊", 4),
+        PageID.ADMIN: PageConfig("Performance", True, "⏱", 5, admin_only=True)
     }
 
-    def __init__(self):
+    def __init__(self, services: Optional[ServiceRegistry] = None):
         """Initialize application state and logging"""
+        self.services = services or default_services
         self._setup_logging()
         self._initialize_session_state()
         self._initialize_pages()
         
     def _setup_logging(self) -> None:
         """Configure application logging"""
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-        
-        logging.basicConfig(
-            filename=log_dir / "app.log",
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        setup_logging()
         self.logger = logging.getLogger(__name__)
 
     def _initialize_session_state(self) -> None:
@@ -81,7 +83,7 @@ class Application:
                     st.session_state[key] = default_value
                     
         except Exception as e:
-            self.logger.error(f"Session state initialization failed: {str(e)}")
+            self.logger.error("Session state initialization failed: %s", e)
             raise AppException("Failed to initialize application state")
 
     def _initialize_pages(self) -> None:
@@ -91,10 +93,11 @@ class Application:
                 PageID.LOGIN: LoginPage,
                 PageID.SIGNUP: SignupPage,
                 PageID.MAIN: MainPage,
-                PageID.DASHBOARD: DashboardPage
+                PageID.DASHBOARD: DashboardPage,
+                PageID.ADMIN: AdminPerformancePage
             }
         except Exception as e:
-            self.logger.error(f"Page initialization failed: {str(e)}")
+            self.logger.error("Page initialization failed: %s", e)
             raise AppException("Failed to initialize application pages")
 
     def _handle_navigation(self) -> None:
@@ -104,7 +107,7 @@ class Application:
                 # Only show navigation items for authenticated pages
                 nav_pages = {
                     page_id: config for page_id, config in self.PAGE_CONFIGS.items()
-                    if config.requires_auth
+                    if config.requires_auth and (not config.admin_only or self._is_admin())
                 }
                 
                 # Sort pages by order
@@ -144,7 +147,7 @@ class Application:
                                 self._navigate_to(page_id)
 
         except Exception as e:
-            self.logger.error(f"Navigation handling failed: {str(e)}")
+            self.logger.error("Navigation handling failed: %s", e)
             st.error("Navigation system encountered an error")
 
 
@@ -157,26 +160,33 @@ class Application:
         """
         config = self.PAGE_CONFIGS.get(page_id)
         if not config:
-            self.logger.error(f"Invalid page ID: {page_id}")
+            self.logger.error("Invalid page ID: %s", page_id)
             return
             
         if config.requires_auth and not st.session_state['authenticated']:
             st.warning("Please log in to access this page")
             page_id = PageID.LOGIN
+        elif config.admin_only and not self._is_admin():
+            st.warning("This page is only available to administrators")
+            return
             
         st.session_state['current_page'] = page_id
         st.rerun()
 
+    @staticmethod
+    def _is_admin() -> bool:
+        return st.session_state.get('user_role') == 'admin'
+
     def _handle_logout(self) -> None:
         """Handle user logout and session cleanup"""
         try:
-            self.logger.info(f"User logout: {st.session_state.get('user_id')}")
+            self.logger.info("User logout: %s", st.session_state.get('user_id'))
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             self._initialize_session_state()
             st.rerun()
         except Exception as e:
-            self.logger.error(f"Logout failed: {str(e)}")
+            self.logger.error("Logout failed: %s", e)
             st.error("Failed to log out properly")
 
     def _get_current_page(self) -> PageID:
@@ -192,10 +202,31 @@ class Application:
         if st.session_state.get('show_animation', False):
             return PageID.MAIN
             
-        return st.session_state.get('current_page', PageID.MAIN)
+        return self._coerce_page_id(st.session_state.get('current_page', PageID.MAIN))
+
+    @staticmethod
+    def _coerce_page_id(value) -> PageID:
+        """
+        Map a stored page identifier onto this run's PageID enum.
+
+        Streamlit re-executes this module on every rerun, so members stored in
+        session state by a previous run belong to a different PageID class.
+        """
+        if isinstance(value, PageID):
+            return value
+        name = getattr(value, 'name', value)
+        return PageID.__members__.get(name, PageID.MAIN)
 
     def run(self) -> None:
         """Run the application with error handling"""
+        # One unit of work per rerun: every project read is served from a
+        # single snapshot, loaded at most once
+        with Timer("rerun"), self.services.project_store.read_scope():
+            self._run()
+        render_timings()
+
+    def _run(self) -> None:
+        """Route to and render the current page"""
         try:
             current_page = self._get_current_page()
             st.session_state['current_page'] = current_page
@@ -205,18 +236,19 @@ class Application:
 
             page_class = self.pages.get(current_page)
             if page_class:
-                page_instance = page_class()
-                page_instance.render()
+                page_instance = page_class(self.services)
+                with profiler.span(f"page:{current_page.name.lower()}"):
+                    page_instance.render()
             else:
                 st.error("Page not found!")
-                self.logger.error(f"Invalid page requested: {current_page}")
+                self.logger.error("Invalid page requested: %s", current_page)
 
             # Update page history
             if current_page not in st.session_state['page_history']:
                 st.session_state['page_history'].append(current_page)
                 
         except Exception as e:
-            self.logger.error(f"Application runtime error: {str(e)}")
+            self.logger.error("Application runtime error: %s", e)
             st.error("An unexpected error occurred. Please try refreshing the page.")
 
 def main():
@@ -234,7 +266,7 @@ def main():
                 
     except Exception as e:
         st.error("Failed to start application. Please contact support.")
-        logging.error(f"Application startup failed: {str(e)}")
+        logging.error("Application startup failed: %s", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+# benchmarks/__init__.py
+import subprocess
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit, used to label result files"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
@@ -0,0 +1,98 @@
+# benchmarks/company_bench.py
+"""
+Time company typeahead on a synthetic registry.
+
+Loads the registry into a CompanyStore in a temporary directory, then
+replays typing sample queries one keystroke at a time and times every
+search. Also times the cold load (parse and index) and a single create,
+which updates the indexes in place. Exits with status 1 if the slowest
+keystroke exceeds the budget.
+
+Run from the project root:
+    python -m benchmarks.company_bench --companies 50000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from database.company_store import CompanyStore
+from models.company import Company
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import generate_companies
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--companies", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200, help="Sample names typed keystroke by keystroke")
+    parser.add_argument("--sharded", action="store_true", help="Store one file per company")
+    parser.add_argument("--budget", type=float, default=0.005, help="Maximum seconds for one keystroke")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / ("companies" if args.sharded else "companies.json")
+        CompanyStore(path).import_companies(generate_companies(args.companies, projects=args.companies))
+
+        store = CompanyStore(path)
+        start = time.perf_counter()
+        companies = store.get_all_companies()
+        load_s = time.perf_counter() - start
+
+        rng = random.Random(0)
+        samples = [c.name for c in rng.sample(companies, min(args.queries, len(companies)))]
+        # Mix whole-name prefixes with queries starting at a later word
+        queries = [name if i % 2 else name.split(" ", 2)[-1] for i, name in enumerate(samples)]
+        timings = []
+        for query in queries:
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                store.search(query[:end])
+                timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        store.create_company(Company(id="company-new", name="Zenith Lyon Holdings SAS"))
+        create_s = time.perf_counter() - start
+
+    timings.sort()
+    results = {
+        "load_s": load_s,
+        "keystrokes": len(timings),
+        "keystroke_median_s": statistics.median(timings),
+        "keystroke_p99_s": timings[int(len(timings) * 0.99)],
+        "keystroke_max_s": timings[-1],
+        "create_s": create_s,
+    }
+
+    print(f"{args.companies:,} companies ({'sharded' if args.sharded else 'json'})")
+    print(f"cold load + index  {results['load_s'] * 1000:10.1f} ms")
+    print(f"keystroke median   {results['keystroke_median_s'] * 1000:10.3f} ms")
+    print(f"keystroke p99      {results['keystroke_p99_s'] * 1000:10.3f} ms")
+    print(f"keystroke max      {results['keystroke_max_s'] * 1000:10.3f} ms  ({results['keystrokes']:,} keystrokes)")
+    print(f"create one         {results['create_s'] * 1000:10.1f} ms")
+
+    commit = git_commit()
+    output = RESULTS_DIR / f"company_bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": vars(args),
+        "results": results,
+    }, indent=2))
+    print(f"saved to {output}")
+
+    if results["keystroke_max_s"] > args.budget:
+        print(f"slowest keystroke over budget ({args.budget * 1000:.1f} ms)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/export_bench.py
+"""
+Measure time and peak memory of portfolio exports.
+
+Streams a synthetic portfolio into a binary snapshot, then renders each
+export format from it in a fresh worker process, as report jobs do, and
+records the wall time, output size and the worker's peak RSS above that
+of an idle worker. Exits with status 1 if an export's memory grows past
+the budget.
+
+Run from the project root:
+    python -m benchmarks.export_bench --projects 100000
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import generate_projects
+from core.report_rendering import EXPORT_FORMATS, available_formats, render_report
+from database import binary_format
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _idle() -> float:
+    return _peak_rss_mb()
+
+def _export(snapshot: str, output: str, progress: str, fmt: str):
+    start = time.perf_counter()
+    rows = render_report(snapshot, output, progress, fmt, {})
+    return rows, time.perf_counter() - start, _peak_rss_mb()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--formats", nargs="+", default=None, help="Export formats; default all installed")
+    parser.add_argument("--rss-budget", type=float, default=100.0, help="Maximum worker growth in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    formats = args.formats or [fmt for fmt in EXPORT_FORMATS if fmt in available_formats()]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        snapshot = root / "snapshot.bin"
+        start = time.perf_counter()
+        with open(snapshot, 'wb') as f:
+            binary_format.write_projects(f, generate_projects(args.projects, args.seed))
+        results["snapshot_s"] = time.perf_counter() - start
+        results["snapshot_mb"] = snapshot.stat().st_size / 1e6
+
+        context = multiprocessing.get_context("spawn")
+        for fmt in formats:
+            # A new worker per format, so each peak is its own
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                idle = pool.submit(_idle).result()
+                output = root / f"export-{fmt}"
+                rows, seconds, peak = pool.submit(
+                    _export, str(snapshot), str(output), str(root / "progress.json"), fmt
+                ).result()
+            results[fmt] = {
+                "rows": rows,
+                "seconds": seconds,
+                "output_mb": output.stat().st_size / 1e6,
+                "idle_rss_mb": idle,
+                "peak_rss_mb": peak,
+                "growth_mb": peak - idle,
+            }
+
+    print(f"{args.projects:,} projects, snapshot {results['snapshot_mb']:.1f} MB in {results['snapshot_s']:.1f} s")
+    for fmt in formats:
+        r = results[fmt]
+        print(
+            f"{fmt:12} {r['seconds']:8.1f} s  {r['output_mb']:7.1f} MB out  "
+            f"peak RSS {r['peak_rss_mb']:6.1f} MB (+{r['growth_mb']:.1f} MB over idle)"
+        )
+
+    commit = git_commit()
+    output = RESULTS_DIR / f"export_bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": vars(args),
+        "results": results,
+    }, indent=2))
+    print(f"saved to {output}")
+
+    largest = max((results[fmt]["growth_mb"] for fmt in formats), default=0.0)
+    if largest > args.rss_budget:
+        print(f"export memory over budget ({args.rss_budget:.0f} MB)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/history_bench.py
+"""
+Time progress history charts over a synthetic multi-year portfolio.
+
+Appends years of progress and spend samples for thousands of projects
+to a temporary history, sealing chunks as it goes, then times reopening
+it, the portfolio spend curve and one project's progress curve at chart
+width, and recording one more update. Exits with status 1 if a chart
+exceeds the budget.
+
+Run from the project root:
+    python -m benchmarks.history_bench --projects 5000 --samples 2000000
+"""
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from config.settings import settings
+from database.progress_history import ProgressHistory
+from database.project_store import ProjectStore
+from benchmarks import RESULTS_DIR, git_commit
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def _samples(projects: int, count: int, years: float, seed: int):
+    """Samples in time order, each project's spend and progress only growing"""
+    rng = np.random.default_rng(seed)
+    end = time.time()
+    times = np.sort(rng.integers(int(end - years * 365 * 86400), int(end), count))
+    codes = rng.integers(0, projects, count)
+    budgets = rng.uniform(1e5, 5e6, projects)
+    steps = rng.uniform(0, 1, count)
+    order = np.lexsort((times, codes))
+    totals = np.empty(count)
+    totals[order] = np.cumsum(steps[order])
+    starts = np.searchsorted(codes[order], np.arange(projects))
+    base = np.zeros(count)
+    base[order] = np.repeat(np.r_[0.0, np.cumsum(steps[order])][starts], np.diff(np.r_[starts, count]))
+    progress = np.minimum(100.0, (totals - base) / 2)
+    spent = budgets[codes] * progress / 100
+    return [
+        (f"project-{code}", moment, p, s, budgets[code])
+        for code, moment, p, s in zip(codes.tolist(), times.tolist(), progress.tolist(), spent.tolist())
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=2000000)
+    parser.add_argument("--years", type=float, default=5.0)
+    parser.add_argument("--width", type=int, default=settings.CHART_POINTS, help="Chart buckets")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is kept")
+    parser.add_argument("--budget", type=float, default=0.05, help="Maximum seconds for one chart")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    samples = _samples(args.projects, args.samples, args.years, args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        store = ProjectStore(write_behind=False, file_path=root / "projects.json")
+
+        def _open() -> ProgressHistory:
+            history = ProgressHistory(store, root=root / "history")
+            history._ensure_loaded()
+            # The synthetic samples stand in for the store's writes
+            history._stamp, history._in_sync = store.data_stamp(), True
+            return history
+
+        history = _open()
+        start = time.perf_counter()
+        batch = 10000
+        for i in range(0, len(samples), batch):
+            history._append(samples[i:i + batch])
+        results["append_s"] = time.perf_counter() - start
+        results["chunks"] = len(history._chunks)
+
+        results["open_s"] = _best(lambda: _open().sample_count(), max(1, args.repeat // 2))
+        history = _open()
+        history.portfolio_series("spent", width=args.width)
+        results["portfolio_s"] = _best(lambda: history.portfolio_series("spent", width=args.width), args.repeat)
+        results["portfolio_points"] = len(history.portfolio_series("spent", width=args.width).rows())
+        results["project_s"] = _best(lambda: history.project_series("project-0", width=args.width), args.repeat)
+
+        last = samples[-1]
+        update = [(last[0], last[1] + 60, last[2] + 1, last[3] + 1, last[4])]
+        start = time.perf_counter()
+        history._append(update)
+        history.portfolio_series("spent", width=args.width)
+        results["update_then_chart_s"] = time.perf_counter() - start
+
+    print(f"{args.samples:,} samples over {args.years:g} years for {args.projects:,} projects, {results['chunks']} chunks")
+    print(f"append           {results['append_s']:10.2f} s")
+    print(f"open             {results['open_s'] * 1000:10.1f} ms")
+    print(f"portfolio chart  {results['portfolio_s'] * 1000:10.2f} ms  {results['portfolio_points']} points")
+    print(f"project chart    {results['project_s'] * 1000:10.2f} ms")
+    print(f"update + chart   {results['update_then_chart_s'] * 1000:10.2f} ms")
+
+    commit = git_commit()
+    output = RESULTS_DIR / f"history_bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": vars(args),
+        "results": results,
+    }, indent=2))
+    print(f"saved to {output}")
+
+    slowest = max(results["portfolio_s"], results["project_s"])
+    if slowest > args.budget:
+        print(f"slowest chart over budget ({args.budget * 1000:.0f} ms)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
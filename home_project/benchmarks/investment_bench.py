@@ -0,0 +1,90 @@
+# benchmarks/investment_bench.py
+"""
+Time the investment metrics engine on a synthetic portfolio.
+
+Measures a cold recompute of IRR/NPV/MOIC/DPI for every investment, a
+cached recompute, and a recompute after one investment's cash flows
+changed. Exits with status 1 if the cold recompute exceeds the budget.
+
+Run from the project root:
+    python -m benchmarks.investment_bench --investments 10000
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from core.investment_metrics import InvestmentMetricsEngine
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import AS_OF, generate_investments
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--investments", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is kept")
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum seconds for a cold recompute")
+    args = parser.parse_args()
+
+    investments = list(generate_investments(args.investments))
+    flows = sum(len(investment.cash_flows) for investment in investments)
+
+    engine = InvestmentMetricsEngine()
+    warm = engine.compute(investments, AS_OF)
+
+    def changed():
+        # A new version of the first investment invalidates just its entry
+        investments[0] = dataclasses.replace(investments[0], version=investments[0].version + 1)
+        engine.compute(investments, AS_OF)
+
+    results = {
+        "cold_s": _best(lambda: InvestmentMetricsEngine().compute(investments, AS_OF), args.repeat),
+        "cached_s": _best(lambda: engine.compute(investments, AS_OF), args.repeat),
+        "one_changed_s": _best(changed, args.repeat),
+        "unsolved": sum(1 for m in warm.investments if m.irr != m.irr),
+    }
+
+    print(f"{args.investments:,} investments, {flows:,} cash flows")
+    print(f"cold recompute     {results['cold_s'] * 1000:10.1f} ms")
+    print(f"cached             {results['cached_s'] * 1000:10.1f} ms")
+    print(f"one changed        {results['one_changed_s'] * 1000:10.1f} ms")
+    print(f"portfolio IRR {warm.irr:.4%}, MOIC {warm.moic:.2f}x, DPI {warm.dpi:.2f}x, "
+          f"{results['unsolved']} investments without an IRR")
+
+    commit = git_commit()
+    output = RESULTS_DIR / f"investment_bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": vars(args),
+        "results": results,
+    }, indent=2))
+    print(f"saved to {output}")
+
+    if results["cold_s"] > args.budget:
+        print(f"cold recompute over budget ({args.budget:.2f} s)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# benchmarks/load_test.py
+"""
+Headless multi-session load test for app.py.
+
+Each simulated user drives its own streamlit AppTest session through
+signup, login, the dashboard, a filter change, a project edit and the
+analytics view. Sessions run concurrently against a seeded data directory
+and every scripted interaction (one rerun) is timed.
+
+AppTest keeps a process-global runtime, so each session runs in its own
+worker process; the processes share the data directory on disk, like
+several Streamlit server processes would.
+
+Run from the project root:
+    python -m benchmarks.load_test --sessions 8 --projects 500
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from streamlit.testing.v1 import AppTest
+
+from config.settings import settings
+from core.services import services
+from models.project import ProjectStatus
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import generate_projects
+
+class SessionRecorder:
+    """Times each scripted interaction of one simulated user"""
+
+    def __init__(self, app: AppTest):
+        self.app = app
+        self.samples: List[Dict] = []
+
+    def step(self, name: str, action) -> None:
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        errors = [e.value for e in self.app.error] + [str(e.value) for e in self.app.exception]
+        self.samples.append({"step": name, "seconds": elapsed, "errors": errors})
+
+def run_session(index: int, iterations: int) -> List[Dict]:
+    """Script one realistic user session and return its timed steps"""
+    app = AppTest.from_file(str(APP_ROOT / "app.py"), default_timeout=120)
+    recorder = SessionRecorder(app)
+    username = f"load_{index}_{uuid.uuid4().hex[:8]}"
+    password = "loadtest-pass"
+
+    recorder.step("open", app.run)
+
+    def open_signup():
+        _button(app, "Don't have an account? Sign up").click().run()
+    recorder.step("open_signup", open_signup)
+
+    def signup():
+        app.text_input(key="signup_username").input(username).run()
+        _text_input(app, "Full Name").input(f"Load Tester {index}")
+        _text_input(app, "Password").input(password)
+        _text_input(app, "Confirm Password").input(password)
+        _button(app, "Sign Up").click().run()
+    recorder.step("signup", signup)
+
+    def login():
+        _text_input(app, "Username").input(username)
+        _text_input(app, "Password").input(password)
+        _button(app, "Login").click().run()
+    recorder.step("login", login)
+
+    # The login run only plays the overlay; navigation appears on the next rerun
+    recorder.step("main", app.run)
+    recorder.step("open_dashboard", lambda: _button(app, "Go to Dashboard").click().run())
+
+    statuses = [status.value for status in ProjectStatus]
+    for i in range(iterations):
+        status = statuses[(index + i) % len(statuses)]
+        recorder.step("filter", lambda: app.multiselect(key="filter_status").set_value([status]).run())
+        recorder.step("clear_filter", lambda: app.multiselect(key="filter_status").set_value([]).run())
+
+        def open_details():
+            details = [b for b in app.button if b.label == "Details"]
+            if details:
+                details[(index + i) % len(details)].click().run()
+        recorder.step("open_details", open_details)
+
+        def edit_project():
+            if any(b.label == "Save Project" for b in app.button):
+                _text_input(app, "Project Name").input(f"Edited by {username} ({i})")
+                _button(app, "Save Project").click().run()
+        recorder.step("edit_project", edit_project)
+
+        recorder.step("analytics", lambda: app.radio(key="dashboard_tab").set_value("Analytics").run())
+        recorder.step("overview", lambda: app.radio(key="dashboard_tab").set_value("Projects Overview").run())
+
+    return recorder.samples
+
+def _warm_worker(_: int) -> None:
+    """Import the app's modules in a worker process"""
+    import app  # noqa: F401
+
+def _button(app: AppTest, label: str):
+    return _find(app.button, label)
+
+def _text_input(app: AppTest, label: str):
+    return _find(app.text_input, label)
+
+def _find(elements, label: str):
+    for element in elements:
+        if element.label == label:
+            return element
+    errors = [e.value for e in elements.root.error] if hasattr(elements, "root") else []
+    raise LookupError(f"No widget labelled {label!r}; page errors: {errors}")
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+def summarize(samples: List[Dict], wall_time: float) -> Dict:
+    """Latency percentiles per step and overall throughput"""
+    by_step: Dict[str, List[float]] = {}
+    for sample in samples:
+        by_step.setdefault(sample["step"], []).append(sample["seconds"])
+    by_step["all"] = [s["seconds"] for s in samples]
+
+    steps = {}
+    for step, values in by_step.items():
+        values.sort()
+        steps[step] = {
+            "count": len(values),
+            "p50_ms": _percentile(values, 50) * 1000,
+            "p95_ms": _percentile(values, 95) * 1000,
+            "p99_ms": _percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+        }
+    return {
+        "wall_time_s": wall_time,
+        "throughput_reruns_per_s": len(samples) / wall_time if wall_time else 0.0,
+        "errors": sum(1 for s in samples if s["errors"]),
+        "steps": steps,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=3, help="Dashboard interaction loops per session")
+    parser.add_argument("--projects", type=int, default=500, help="Projects in the seeded portfolio")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/load_test-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as tmp:
+        settings.set_database_dir(tmp)
+        services.reset()
+        services.project_store.import_projects(generate_projects(args.projects, args.seed))
+        # Worker processes read their data directory from the environment
+        os.environ["PORTFOLIO_DATA_DIR"] = tmp
+
+        with ProcessPoolExecutor(
+            max_workers=args.sessions,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            # Start the workers before timing so interpreter startup isn't measured
+            list(pool.map(_warm_worker, range(args.sessions)))
+            start = time.perf_counter()
+            sessions = list(pool.map(run_session, range(args.sessions), [args.iterations] * args.sessions))
+            wall_time = time.perf_counter() - start
+
+    samples = [sample for session in sessions for sample in session]
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "summary": summarize(samples, wall_time),
+    }
+
+    output = args.output or RESULTS_DIR / f"load_test-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(f"{'step':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, stats in report["summary"]["steps"].items():
+        print(f"{step:<16}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+    print(f"throughput: {report['summary']['throughput_reruns_per_s']:.1f} reruns/s, "
+          f"errors: {report['summary']['errors']}, saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/service_setup.py
+"""
+Measure per-rerun service setup cost.
+
+Compares building the stores and authentication service from scratch, as
+every rerun used to do, against resolving them from the shared registry.
+
+Run from the project root:
+    python -m benchmarks.service_setup
+"""
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from config.settings import settings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=10000, help="Simulated reruns per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.set_database_dir(Path(tmp) / "data")
+
+        from core.authentication import AuthenticationService
+        from core.services import ServiceRegistry, _register_defaults
+        from database.project_store import ProjectStore
+
+        def rebuild_per_rerun():
+            AuthenticationService()
+            ProjectStore()
+
+        registry = ServiceRegistry()
+        _register_defaults(registry)
+
+        def resolve_from_registry():
+            registry.auth_service
+            registry.project_store
+
+        results = {
+            "rebuild per rerun": timeit.timeit(rebuild_per_rerun, number=args.reruns),
+            "shared registry": timeit.timeit(resolve_from_registry, number=args.reruns),
+        }
+
+    for label, total in results.items():
+        print(f"{label:<20} {total / args.reruns * 1e6:10.2f} µs/rerun")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/snapshot_format.py
+"""
+Compare the JSON and binary project file formats.
+
+Writes the same synthetic portfolio in both formats and reports file size,
+full-load time on a fresh store and full-save time.
+
+Run from the project root:
+    python -m benchmarks.snapshot_format --projects 100000
+"""
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from database.project_store import ProjectStore, convert_projects_file
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import ensure_fixture
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept")
+    args = parser.parse_args()
+
+    fixture = ensure_fixture(args.projects, users=10)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="snapshot-format-") as tmp:
+        paths = {"json": Path(tmp) / "projects.json", "binary": Path(tmp) / "projects.bin"}
+        convert_projects_file(fixture / "projects.json", paths["json"])
+        convert_projects_file(paths["json"], paths["binary"])
+        projects = ProjectStore(write_behind=False, file_path=paths["json"]).get_all_projects()
+
+        for name, path in paths.items():
+            results[name] = {
+                "file_bytes": path.stat().st_size,
+                "load_s": _best(lambda: ProjectStore(write_behind=False, file_path=path).get_all_projects(), args.repeat),
+                "save_s": _best(lambda: ProjectStore(write_behind=False, file_path=path)._save_projects(projects), args.repeat),
+            }
+
+    print(f"{'format':<8}{'size MB':>10}{'load s':>10}{'save s':>10}")
+    for name, row in results.items():
+        print(f"{name:<8}{row['file_bytes'] / 1e6:>10.1f}{row['load_s']:>10.2f}{row['save_s']:>10.2f}")
+    baseline = results["json"]
+    binary = results["binary"]
+    print(f"binary vs json: {baseline['file_bytes'] / binary['file_bytes']:.1f}x smaller, "
+          f"{baseline['load_s'] / binary['load_s']:.1f}x faster to load, "
+          f"{baseline['save_s'] / binary['save_s']:.1f}x faster to save")
+
+    commit = git_commit()
+    output = RESULTS_DIR / f"snapshot_format-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": vars(args),
+        "results": results,
+    }, indent=2))
+    print(f"saved to {output}")
+
+if __name__ == "__main__":
+    main()
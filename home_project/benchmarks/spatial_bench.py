@@ -0,0 +1,111 @@
+# benchmarks/spatial_bench.py
+"""
+Time map viewport and nearest-neighbour queries on a synthetic portfolio.
+
+Indexes the locations of a generated portfolio, then times viewports
+from continent scale down to a few streets, k-nearest queries near and
+far from the assets, and applying a write that moves one project. Exits with status 1 if
+any viewport exceeds the budget.
+
+Run from the project root:
+    python -m benchmarks.spatial_bench --projects 100000
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from database.project_store import ProjectChanges, ProjectStore
+from database.spatial_index import SpatialIndex
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import ensure_fixture
+
+# name: (south, west, north, east)
+VIEWPORTS = {
+    "europe": (35.0, -10.0, 60.0, 20.0),
+    "region": (47.5, 1.0, 50.0, 4.0),
+    "city": (48.70, 2.15, 49.00, 2.55),
+    "district": (48.84, 2.32, 48.87, 2.37),
+}
+# name: (latitude, longitude)
+NEAREST = {"paris": (48.8566, 2.3522), "sydney": (-33.8688, 151.2093)}
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is kept")
+    parser.add_argument("--budget", type=float, default=0.05, help="Maximum seconds for one viewport")
+    args = parser.parse_args()
+
+    store = ProjectStore(write_behind=False, file_path=ensure_fixture(args.projects, 10) / "projects.json")
+    index = SpatialIndex(store)
+    projects = store.get_all_projects()
+    stamp = store.data_stamp()
+
+    results = {"rebuild_s": _best(lambda: index.rebuild(projects, stamp), args.repeat)}
+    for name, bounds in VIEWPORTS.items():
+        view = index.viewport(*bounds)
+        results[f"viewport_{name}_s"] = _best(lambda: index.viewport(*bounds), args.repeat)
+        results[f"viewport_{name}_markers"] = len(view.locations) + len(view.clusters)
+        results[f"viewport_{name}_projects"] = view.total
+    for name, point in NEAREST.items():
+        results[f"nearest_{name}_s"] = _best(lambda: index.nearest(*point, args.k), args.repeat)
+
+    # A persisted batch moving one project, as the store's listener delivers it
+    project = projects[0]
+    moved = dataclasses.replace(project, latitude=project.latitude + 0.01)
+    batches = [
+        ProjectChanges({project.id: project}, {project.id: moved}, stamp, stamp),
+        ProjectChanges({project.id: moved}, {project.id: project}, stamp, stamp),
+    ]
+    results["move_one_s"] = _best(lambda: [index._on_change(batch) for batch in batches], args.repeat) / 2
+
+    print(f"{args.projects:,} projects, {len(index):,} located")
+    print(f"rebuild            {results['rebuild_s'] * 1000:10.1f} ms")
+    for name in VIEWPORTS:
+        print(f"viewport {name:<10}{results[f'viewport_{name}_s'] * 1000:10.2f} ms  "
+              f"{results[f'viewport_{name}_markers']:6,} markers for {results[f'viewport_{name}_projects']:,} projects")
+    for name in NEAREST:
+        print(f"{args.k}-nearest {name:<8}{results[f'nearest_{name}_s'] * 1000:10.2f} ms")
+    print(f"move one           {results['move_one_s'] * 1000:10.3f} ms")
+
+    commit = git_commit()
+    output = RESULTS_DIR / f"spatial_bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": vars(args),
+        "results": results,
+    }, indent=2))
+    print(f"saved to {output}")
+
+    slowest = max(results[f"viewport_{name}_s"] for name in VIEWPORTS)
+    if slowest > args.budget:
+        print(f"slowest viewport over budget ({args.budget * 1000:.0f} ms)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# benchmarks/store_bench.py
+"""
+Micro-benchmarks for project serialization and storage operations.
+
+Every storage backend is measured at each portfolio size on a private copy
+of a synthetic fixture. Timings are the median of --repeat runs, in seconds
+per operation, and are compared against a baseline file. A fixed reference
+workload is timed right before every run of every operation, and each
+baseline timing is scaled by how much slower or faster its reference ran,
+so a busier or throttled machine does not read as a regression. Any read or
+serialization operation more than
+--threshold slower than its scaled baseline fails the run; single writes wait
+on fsync, which varies far more between runs, and have their own
+--write-threshold.
+
+Run from the project root:
+    python -m benchmarks.store_bench                    # compare with the baseline
+    python -m benchmarks.store_bench --save-baseline    # record a new baseline
+    python -m benchmarks.store_bench --backends mmap --save-baseline    # update one backend
+"""
+import argparse
+import gc
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from config.settings import settings
+from database.project_store import ProjectStore
+from models.project import Project, ProjectPriority, ProjectStatus
+from benchmarks import RESULTS_DIR, git_commit
+from benchmarks.synthetic import ensure_fixture
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines" / "store_bench.json"
+
+# Store factories by name; every backend is measured at every size
+BACKENDS: Dict[str, Callable[[], ProjectStore]] = {
+    "json": lambda: ProjectStore(write_behind=False),
+    "json-write-behind": lambda: ProjectStore(write_behind=True),
+    "binary": lambda: ProjectStore(write_behind=False, file_path=settings.PROJECTS_BINARY_FILE, memory_map=False),
+    "mmap": lambda: ProjectStore(write_behind=False, file_path=settings.PROJECTS_BINARY_FILE, memory_map=True),
+    "sharded": lambda: ProjectStore(write_behind=False, file_path=settings.PROJECTS_SHARD_DIR),
+}
+
+# Differences smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR = 100e-6
+
+# Suffix of the result holding the median time of the reference workload
+# run alongside an operation, e.g. "get_project/reference"
+REFERENCE = "/reference"
+
+# Durable single writes, dominated by fsync latency
+WRITE_OPERATIONS = frozenset({"create_project", "update_project", "delete_project"})
+
+# Projects encoded/decoded per throughput measurement
+SERIALIZE_SAMPLE = 10_000
+
+def _timed(func: Callable[[], object], reference: Optional[List[float]] = None) -> float:
+    """
+    Wall time of one call with the garbage collector paused, as timeit does.
+    Given a `reference` list, the reference workload is timed just before
+    the call and appended to it.
+    """
+    if reference is not None:
+        reference.append(_timed(_reference_workload))
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+def _median(func: Callable[[], object], repeat: int, reference: List[float], number: int = 1) -> float:
+    """Median wall time of `repeat` runs, per call"""
+    return statistics.median(_timed(func, reference) for _ in range(repeat)) / number
+
+def _cold(
+    factory: Callable[[], ProjectStore],
+    action: Callable[[ProjectStore], object],
+    repeat: int,
+    reference: List[float],
+) -> float:
+    """Median time of an action on a freshly opened store, excluding construction"""
+    times = []
+    for _ in range(repeat):
+        store = factory()
+        try:
+            times.append(_timed(lambda: action(store), reference))
+        finally:
+            store.close()
+    return statistics.median(times)
+
+_REFERENCE_RECORDS = [
+    {"id": f"ref-{i:05d}", "name": f"Reference {i}", "budget": i * 1.5, "team": ["a", "b", "c"]}
+    for i in range(2000)
+]
+
+def _reference_workload() -> None:
+    """
+    A fixed pure-Python workload (a JSON round trip of project-like
+    records), the yardstick for how fast the machine is running right now
+    """
+    json.loads(json.dumps(_REFERENCE_RECORDS))
+
+def _new_project(index: int) -> Project:
+    start = datetime(2025, 1, 1)
+    return Project(
+        id=f"bench-{index:07d}",
+        name=f"Benchmark project {index}",
+        description="Created by the storage benchmark",
+        start_date=start,
+        end_date=start + timedelta(days=365),
+        status=ProjectStatus.PLANNING,
+        priority=ProjectPriority.MEDIUM,
+        budget=1_000_000.0,
+        team_members=["Alice Martin 0"],
+    )
+
+def bench_backend(factory: Callable[[], ProjectStore], size: int, repeat: int) -> Dict[str, float]:
+    """
+    Measure every operation for one backend and portfolio size
+
+    Args:
+        factory: Builds a store over the current settings.DATABASE_DIR
+        size (int): Number of projects in the portfolio
+        repeat (int): Runs per measurement
+
+    Returns:
+        Dict[str, float]: Seconds per operation, by operation name
+    """
+    fixture = ensure_fixture(size, users=10)
+    previous = settings.DATABASE_DIR
+    with tempfile.TemporaryDirectory(prefix="store-bench-") as tmp:
+        data_dir = Path(tmp) / "data"
+        shutil.copytree(fixture, data_dir)
+        settings.set_database_dir(data_dir)
+        try:
+            return _run_operations(factory, repeat)
+        finally:
+            settings.set_database_dir(previous)
+
+def _run_operations(factory: Callable[[], ProjectStore], repeat: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+
+    def measure(operation: str, take: Callable[[List[float]], float]) -> None:
+        reference: List[float] = []
+        results[operation] = take(reference)
+        results[operation + REFERENCE] = statistics.median(reference)
+
+    store = factory()
+    try:
+        # The first load also migrates the fixture into the backend's format
+        projects = store.get_all_projects()
+        rng = random.Random(0)
+        ids = [rng.choice(projects).id for _ in range(1000)]
+        measure("get_all_projects", lambda ref: _cold(factory, lambda s: s.get_all_projects(), repeat, ref))
+        measure("get_project", lambda ref: _cold(factory, lambda s: s.get_project(ids[0]), repeat, ref))
+
+        # Per project, through the backend's own file encoding
+        sample = projects[:SERIALIZE_SAMPLE]
+        encoded = store._encode(sample)
+        measure("serialize", lambda ref: _median(lambda: store._encode(sample), repeat, ref, len(sample)))
+        measure("deserialize", lambda ref: _median(lambda: store._decode(encoded), repeat, ref, len(sample)))
+
+        measure("get_all_projects_cached", lambda ref: _median(store.get_all_projects, repeat, ref))
+        measure("get_project_cached", lambda ref: _median(
+            lambda: [store.get_project(i) for i in ids], repeat, ref, len(ids)))
+
+        created = iter(range(repeat))
+        measure("create_project", lambda ref: _timed_writes(
+            store, repeat, ref, lambda: store.create_project(_new_project(next(created)))))
+        updated = iter([store.get_project(i) for i in ids[:repeat]])
+        measure("update_project", lambda ref: _timed_writes(
+            store, repeat, ref, lambda: store.update_project(next(updated))))
+        deleted = iter(range(repeat))
+        measure("delete_project", lambda ref: _timed_writes(
+            store, repeat, ref, lambda: store.delete_project(_new_project(next(deleted)).id)))
+    finally:
+        store.close()
+    return results
+
+def _timed_writes(store: ProjectStore, repeat: int, reference: List[float], write: Callable[[], bool]) -> float:
+    """Median latency of single writes, letting write-behind drain between runs"""
+    times = []
+    for _ in range(repeat):
+        accepted = []
+        times.append(_timed(lambda: accepted.append(write()), reference))
+        if not accepted[0]:
+            raise RuntimeError("Benchmark write was rejected by the store")
+        store.flush()
+    return statistics.median(times)
+
+def compare(results: Dict, baseline: Dict, threshold: float, write_threshold: float) -> List[str]:
+    """
+    Find operations that regressed beyond their threshold
+
+    Each baseline timing is first scaled by the ratio of the reference
+    workload's time alongside the operation now to its time when the
+    baseline was recorded.
+
+    Args:
+        results (Dict): backend -> size -> operation -> seconds
+        baseline (Dict): Same layout, from the baseline file
+        threshold (float): Allowed slowdown, e.g. 0.2 for 20%
+        write_threshold (float): Allowed slowdown of WRITE_OPERATIONS
+
+    Returns:
+        List[str]: One description per regression
+    """
+    regressions = []
+    for backend, sizes in results.items():
+        for size, operations in sizes.items():
+            recorded = baseline.get(backend, {}).get(size, {})
+            for operation, seconds in operations.items():
+                if operation.endswith(REFERENCE) or recorded.get(operation) is None:
+                    continue
+                speed = 1.0
+                now, then = operations.get(operation + REFERENCE), recorded.get(operation + REFERENCE)
+                if now and then:
+                    speed = now / then
+                before = recorded[operation] * speed
+                allowed = write_threshold if operation in WRITE_OPERATIONS else threshold
+                if seconds > before * (1 + allowed) and seconds - before > NOISE_FLOOR:
+                    regressions.append(
+                        f"{backend} {operation} @ {size}: {_format(before)} -> {_format(seconds)} "
+                        f"({(seconds / before - 1) * 100:+.0f}%)"
+                    )
+    return regressions
+
+def _format(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+def _load_baseline(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())["results"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per measurement; the median is kept")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing")
+    parser.add_argument("--write-threshold", type=float, default=1.0,
+                        help="Allowed slowdown of single durable writes, which wait on fsync")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for backend in args.backends:
+        for size in args.sizes:
+            print(f"{backend} @ {size} projects...", flush=True)
+            results.setdefault(backend, {})[str(size)] = bench_backend(BACKENDS[backend], size, args.repeat)
+
+    baseline = _load_baseline(args.baseline)
+    print(f"\n{'backend':<20}{'size':>8}  {'operation':<26}{'time':>12}{'baseline':>12}")
+    for backend, sizes in results.items():
+        for size, operations in sizes.items():
+            for operation, seconds in operations.items():
+                if operation.endswith(REFERENCE):
+                    continue
+                before = (baseline or {}).get(backend, {}).get(size, {}).get(operation)
+                print(f"{backend:<20}{size:>8}  {operation:<26}{_format(seconds):>12}"
+                      f"{_format(before) if before is not None else '-':>12}")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {"sizes": args.sizes, "repeat": args.repeat},
+        "results": results,
+    }
+    output = RESULTS_DIR / f"store_bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nsaved to {output}")
+
+    if args.save_baseline:
+        # Only the measured backends and sizes are replaced
+        merged = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results": {}}
+        for backend, sizes in results.items():
+            merged["results"].setdefault(backend, {}).update(sizes)
+        merged.update({key: report[key] for key in ("commit", "timestamp", "config")})
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(merged, indent=2))
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    regressions = compare(results, baseline, args.threshold, args.write_threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%} "
+              f"({args.write_threshold:.0%} for writes):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"no regressions over {args.threshold:.0%} ({args.write_threshold:.0%} for writes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic portfolio and user generator.
+
+Projects and users are produced lazily from a seeded RNG and streamed
+straight into the stores, so even a 1M-project portfolio is generated in
+bounded memory. Generated data directories are cached as benchmark
+fixtures, keyed by their parameters.
+
+Run from the project root:
+    python -m benchmarks.synthetic --projects 100000 --users 1000
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from models.company import Company, CompanyType
+from models.investment import CashFlow, CashFlowType, Investment
+from models.project import Project, ProjectMilestone, ProjectPriority, ProjectStatus
+from database.user_store import User
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Bumped when generated projects change shape, so cached fixtures are regenerated
+FIXTURE_FORMAT = 2
+
+# Reference "today" so the generated data never depends on the clock
+AS_OF = datetime(2025, 1, 1)
+
+_STATUS_WEIGHTS = [
+    (ProjectStatus.PLANNING, 15),
+    (ProjectStatus.IN_PROGRESS, 45),
+    (ProjectStatus.ON_HOLD, 10),
+    (ProjectStatus.COMPLETED, 25),
+    (ProjectStatus.CANCELLED, 5),
+]
+_PRIORITY_WEIGHTS = [
+    (ProjectPriority.LOW, 20),
+    (ProjectPriority.MEDIUM, 45),
+    (ProjectPriority.HIGH, 28),
+    (ProjectPriority.CRITICAL, 7),
+]
+_ASSET_TYPES = ["Residential", "Office", "Logistics", "Retail", "Hotel", "Mixed-use", "Student Housing"]
+_CITIES = ["Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Berlin", "Madrid", "Milan", "Brussels"]
+_CITY_LOCATIONS = {
+    "Paris": (48.8566, 2.3522), "Lyon": (45.7640, 4.8357), "Marseille": (43.2965, 5.3698),
+    "Bordeaux": (44.8378, -0.5792), "Lille": (50.6292, 3.0573), "Nantes": (47.2184, -1.5536),
+    "Berlin": (52.5200, 13.4050), "Madrid": (40.4168, -3.7038), "Milan": (45.4642, 9.1900),
+    "Brussels": (50.8503, 4.3517),
+}
+_MILESTONES = ["Acquisition", "Due diligence", "Permitting", "Financing", "Construction", "Fit-out", "Leasing", "Exit"]
+_COMPANY_WORDS = ["Acme", "Atlas", "Beacon", "Cedar", "Crown", "Delta", "Harbor", "Horizon", "Meridian", "Nova",
+                  "Orion", "Pinnacle", "Quartz", "Silver", "Summit", "Vertex"]
+_COMPANY_SUFFIXES = ["Holdings", "Capital", "Properties", "Partners", "Investments", "Estates", "Realty"]
+_LEGAL_FORMS = ["SAS", "SARL", "GmbH", "S.L.", "S.r.l.", "Ltd", "BV", "SA"]
+_COMPANY_TYPE_WEIGHTS = [
+    (CompanyType.SPV, 50),
+    (CompanyType.COUNTERPARTY, 20),
+    (CompanyType.LENDER, 5),
+    (CompanyType.CONTRACTOR, 15),
+    (CompanyType.TENANT, 10),
+]
+_FIRST_NAMES = ["Alice", "Bruno", "Camille", "David", "Emma", "Farid", "Giulia", "Hugo", "Ines", "Jonas", "Lea", "Malik"]
+_LAST_NAMES = ["Martin", "Bernard", "Dubois", "Moreau", "Laurent", "Rossi", "Garcia", "Muller", "Janssens", "Novak"]
+
+def _weighted(rng: random.Random, pairs, cum_weights: List[int]):
+    return rng.choices(pairs, cum_weights=cum_weights)[0][0]
+
+def _cumulative(pairs) -> List[int]:
+    return list(itertools.accumulate(weight for _, weight in pairs))
+
+def team_pool_size(project_count: int) -> int:
+    """Team members shared across the portfolio; grows sub-linearly and is capped"""
+    return max(20, min(5000, int(math.sqrt(project_count) * 4)))
+
+def generate_projects(count: int, seed: int = 0, as_of: datetime = AS_OF) -> Iterator[Project]:
+    """
+    Yield a realistic, reproducible portfolio one project at a time
+
+    Args:
+        count (int): Number of projects
+        seed (int): RNG seed; the same seed and count give identical data
+        as_of (datetime): Reference date used for progress and milestones
+
+    Yields:
+        Project: Generated projects with ids project-0000000, project-0000001, ...
+    """
+    rng = random.Random(seed)
+    # Separate stream so adding locations left the rest of the data unchanged
+    location_rng = random.Random(f"locations-{seed}")
+    status_cum = _cumulative(_STATUS_WEIGHTS)
+    priority_cum = _cumulative(_PRIORITY_WEIGHTS)
+
+    pool = [f"{first} {last} {i}" for i, (first, last) in enumerate(
+        itertools.islice(itertools.cycle(itertools.product(_FIRST_NAMES, _LAST_NAMES)), team_pool_size(count))
+    )]
+    # Zipf-like popularity: a few people sit on many projects
+    member_cum = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(pool))))
+
+    for i in range(count):
+        status = _weighted(rng, _STATUS_WEIGHTS, status_cum)
+        priority = _weighted(rng, _PRIORITY_WEIGHTS, priority_cum)
+
+        # Start dates spread over six years so date ranges overlap heavily
+        start = as_of - timedelta(days=rng.randrange(-365, 5 * 365))
+        duration = int(rng.lognormvariate(math.log(540), 0.5))
+        end = start + timedelta(days=max(30, duration))
+
+        budget = round(rng.lognormvariate(math.log(2_000_000), 1.0), 2)
+        elapsed = (as_of - start).days / max(1, (end - start).days)
+        if status == ProjectStatus.COMPLETED:
+            progress = 100.0
+        elif status == ProjectStatus.PLANNING:
+            progress = 0.0
+        else:
+            progress = round(min(99.0, max(0.0, elapsed * 100 * rng.uniform(0.6, 1.2))), 1)
+        spent = round(budget * progress / 100 * rng.uniform(0.7, 1.4), 2)
+
+        # Long-tailed milestone counts: most projects have a handful, a few have dozens
+        milestone_count = min(60, int(rng.paretovariate(1.6)) - 1 + rng.randrange(0, 3))
+        milestones = []
+        for m in range(milestone_count):
+            due = start + (end - start) * ((m + 1) / (milestone_count + 1))
+            completed = due < as_of and rng.random() < 0.9
+            milestones.append(ProjectMilestone(
+                title=f"{_MILESTONES[m % len(_MILESTONES)]} {m // len(_MILESTONES) + 1}",
+                due_date=due,
+                completed=completed,
+                completion_date=due + timedelta(days=rng.randrange(-10, 30)) if completed else None,
+                description=None if rng.random() < 0.5 else f"Milestone {m + 1} of {milestone_count}",
+            ))
+
+        team_size = min(len(pool), 1 + int(rng.expovariate(1 / 3)))
+        team = sorted({pool_member for pool_member in rng.choices(pool, cum_weights=member_cum, k=team_size)})
+
+        created = start - timedelta(days=rng.randrange(1, 90))
+        asset_type, city = rng.choice(_ASSET_TYPES), rng.choice(_CITIES)
+        # Spread around the city center, about 10 km on average
+        latitude, longitude = _CITY_LOCATIONS[city]
+        yield Project(
+            id=f"project-{i:07d}",
+            name=f"{asset_type} {city} {i}",
+            description=f"Synthetic {priority.value.lower()} priority project {i} generated for benchmarks",
+            start_date=start,
+            end_date=end,
+            status=status,
+            priority=priority,
+            budget=budget,
+            spent=spent,
+            progress=progress,
+            milestones=milestones,
+            team_members=team,
+            created_at=created,
+            updated_at=min(as_of, created + timedelta(days=rng.randrange(0, 700))),
+            latitude=round(latitude + location_rng.gauss(0, 0.09), 6),
+            longitude=round(longitude + location_rng.gauss(0, 0.13), 6),
+        )
+
+def generate_users(count: int, seed: int = 0) -> Iterator[User]:
+    """
+    Yield reproducible users; every password is "benchmark"
+
+    Args:
+        count (int): Number of users
+        seed (int): RNG seed
+
+    Yields:
+        User: Generated users named user0000000, user0000001, ...
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        yield User(
+            username=f"user{i:07d}",
+            name=f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+            password="benchmark",
+        )
+
+def generate_investments(count: int, seed: int = 0, as_of: datetime = AS_OF) -> Iterator[Investment]:
+    """
+    Yield reproducible real-estate investments with quarterly cash flows
+
+    Capital is called over the first year, rental income is distributed
+    quarterly after that, and about a third of the investments are sold;
+    the rest carry a current valuation.
+
+    Args:
+        count (int): Number of investments
+        seed (int): RNG seed
+        as_of (datetime): Reference date; no cash flow is dated after it
+
+    Yields:
+        Investment: Generated investments with ids investment-0000000, ...
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        start = as_of - timedelta(days=rng.randrange(365, 10 * 365))
+        equity = round(rng.lognormvariate(math.log(1_500_000), 0.8), 2)
+        calls = rng.randrange(1, 5)
+        flows = [
+            CashFlow(start + timedelta(days=91 * q), round(equity / calls, 2), CashFlowType.CONTRIBUTION)
+            for q in range(calls)
+        ]
+        quarters = (as_of - start).days // 91
+        sold = rng.random() < 0.35
+        held = rng.randrange(4, quarters + 1) if sold and quarters >= 4 else quarters
+        yield_rate = rng.uniform(0.0, 0.025)
+        flows.extend(
+            CashFlow(start + timedelta(days=91 * q), round(equity * yield_rate, 2), CashFlowType.DISTRIBUTION)
+            for q in range(calls, held)
+        )
+        exit_date = start + timedelta(days=91 * held) if sold else None
+        yield Investment(
+            id=f"investment-{i:07d}",
+            name=f"{rng.choice(_ASSET_TYPES)} {rng.choice(_CITIES)} {i}",
+            cash_flows=flows,
+            exit_value=round(equity * rng.lognormvariate(0.2, 0.35), 2),
+            exit_date=exit_date,
+            created_at=start,
+            updated_at=start,
+        )
+
+def generate_companies(count: int, projects: int = 0, seed: int = 0) -> Iterator[Company]:
+    """
+    Yield reproducible SPVs, counterparties and contractors
+
+    Names combine a few common words with a city and a sequence number,
+    so prefixes are shared by many companies as in a real registry.
+
+    Args:
+        count (int): Number of companies
+        projects (int): Size of the generated portfolio to link to; 0 links none
+        seed (int): RNG seed
+
+    Yields:
+        Company: Generated companies with ids company-0000000, ...
+    """
+    rng = random.Random(seed)
+    cum_types = _cumulative(_COMPANY_TYPE_WEIGHTS)
+    for i in range(count):
+        links = rng.randrange(0, 4) if projects else 0
+        yield Company(
+            id=f"company-{i:07d}",
+            name=f"{rng.choice(_COMPANY_WORDS)} {rng.choice(_CITIES)} {rng.choice(_COMPANY_SUFFIXES)} "
+                 f"{i} {rng.choice(_LEGAL_FORMS)}",
+            type=_weighted(rng, _COMPANY_TYPE_WEIGHTS, cum_types),
+            project_ids=[f"project-{p:07d}" for p in rng.sample(range(projects), min(links, projects))],
+            created_at=AS_OF,
+            updated_at=AS_OF,
+        )
+
+def populate(project_store, user_store, projects: int, users: int, seed: int = 0) -> None:
+    """
+    Stream generated data into the given stores, replacing their contents
+
+    Args:
+        project_store: Store exposing import_projects(iterable)
+        user_store: Store exposing import_users(iterable), or None to skip users
+        projects (int): Number of projects
+        users (int): Number of users
+        seed (int): RNG seed
+    """
+    project_store.import_projects(generate_projects(projects, seed))
+    if user_store is not None:
+        user_store.import_users(generate_users(users, seed))
+
+def ensure_fixture(projects: int, users: int = 100, seed: int = 0, root: Optional[Path] = None) -> Path:
+    """
+    Return a data directory holding the requested dataset, generating it
+    on first use
+
+    Args:
+        projects (int): Number of projects
+        users (int): Number of users
+        seed (int): RNG seed
+        root (Optional[Path]): Fixture cache directory
+
+    Returns:
+        Path: Data directory usable with settings.set_database_dir()
+    """
+    from config.settings import settings
+    from database.project_store import ProjectStore
+    from database.user_store import UserStore
+
+    params = {"projects": projects, "users": users, "seed": seed, "format": FIXTURE_FORMAT}
+    target = (root or FIXTURES_DIR) / f"p{projects}-u{users}-s{seed}"
+    manifest = target / "fixture.json"
+    if manifest.exists() and json.loads(manifest.read_text()) == params:
+        return target
+
+    shutil.rmtree(target, ignore_errors=True)
+    target.mkdir(parents=True)
+    previous = settings.DATABASE_DIR
+    settings.set_database_dir(target)
+    try:
+        populate(ProjectStore(write_behind=False), UserStore(), projects, users, seed)
+    finally:
+        settings.set_database_dir(previous)
+    manifest.write_text(json.dumps(params))
+    return target
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--root", type=Path, help="Fixture directory (default: benchmarks/fixtures)")
+    args = parser.parse_args()
+    print(ensure_fixture(args.projects, args.users, args.seed, args.root))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# config/logger.py
+import atexit
+import copy
+import json
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from config.settings import settings
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves JSON encoding to the listener thread.
+
+    Like the stock QueueHandler, the message is interpolated and any
+    exception formatted in the calling thread, since arguments may be
+    mutated as soon as the log call returns. Unlike it, the record is not
+    run through a formatter here: JSON encoding and the file write happen
+    on the writer thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = _exception_formatter.formatException(record.exc_info)
+        # A copy, so other handlers of the same record see it unchanged
+        record = copy.copy(record)
+        record.message = record.msg = message
+        record.args = None
+        record.exc_info, record.exc_text = None, exc_text
+        return record
+
+_exception_formatter = logging.Formatter()
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """
+    Route all logging through a background writer.
+
+    Log calls only interpolate the message and enqueue the record; a
+    QueueListener thread formats it as JSON and writes it to a size-rotated
+    file. Safe to call on every rerun: only the first call configures
+    anything.
+
+    Args:
+        level (Optional[str]): Root log level, defaults to settings.LOG_LEVEL
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        settings.LOG_DIR.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            settings.LOG_DIR / "app.log",
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(DeferredQueueHandler(log_queue))
+        root.setLevel(level or settings.LOG_LEVEL)
+
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
@@ -1,7 +1,8 @@
 # config/settings.py
+import os
 import pathlib
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Tuple
 
 @dataclass
 class Settings:
@@ -10,20 +11,46 @@ class Settings:
     BASE_DIR: pathlib.Path = pathlib.Path(__file__).parent.parent
     DATABASE_DIR: pathlib.Path = field(init=False)
     LOGO_DIR: pathlib.Path = field(init=False)
+    STATIC_DIR: pathlib.Path = field(init=False)
+    LOG_DIR: pathlib.Path = field(init=False)
     
     # File paths
     USERS_FILE: pathlib.Path = field(init=False)
     PROJECTS_FILE: pathlib.Path = field(init=False)
+    PROJECTS_BINARY_FILE: pathlib.Path = field(init=False)
+    PROJECTS_SHARD_DIR: pathlib.Path = field(init=False)
+    INVESTMENTS_FILE: pathlib.Path = field(init=False)
+    ROLLUPS_FILE: pathlib.Path = field(init=False)
+    DOCUMENTS_FILE: pathlib.Path = field(init=False)
+    COMPANIES_FILE: pathlib.Path = field(init=False)
+    COMPANIES_SHARD_DIR: pathlib.Path = field(init=False)
+    BLOB_DIR: pathlib.Path = field(init=False)
+    PREVIEW_DIR: pathlib.Path = field(init=False)
+    HISTORY_DIR: pathlib.Path = field(init=False)
+    REPORTS_DIR: pathlib.Path = field(init=False)
     
     # Authentication settings
     MIN_PASSWORD_LENGTH: int = 6
     LOGIN_ATTEMPT_LIMIT: int = 3
+    USERNAME_FILTER_MIN_CAPACITY: int = 1024
+    USERNAME_FILTER_ERROR_RATE: float = 0.01
     
     # UI settings
     ANIMATION_DURATION: int = 5
+    ANIMATION_FADE_OUT: float = 0.6
+    LOGO_DISPLAY_WIDTH: int = 200
+
+    # Static assets
+    STATIC_URL_PREFIX: str = "app/static"
+    INLINE_ASSET_LIMIT: int = 8 * 1024  # bytes; larger assets are served as files
+
+    # Background work
+    BACKGROUND_WORKERS: int = 4
     
     # Dashboard settings
     ITEMS_PER_PAGE: int = 10
+    SHOW_TIMINGS: bool = False  # Show per-interaction latency in the sidebar
+    TIMING_HISTORY: int = 50
     DEFAULT_CURRENCY: str = "EUR"
     DATE_FORMAT: str = "%d-%m-%Y"
     
@@ -34,6 +61,72 @@ class Settings:
     MIN_PROJECT_DESCRIPTION_LENGTH: int = 10
     MAX_PROJECT_DESCRIPTION_LENGTH: int = 1000
     
+    # Storage settings
+    # "json", "binary", "mmap" (binary file, memory-mapped, single-record reads)
+    # or "sharded" (one file per project); existing data is converted on first use
+    PROJECT_STORAGE_FORMAT: str = "json"
+    SHARD_BUCKET_CHARS: int = 2  # hex digits of the id hash per bucket directory
+    SHARD_LOAD_WORKERS: int = 8  # threads parsing buckets during a full load
+    PROJECT_WRITE_BEHIND: bool = False  # Queue project writes and persist them in the background
+    WRITE_BEHIND_INTERVAL: float = 0.5  # seconds to coalesce changes before flushing
+
+    # Investment settings
+    INVESTMENT_DISCOUNT_RATE: float = 0.08  # annual rate used for NPV
+    IRR_TOLERANCE: float = 1e-10  # relative rate step at which the solver stops
+    IRR_MAX_ITERATIONS: int = 50  # Newton iterations before falling back to bisection
+
+    # Risk simulation settings
+    RISK_SAMPLES: int = 1000  # Monte Carlo draws per project
+    RISK_SEED: int = 20240101  # Same seed and inputs give the same results
+    RISK_PARALLEL_THRESHOLD: int = 5000  # Projects to simulate before using the process pool
+    RISK_CHUNK_SIZE: int = 2000  # Projects per pool task
+    RISK_WORKERS: int = 0  # Process pool size; 0 uses one per CPU
+    RISK_SCHEDULE_BIAS: float = 0.10  # Expected slip on the unexecuted part of the plan
+    RISK_SCHEDULE_VOLATILITY: float = 0.25
+    RISK_COST_BIAS: float = 0.05  # Expected overrun on the unexecuted part of the budget
+    RISK_COST_VOLATILITY: float = 0.20
+    RISK_COST_SCHEDULE_CORRELATION: float = 0.6
+    RISK_ON_HOLD_VOLATILITY: float = 1.5  # Uncertainty multiplier for projects on hold
+    RISK_TABLE_ROWS: int = 20  # Riskiest projects listed in the Analytics tab
+
+    # Document settings
+    BLOB_CHUNK_SIZE: int = 1024 * 1024  # bytes read, hashed and written per step of an upload
+    THUMBNAIL_SIZE: Tuple[int, int] = (320, 320)
+    PREVIEW_TEXT_BYTES: int = 4096  # leading bytes of a text file shown as its preview
+
+    # Map settings
+    SPATIAL_CELL_DEGREES: float = 0.05  # grid cell side, about 5 km; should divide 180
+    MAP_MAX_LOCATIONS: int = 2000  # markers sent to the browser before switching to clusters
+    MAP_CLUSTER_BINS: int = 40  # clusters across the width of a clustered view
+    MAP_NEAREST: int = 10  # assets listed as closest to the map center
+    MAP_SIZE: Tuple[int, int] = (800, 500)  # pixels, used to turn center and zoom into bounds
+
+    # History settings
+    HISTORY_CHUNK_ROWS: int = 65536  # samples appended before they are sealed into a columnar chunk
+    CHART_POINTS: int = 300  # buckets a history chart is downsampled to, about its width in pixels
+
+    # Report job settings
+    REPORT_CACHE_LIMIT: int = 20  # rendered reports kept; the least recently used are evicted
+    REPORT_JOB_HISTORY: int = 50  # finished jobs listed on the reports page
+    REPORT_PDF_ROWS: int = 500  # largest projects by budget listed in a PDF report
+    REPORT_PROGRESS_ROWS: int = 5000  # projects rendered between progress updates
+    REPORT_POLL_SECONDS: float = 1.0  # how often the page checks running jobs
+
+    # Company settings
+    COMPANY_SEARCH_LIMIT: int = 20  # typeahead matches shown per keystroke
+
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+
+    # Access settings
+    ADMIN_USERS: FrozenSet[str] = field(init=False)  # from PORTFOLIO_ADMIN_USERS, comma-separated usernames
+
+    # Profiling settings
+    PROFILING_ENABLED: bool = False  # Can also be switched on from the admin performance page
+    PROFILER_HISTORY: int = 500  # Reruns and samples per operation kept in memory
+
     # Cache settings
     CACHE_EXPIRY: int = 300  # 5 minutes
     
@@ -66,9 +159,29 @@ class Settings:
 
     def __post_init__(self):
         """Initialize paths after BASE_DIR is set"""
-        self.DATABASE_DIR = self.BASE_DIR / "data"
         self.LOGO_DIR = self.BASE_DIR / "statics" / "image"
+        self.STATIC_DIR = self.BASE_DIR / "static"
+        self.LOG_DIR = self.BASE_DIR / "logs"
+        self.set_database_dir(os.environ.get("PORTFOLIO_DATA_DIR") or self.BASE_DIR / "data")
+        self.ADMIN_USERS = frozenset(
+            name.strip() for name in os.environ.get("PORTFOLIO_ADMIN_USERS", "").split(",") if name.strip()
+        )
+
+    def set_database_dir(self, path) -> None:
+        """Point all data files at another directory, e.g. a seeded benchmark dataset"""
+        self.DATABASE_DIR = pathlib.Path(path)
         self.USERS_FILE = self.DATABASE_DIR / "users.json"
         self.PROJECTS_FILE = self.DATABASE_DIR / "projects.json"
+        self.PROJECTS_BINARY_FILE = self.DATABASE_DIR / "projects.bin"
+        self.PROJECTS_SHARD_DIR = self.DATABASE_DIR / "projects"
+        self.INVESTMENTS_FILE = self.DATABASE_DIR / "investments.json"
+        self.ROLLUPS_FILE = self.DATABASE_DIR / "monthly_rollups.json"
+        self.DOCUMENTS_FILE = self.DATABASE_DIR / "documents.json"
+        self.COMPANIES_FILE = self.DATABASE_DIR / "companies.json"
+        self.COMPANIES_SHARD_DIR = self.DATABASE_DIR / "companies"
+        self.BLOB_DIR = self.DATABASE_DIR / "blobs"
+        self.PREVIEW_DIR = self.DATABASE_DIR / "previews"
+        self.HISTORY_DIR = self.DATABASE_DIR / "history"
+        self.REPORTS_DIR = self.DATABASE_DIR / "reports"
 
 settings = Settings()
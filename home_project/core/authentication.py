@@ -1,12 +1,13 @@
-from typing import Tuple
+from typing import Optional, Tuple
+from config.settings import settings
 from core.exceptions import AuthenticationError, ValidationError
 from database.user_store import UserStore, User
 from utils.validators import InputValidator
 
 class AuthenticationService:
     """Handles user authentication"""
-    def __init__(self):
-        self.user_store = UserStore()
+    def __init__(self, user_store: Optional[UserStore] = None):
+        self.user_store = user_store or UserStore()
         self.validator = InputValidator()
 
     def login(self, username: str, password: str) -> Tuple[bool, str]:
@@ -43,6 +44,43 @@ class AuthenticationService:
         except Exception as e:
             raise AuthenticationError(f"Login failed: {str(e)}")
 
+    def get_user_role(self, username: str) -> str:
+        """
+        Look up a user's role; admin rights come from settings.ADMIN_USERS,
+        not from the user data
+
+        Args:
+            username (str): User's username
+
+        Returns:
+            str: The user's role, "user" if the user is unknown
+        """
+        user = self.user_store.get_user(username.strip())
+        if user is None:
+            return "user"
+        return "admin" if user.username in settings.ADMIN_USERS else user.role
+
+    def is_username_available(self, username: str) -> bool:
+        """
+        Check whether a username can still be registered
+
+        Args:
+            username (str): Desired username
+
+        Returns:
+            bool: True if the username is valid and not taken
+
+        Raises:
+            AuthenticationError: If validation fails
+        """
+        try:
+            username = self.validator.validate_username(username)
+            return not self.user_store.username_exists(username)
+        except ValidationError as e:
+            raise AuthenticationError(f"Validation error: {str(e)}")
+        except Exception as e:
+            raise AuthenticationError(f"Availability check failed: {str(e)}")
+
     def register(self, username: str, password: str, name: str) -> bool:
         """
         Register new user
@@ -65,7 +103,7 @@ class AuthenticationService:
             name = self.validator.validate_name(name)
             
             # Check if username already exists
-            if self.user_store.get_user(username):
+            if self.user_store.username_exists(username):
                 raise AuthenticationError("Username already exists")
             
             # Create new user
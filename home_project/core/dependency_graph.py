@@ -0,0 +1,102 @@
+# core/dependency_graph.py
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Set, Tuple
+
+from core.exceptions import AppException
+
+class DependencyGraph:
+    """
+    Memoized computations wired by explicit dependencies
+
+    A node is either an input, whose value is set from outside, or a
+    formula over other nodes. Formula values are computed on first read
+    and memoized. Setting an input drops the memoized value of every node
+    downstream of it, and nothing else, so the next read recomputes
+    exactly the nodes the change can affect.
+
+    Not thread-safe; each graph belongs to one session.
+
+    Attributes:
+        recomputed (int): Formula evaluations so far, for instrumentation
+    """
+
+    def __init__(self):
+        self._formulas: Dict[Hashable, Tuple[Callable[..., Any], Tuple[Hashable, ...]]] = {}
+        self._values: Dict[Hashable, Any] = {}
+        self._dependents: Dict[Hashable, Set[Hashable]] = {}
+        self.recomputed = 0
+
+    def __len__(self) -> int:
+        return len(self._formulas) + sum(1 for node in self._values if node not in self._formulas)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._formulas or node in self._values
+
+    def set_input(self, node: Hashable, value: Any) -> None:
+        """
+        Set an input node and invalidate everything computed from it
+
+        Args:
+            node (Hashable): Node key
+            value (Any): New value
+        """
+        if node in self._formulas:
+            raise AppException(f"Cannot set formula node {node!r}")
+        self._values[node] = value
+        dependents = self._dependents.get(node)
+        if dependents:
+            self._invalidate(dependents)
+
+    def define(self, node: Hashable, formula: Callable[..., Any], inputs: Sequence[Hashable] = (), value: Any = None) -> None:
+        """
+        Define a formula node; formula receives the values of inputs, in order
+
+        Args:
+            node (Hashable): Node key
+            formula (Callable[..., Any]): Computes the node from its inputs
+            inputs (Sequence[Hashable]): Nodes the formula reads
+            value (Any): Known current value, e.g. from a batch computation;
+                None to compute on first read
+        """
+        previous = self._formulas.get(node)
+        if previous is not None:
+            for source in previous[1]:
+                self._dependents[source].discard(node)
+        inputs = tuple(inputs)
+        self._formulas[node] = (formula, inputs)
+        for source in inputs:
+            self._dependents.setdefault(source, set()).add(node)
+        if node in self._values:
+            self._invalidate((node,))
+        if value is not None:
+            self._values[node] = value
+
+    def get(self, node: Hashable) -> Any:
+        """
+        Value of a node, computing it and any stale inputs first
+
+        Raises:
+            AppException: If the node was never set or defined
+        """
+        try:
+            return self._values[node]
+        except KeyError:
+            pass
+        entry = self._formulas.get(node)
+        if entry is None:
+            raise AppException(f"Unknown graph node {node!r}")
+        formula, inputs = entry
+        value = formula(*[self.get(source) for source in inputs])
+        self._values[node] = value
+        self.recomputed += 1
+        return value
+
+    def _invalidate(self, nodes) -> None:
+        """Drop memoized values downstream; an already stale node's dependents are stale too"""
+        stack: List[Hashable] = [node for node in nodes if node in self._values]
+        while stack:
+            node = stack.pop()
+            if self._values.pop(node, _MISSING) is _MISSING:
+                continue
+            stack.extend(d for d in self._dependents.get(node, ()) if d in self._values)
+
+_MISSING = object()
@@ -0,0 +1,137 @@
+# core/document_previews.py
+import threading
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from config.settings import settings
+from database.blob_store import BlobStore
+from models.document import Document
+from utils.file_utils import atomic_write
+import logging
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; images then get no thumbnail
+    Image = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # Optional; PDFs then get no thumbnail
+    fitz = None
+
+THUMBNAIL_NAME = "thumbnail.png"
+TEXT_NAME = "preview.txt"
+UNAVAILABLE_NAME = "unavailable"
+
+TEXT_TYPES = ("text/", "application/json", "application/xml")
+
+class Preview(NamedTuple):
+    status: str  # "ready", "pending" or "unavailable"
+    thumbnail: Optional[Path] = None
+    text: Optional[str] = None
+
+class DocumentPreviews:
+    """
+    Thumbnails and text previews, generated lazily on a background pool
+
+    The first request for a document's preview schedules its generation
+    and reports it as pending; later requests find the result cached on
+    disk. Previews are keyed by content digest, so a file attached to many
+    projects is rendered once, and they never go stale because content
+    under a digest never changes.
+    """
+
+    def __init__(self, blobs: BlobStore, executor: Executor, root: Optional[Path] = None):
+        self.blobs = blobs
+        self.executor = executor
+        self.root = Path(root or settings.PREVIEW_DIR)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+
+    def _dir(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def get(self, document: Document) -> Preview:
+        """
+        Cached preview of a document, scheduling its generation if needed
+
+        Returns:
+            Preview: Status plus thumbnail path and/or text when ready
+        """
+        cached = self._cached(document.digest)
+        if cached is not None:
+            return cached
+        if not self._supported(document.content_type):
+            return Preview("unavailable")
+        with self._lock:
+            if document.digest not in self._pending:
+                future = self.executor.submit(self._generate, document.digest, document.content_type)
+                self._pending[document.digest] = future
+                future.add_done_callback(lambda _, digest=document.digest: self._done(digest))
+        return Preview("pending")
+
+    def _done(self, digest: str) -> None:
+        with self._lock:
+            self._pending.pop(digest, None)
+
+    def _cached(self, digest: str) -> Optional[Preview]:
+        directory = self._dir(digest)
+        if not directory.exists():
+            return None
+        if (directory / UNAVAILABLE_NAME).exists():
+            return Preview("unavailable")
+        thumbnail = directory / THUMBNAIL_NAME
+        text = directory / TEXT_NAME
+        if not thumbnail.exists() and not text.exists():
+            return None
+        return Preview(
+            "ready",
+            thumbnail if thumbnail.exists() else None,
+            text.read_text(encoding="utf-8") if text.exists() else None
+        )
+
+    @staticmethod
+    def _supported(content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        if content_type.startswith(TEXT_TYPES):
+            return True
+        if content_type.startswith("image/"):
+            return Image is not None
+        if content_type == "application/pdf":
+            return fitz is not None
+        return False
+
+    def _generate(self, digest: str, content_type: str) -> None:
+        """Render a preview into the cache; failures are cached as unavailable"""
+        directory = self._dir(digest)
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            if content_type.startswith(TEXT_TYPES):
+                with self.blobs.open(digest) as f:
+                    raw = f.read(settings.PREVIEW_TEXT_BYTES)
+                atomic_write(directory / TEXT_NAME, raw.decode("utf-8", errors="replace").encode("utf-8"))
+            elif content_type.startswith("image/"):
+                with Image.open(self.blobs.path(digest)) as image:
+                    # draft() lets JPEG decode at a reduced scale instead of full size
+                    image.draft("RGB", settings.THUMBNAIL_SIZE)
+                    image.thumbnail(settings.THUMBNAIL_SIZE)
+                    self._save_thumbnail(image, directory)
+            else:
+                with fitz.open(self.blobs.path(digest)) as pdf:
+                    page = pdf.load_page(0)
+                    zoom = settings.THUMBNAIL_SIZE[0] / max(page.rect.width, 1)
+                    pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                    atomic_write(directory / THUMBNAIL_NAME, pixmap.tobytes("png"))
+        except Exception as e:
+            logging.error("Preview generation failed for %s: %s", digest, e)
+            atomic_write(directory / UNAVAILABLE_NAME, b"")
+
+    @staticmethod
+    def _save_thumbnail(image, directory: Path) -> None:
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA")
+        tmp_path = directory / f".{THUMBNAIL_NAME}.tmp"
+        image.save(tmp_path, format="PNG", optimize=True)
+        tmp_path.replace(directory / THUMBNAIL_NAME)
@@ -0,0 +1,339 @@
+# core/investment_metrics.py
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from models.investment import CashFlowType, Investment
+from utils.profiler import profiler
+
+DAYS_PER_YEAR = 365.0  # XIRR day-count convention
+IRR_LOWER_BOUND = -0.99  # Bisection floor; (1 + r) ** -t overflows close to -1
+
+class InvestmentMetrics(NamedTuple):
+    """Return metrics for one investment; irr is NaN when it is undefined"""
+    investment_id: str
+    irr: float
+    npv: float
+    moic: float
+    dpi: float
+    contributed: float
+    distributed: float
+    exit_value: float
+
+@dataclass
+class PortfolioMetrics:
+    """Per-investment metrics plus pooled figures treating all cash flows as one fund"""
+    investments: List[InvestmentMetrics]
+    irr: float
+    npv: float
+    moic: float
+    dpi: float
+    contributed: float
+    distributed: float
+    exit_value: float
+
+def cash_flow_matrix(
+    rows: np.ndarray,
+    days: np.ndarray,
+    amounts: np.ndarray,
+    count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack flat cash flows into zero-padded (count, width) matrices
+
+    Args:
+        rows (np.ndarray): Row of each flow, non-decreasing
+        days (np.ndarray): Date of each flow as a day ordinal
+        amounts (np.ndarray): Signed amount of each flow
+        count (int): Number of rows
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Amounts and years since each row's first flow
+    """
+    counts = np.bincount(rows, minlength=count)
+    width = int(counts.max()) if count else 0
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    columns = np.arange(len(rows)) - np.repeat(starts, counts)
+
+    first = np.full(count, np.inf)
+    np.minimum.at(first, rows, days)
+
+    amount_matrix = np.zeros((count, width))
+    year_matrix = np.zeros((count, width))
+    amount_matrix[rows, columns] = amounts
+    year_matrix[rows, columns] = (days - first[rows]) / DAYS_PER_YEAR
+    return amount_matrix, year_matrix
+
+def npv(rates: np.ndarray, amounts: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Net present value of each row at its own rate, discounted to the row's first flow"""
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        return (amounts * np.power(1.0 + rates[:, None], -years)).sum(axis=1)
+
+def solve_irr(
+    amounts: np.ndarray,
+    years: np.ndarray,
+    guess: float = 0.1,
+    tolerance: float = 1e-10,
+    max_iterations: int = 50
+) -> np.ndarray:
+    """
+    Internal rate of return of every row at once
+
+    Newton's method runs on all rows together, each iteration only on the
+    rows still moving. Rows where it diverges, leaves the domain or runs
+    out of iterations are solved by bisection over a bracket found by
+    widening the upper bound.
+
+    Args:
+        amounts (np.ndarray): (n, m) signed cash flows, zero-padded
+        years (np.ndarray): (n, m) years since each row's first flow
+        guess (float): Starting rate
+        tolerance (float): Relative step size at which a rate is accepted
+        max_iterations (int): Newton iterations before falling back
+
+    Returns:
+        np.ndarray: Rates; NaN where the flows have no sign change or no root was bracketed
+    """
+    n = amounts.shape[0]
+    rates = np.full(n, guess)
+    has_root = (amounts > 0).any(axis=1) & (amounts < 0).any(axis=1)
+    active = has_root.copy()
+    converged = np.zeros(n, dtype=bool)
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(max_iterations):
+            index = np.flatnonzero(active)
+            if not len(index):
+                break
+            a, t, r = amounts[index], years[index], rates[index]
+            discount = np.power(1.0 + r[:, None], -t)
+            value = (a * discount).sum(axis=1)
+            slope = -(t * a * discount).sum(axis=1) / (1.0 + r)
+            step = value / slope
+            updated = r - step
+            valid = np.isfinite(updated) & (updated > -1.0)
+            done = valid & (np.abs(step) <= tolerance * (1.0 + np.abs(updated)))
+            rates[index] = np.where(valid, updated, r)
+            converged[index[done]] = True
+            active[index[done | ~valid]] = False
+
+    failed = has_root & ~converged
+    if failed.any():
+        rates[failed] = _bisect_irr(amounts[failed], years[failed], tolerance)
+    rates[~has_root] = np.nan
+    return rates
+
+def _bisect_irr(amounts: np.ndarray, years: np.ndarray, tolerance: float) -> np.ndarray:
+    """Vectorized bisection fallback for solve_irr"""
+    n = amounts.shape[0]
+    low = np.full(n, IRR_LOWER_BOUND)
+    high = np.ones(n)
+    value_low = npv(low, amounts, years)
+    value_high = npv(high, amounts, years)
+    # Widen the bracket until the sign changes; rates above 1e6 are treated as undefined
+    for _ in range(10):
+        widen = np.sign(value_high) == np.sign(value_low)
+        if not widen.any():
+            break
+        high[widen] *= 4.0
+        value_high[widen] = npv(high[widen], amounts[widen], years[widen])
+    bracketed = np.sign(value_high) != np.sign(value_low)
+
+    for _ in range(200):
+        middle = (low + high) / 2.0
+        value_middle = npv(middle, amounts, years)
+        lower_half = np.sign(value_middle) != np.sign(value_low)
+        high = np.where(lower_half, middle, high)
+        low = np.where(lower_half, low, middle)
+        value_low = np.where(lower_half, value_low, value_middle)
+        if np.all(high - low <= tolerance * (1.0 + np.abs(low))):
+            break
+    return np.where(bracketed, (low + high) / 2.0, np.nan)
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), np.nan)
+
+class InvestmentMetricsEngine:
+    """
+    Batch IRR/NPV/MOIC/DPI for a portfolio of investments
+
+    Metrics are cached per investment under its cash-flow version (plus
+    the valuation date for unrealized investments and the discount rate),
+    so a recompute only solves the investments that changed, all in one
+    vectorized pass. Pooled portfolio figures are cached under the set of
+    per-investment keys.
+    """
+
+    def __init__(self, discount_rate: Optional[float] = None):
+        self.discount_rate = settings.INVESTMENT_DISCOUNT_RATE if discount_rate is None else discount_rate
+        self._lock = threading.Lock()
+        # id -> (cache key, metrics, flow days, flow amounts)
+        self._entries: Dict[str, Tuple[Hashable, InvestmentMetrics, np.ndarray, np.ndarray]] = {}
+        self._portfolio: Optional[Tuple[Tuple, PortfolioMetrics]] = None
+
+    def _cache_key(self, investment: Investment, as_of: datetime) -> Hashable:
+        valued_on = None if investment.is_realized else as_of.toordinal()
+        return investment.version, valued_on, self.discount_rate
+
+    @profiler.profiled("InvestmentMetricsEngine.compute")
+    def compute(self, investments: Sequence[Investment], as_of: Optional[datetime] = None) -> PortfolioMetrics:
+        """
+        Metrics for every investment and for the portfolio as a whole
+
+        Args:
+            investments (Sequence[Investment]): Investments to evaluate
+            as_of (Optional[datetime]): Valuation date for unrealized exit values; defaults to today
+
+        Returns:
+            PortfolioMetrics: Per-investment metrics in input order and pooled totals
+        """
+        as_of = as_of or datetime.now()
+        keys = [self._cache_key(investment, as_of) for investment in investments]
+        signature = tuple(zip((investment.id for investment in investments), keys))
+
+        with self._lock:
+            if self._portfolio is not None and self._portfolio[0] == signature:
+                return self._portfolio[1]
+            stale = [
+                (investment, key) for investment, key in zip(investments, keys)
+                if self._entries.get(investment.id, (None,))[0] != key
+            ]
+
+        if stale:
+            computed = self._compute_batch([investment for investment, _ in stale], as_of)
+            with self._lock:
+                for (investment, key), (metrics, days, amounts) in zip(stale, computed):
+                    self._entries[investment.id] = (key, metrics, days, amounts)
+
+        with self._lock:
+            entries = [self._entries[investment.id] for investment in investments]
+            live = {investment.id for investment in investments}
+            for investment_id in [i for i in self._entries if i not in live]:
+                del self._entries[investment_id]
+
+        portfolio = self._pool(entries)
+        with self._lock:
+            self._portfolio = (signature, portfolio)
+        return portfolio
+
+    def evaluate(
+        self,
+        investments: Sequence[Investment],
+        as_of: Optional[datetime] = None
+    ) -> List[Tuple[InvestmentMetrics, np.ndarray, np.ndarray]]:
+        """
+        Metrics for hypothetical versions of investments, bypassing the cache
+
+        Args:
+            investments (Sequence[Investment]): Investments to evaluate, solved together
+            as_of (Optional[datetime]): Valuation date for unrealized exit values; defaults to today
+
+        Returns:
+            List[Tuple[InvestmentMetrics, np.ndarray, np.ndarray]]: Metrics, flow
+                days and signed flow amounts per investment, for pool()
+        """
+        if not investments:
+            return []
+        return self._compute_batch(investments, as_of or datetime.now())
+
+    def pool(self, evaluated: Sequence[Tuple[InvestmentMetrics, np.ndarray, np.ndarray]]) -> PortfolioMetrics:
+        """Pooled portfolio figures for results of evaluate()"""
+        return self._pool([(None,) + tuple(entry) for entry in evaluated])
+
+    def _compute_batch(
+        self,
+        investments: Sequence[Investment],
+        as_of: datetime
+    ) -> List[Tuple[InvestmentMetrics, np.ndarray, np.ndarray]]:
+        """Solve a batch of investments together; returns metrics and flat flows per investment"""
+        count = len(investments)
+        counts, dates, values, contributions = [], [], [], []
+        exit_values = np.zeros(count)
+        for row, investment in enumerate(investments):
+            flows = investment.cash_flows
+            dates += [cf.date for cf in flows]
+            values += [cf.amount for cf in flows]
+            contributions += [cf.type is CashFlowType.CONTRIBUTION for cf in flows]
+            if investment.exit_value:
+                dates.append(investment.exit_date or as_of)
+                values.append(investment.exit_value)
+                contributions.append(False)
+                exit_values[row] = investment.exit_value
+            counts.append(len(flows) + bool(investment.exit_value))
+
+        rows = np.repeat(np.arange(count, dtype=np.intp), counts)
+        days = np.fromiter(map(datetime.toordinal, dates), dtype=np.float64, count=len(dates))
+        values = np.asarray(values, dtype=np.float64)
+        amounts = np.where(np.asarray(contributions, dtype=bool), -values, values)
+        amount_matrix, year_matrix = cash_flow_matrix(rows, days, amounts, count)
+
+        irr = solve_irr(
+            amount_matrix,
+            year_matrix,
+            tolerance=settings.IRR_TOLERANCE,
+            max_iterations=settings.IRR_MAX_ITERATIONS
+        )
+        present_value = npv(np.full(count, self.discount_rate), amount_matrix, year_matrix)
+        contributed = np.bincount(rows, weights=np.where(amounts < 0, -amounts, 0.0), minlength=count)
+        distributed = np.bincount(rows, weights=np.where(amounts > 0, amounts, 0.0), minlength=count) - exit_values
+        moic = _ratio(distributed + exit_values, contributed)
+        dpi = _ratio(distributed, contributed)
+
+        irr, present_value, moic, dpi = irr.tolist(), present_value.tolist(), moic.tolist(), dpi.tolist()
+        contributed, distributed, exit_totals = contributed.tolist(), distributed.tolist(), exit_values.tolist()
+        stops = np.cumsum(counts).tolist()
+        return [
+            (
+                InvestmentMetrics(
+                    investment.id,
+                    irr[row],
+                    present_value[row],
+                    moic[row],
+                    dpi[row],
+                    contributed[row],
+                    distributed[row],
+                    exit_totals[row]
+                ),
+                # Views into the batch arrays, kept for pooling
+                days[stop - counts[row]:stop],
+                amounts[stop - counts[row]:stop]
+            )
+            for row, (investment, stop) in enumerate(zip(investments, stops))
+        ]
+
+    def _pool(self, entries: List[Tuple[Hashable, InvestmentMetrics, np.ndarray, np.ndarray]]) -> PortfolioMetrics:
+        """Combine every investment's flows into one series for pooled IRR and NPV"""
+        metrics = [entry[1] for entry in entries]
+        contributed = sum(m.contributed for m in metrics)
+        distributed = sum(m.distributed for m in metrics)
+        exit_value = sum(m.exit_value for m in metrics)
+
+        irr = present_value = float("nan")
+        if entries:
+            days = np.concatenate([entry[2] for entry in entries])
+            amounts = np.concatenate([entry[3] for entry in entries])
+            if len(days):
+                amount_matrix, year_matrix = cash_flow_matrix(np.zeros(len(days), dtype=np.intp), days, amounts, 1)
+                irr = float(solve_irr(
+                    amount_matrix,
+                    year_matrix,
+                    tolerance=settings.IRR_TOLERANCE,
+                    max_iterations=settings.IRR_MAX_ITERATIONS
+                )[0])
+                present_value = float(npv(np.array([self.discount_rate]), amount_matrix, year_matrix)[0])
+
+        return PortfolioMetrics(
+            investments=metrics,
+            irr=irr,
+            npv=present_value,
+            moic=(distributed + exit_value) / contributed if contributed > 0 else float("nan"),
+            dpi=distributed / contributed if contributed > 0 else float("nan"),
+            contributed=contributed,
+            distributed=distributed,
+            exit_value=exit_value
+        )
@@ -0,0 +1,318 @@
+# core/report_jobs.py
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import Executor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+from core.exceptions import DatabaseError, ValidationError
+from core.report_rendering import EXPORT_FORMATS, FORMATS, REPORT_FORMAT, available_formats, render_report
+from database import binary_format
+from database.project_store import ProjectStore
+from models.report_job import JobStatus, ReportJob
+from utils.file_utils import atomic_write
+from utils.profiler import profiler
+import logging
+
+SNAPSHOT_ATTEMPTS = 3  # Tries to read the store between two identical data stamps
+
+def cache_key(fmt: str, params: Dict[str, Any], generation: str) -> str:
+    """Name of the cached output for a report of one data generation"""
+    raw = json.dumps(
+        {"report": REPORT_FORMAT, "format": fmt, "params": params, "generation": generation},
+        sort_keys=True
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+class ReportJobs:
+    """
+    Local queue of report and export jobs rendered on the process pool
+
+    A request returns at once. A background thread snapshots the project
+    store into a binary snapshot file, a worker process renders the report
+    from it, and the rendered file goes into a cache keyed by the store's
+    data stamp and the report parameters. Asking again for a report whose
+    data and parameters are unchanged returns the cached file without
+    queueing anything, and identical requests made while one is running
+    share that job.
+
+    Job state is kept in REPORTS_DIR/jobs.json; workers report progress
+    through a file in the job's work directory. Jobs still running when the
+    app stopped are marked failed on the next start.
+    """
+
+    def __init__(
+        self,
+        project_store: ProjectStore,
+        executor: Executor,
+        pool_factory: Optional[Callable[[], Executor]] = None,
+        root: Optional[Path] = None
+    ):
+        self.project_store = project_store
+        self.executor = executor
+        self._pool_factory = pool_factory
+        self.root = Path(root or settings.REPORTS_DIR)
+        self.file_path = self.root / "jobs.json"
+        self.cache_dir = self.root / "cache"
+        self.work_dir = self.root / "work"
+        self._lock = threading.RLock()
+        self._jobs: Optional[Dict[str, ReportJob]] = None
+
+    def _serialize_job(self, job: ReportJob) -> Dict:
+        return {
+            "id": job.id,
+            "format": job.format,
+            "params": job.params,
+            "cache_key": job.cache_key,
+            "generation": job.generation,
+            "status": job.status.value,
+            "progress": job.progress,
+            "message": job.message,
+            "rows": job.rows,
+            "error": job.error,
+            "requested_by": job.requested_by,
+            "created_at": job.created_at.isoformat(),
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    def _deserialize_job(self, data: Dict) -> ReportJob:
+        return ReportJob(
+            id=data["id"],
+            format=data["format"],
+            params=data.get("params") or {},
+            cache_key=data.get("cache_key"),
+            generation=data.get("generation"),
+            status=JobStatus(data["status"]),
+            progress=data.get("progress", 0.0),
+            message=data.get("message", ""),
+            rows=data.get("rows", 0),
+            error=data.get("error"),
+            requested_by=data.get("requested_by"),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            finished_at=datetime.fromisoformat(data["finished_at"]) if data.get("finished_at") else None
+        )
+
+    def _load(self) -> Dict[str, ReportJob]:
+        """Job state, read once per process; jobs cut off by a restart are marked failed"""
+        if self._jobs is not None:
+            return self._jobs
+        jobs: Dict[str, ReportJob] = {}
+        if self.file_path.exists():
+            try:
+                with open(self.file_path, 'r') as f:
+                    jobs = {data["id"]: self._deserialize_job(data) for data in json.load(f)}
+            except Exception as e:
+                logging.error("Error reading report jobs: %s", e)
+                raise DatabaseError(f"Failed to load report jobs: {str(e)}")
+        interrupted = [job for job in jobs.values() if job.is_active]
+        for job in interrupted:
+            job.status, job.message, job.finished_at = JobStatus.FAILED, "Interrupted by a restart", datetime.now()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self._jobs = jobs
+        if interrupted:
+            self._save()
+        return jobs
+
+    def _save(self) -> None:
+        """Persist job state, keeping the newest REPORT_JOB_HISTORY finished jobs"""
+        finished = sorted((j for j in self._jobs.values() if not j.is_active), key=lambda j: j.created_at, reverse=True)
+        for job in finished[settings.REPORT_JOB_HISTORY:]:
+            del self._jobs[job.id]
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            atomic_write(
+                self.file_path,
+                json.dumps([self._serialize_job(j) for j in self._jobs.values()], indent=2).encode("utf-8")
+            )
+        except Exception as e:
+            logging.error("Error writing report jobs: %s", e)
+            raise DatabaseError(f"Failed to save report jobs: {str(e)}")
+
+    def _update(self, job_id: str, **fields: Any) -> ReportJob:
+        with self._lock:
+            job = self._load()[job_id]
+            for name, value in fields.items():
+                setattr(job, name, value)
+            self._save()
+            return job
+
+    def _artefact(self, fmt: str, key: str) -> Path:
+        return self.cache_dir / f"{key}{FORMATS[fmt][1]}"
+
+    def _generation(self) -> str:
+        return json.dumps(self.project_store.data_stamp())
+
+    @profiler.profiled("ReportJobs.request")
+    def request(self, fmt: str, params: Optional[Dict[str, Any]] = None, requested_by: Optional[str] = None) -> ReportJob:
+        """
+        Ask for a report, reusing a cached or running one where possible
+
+        Args:
+            fmt (str): One of FORMATS: a report ("xlsx", "pdf") or an export ("csv", "xlsx_export")
+            params (Optional[Dict[str, Any]]): Report options; "statuses" limits the projects included
+            requested_by (Optional[str]): User ID
+
+        Returns:
+            ReportJob: A finished job when the report is cached, otherwise a queued or running one
+
+        Raises:
+            ValidationError: If the format is unknown or its renderer is not installed
+        """
+        if fmt not in available_formats():
+            raise ValidationError(f"Report format not available: {fmt}")
+        params = {"statuses": sorted(set((params or {}).get("statuses") or []))}
+        # Queued write-behind changes are in the snapshot but not yet in the stamp
+        self.project_store.flush()
+        generation = self._generation()
+        key = cache_key(fmt, params, generation)
+
+        with self._lock:
+            jobs = self._load()
+            for job in sorted(jobs.values(), key=lambda j: j.created_at, reverse=True):
+                if job.format != fmt or job.params != params or job.requested_by != requested_by:
+                    # Another user's job is not listed for this user; a cached file is still reused below
+                    continue
+                if job.is_active and job.generation == generation:
+                    return job
+                path = self.artefact_path(job) if job.cache_key == key else None
+                if path is not None:
+                    os.utime(path)  # Recently used: evicted last
+                    return job
+
+            job = ReportJob(
+                id=str(uuid.uuid4()),
+                format=fmt,
+                params=params,
+                generation=generation,
+                requested_by=requested_by,
+                message="Queued"
+            )
+            cached = self._artefact(fmt, key)
+            if cached.exists():
+                # Rendered earlier by a job no longer listed
+                os.utime(cached)
+                job.cache_key, job.status, job.progress, job.message = key, JobStatus.DONE, 1.0, "Ready"
+                job.finished_at = datetime.now()
+            jobs[job.id] = job
+            self._save()
+        if job.status != JobStatus.DONE:
+            self.executor.submit(self._run, job.id)
+        return job
+
+    def _run(self, job_id: str) -> None:
+        """Snapshot, render and cache one job; runs on the background executor"""
+        job = self._update(job_id, status=JobStatus.RUNNING, message="Taking snapshot")
+        work = self.work_dir / job_id
+        try:
+            work.mkdir(parents=True, exist_ok=True)
+            generation = self._snapshot(work / "snapshot.bin")
+            key = cache_key(job.format, job.params, generation)
+            output = self._artefact(job.format, key)
+            self._update(job_id, generation=generation, cache_key=key, message="Rendering")
+            rows = job.rows
+            if not output.exists():
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                rows = self._render(work / "snapshot.bin", output, work / "progress.json", job.format, job.params)
+            self._update(
+                job_id, status=JobStatus.DONE, progress=1.0, rows=rows, message="Ready", finished_at=datetime.now()
+            )
+            self._evict()
+        except Exception as e:
+            logging.error("Report job %s failed: %s", job_id, e)
+            self._update(job_id, status=JobStatus.FAILED, error=str(e), message="Failed", finished_at=datetime.now())
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    @profiler.profiled("ReportJobs.snapshot")
+    def _snapshot(self, path: Path) -> str:
+        """
+        Write the store's projects to a binary snapshot file
+
+        Returns:
+            str: Data generation the snapshot belongs to
+
+        Raises:
+            DatabaseError: If the store kept changing while it was read
+        """
+        for _ in range(SNAPSHOT_ATTEMPTS):
+            self.project_store.flush()
+            generation = self._generation()
+            snapshot = self.project_store.snapshot()
+            if self._generation() == generation:
+                with open(path, 'wb') as f:
+                    binary_format.write_projects(f, snapshot.projects)
+                return generation
+        raise DatabaseError("Projects kept changing while the report snapshot was taken")
+
+    def _render(self, snapshot: Path, output: Path, progress: Path, fmt: str, params: Dict[str, Any]) -> int:
+        """Render on the process pool, or in this thread if no pool can be used"""
+        args = (str(snapshot), str(output), str(progress), fmt, params)
+        if self._pool_factory is not None:
+            try:
+                future = self._pool_factory().submit(render_report, *args)
+            except Exception as e:
+                logging.error("Report pool unavailable, rendering inline: %s", e)
+            else:
+                return future.result()
+        return render_report(*args)
+
+    def _evict(self) -> None:
+        """Keep the REPORT_CACHE_LIMIT most recently used reports"""
+        try:
+            cached = sorted(self.cache_dir.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+        except FileNotFoundError:
+            return
+        for path in cached[settings.REPORT_CACHE_LIMIT:]:
+            path.unlink(missing_ok=True)
+
+    def _progress(self, job: ReportJob) -> ReportJob:
+        """A running job with the progress its worker last reported"""
+        try:
+            data = json.loads((self.work_dir / job.id / "progress.json").read_bytes())
+        except (OSError, ValueError):
+            return job
+        return dataclasses.replace(job, progress=data["progress"], message=data["message"], rows=data["rows"])
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        """A job with its latest progress, or None if unknown"""
+        with self._lock:
+            job = self._load().get(job_id)
+        if job is not None and job.status == JobStatus.RUNNING:
+            return self._progress(job)
+        return job
+
+    def jobs(self, requested_by: Optional[str] = None) -> List[ReportJob]:
+        """
+        Listed jobs, newest first
+
+        Args:
+            requested_by (Optional[str]): Only this user's jobs; None for all
+
+        Returns:
+            List[ReportJob]: Jobs with their latest progress
+        """
+        with self._lock:
+            jobs = sorted(self._load().values(), key=lambda j: j.created_at, reverse=True)
+        return [
+            self._progress(job) if job.status == JobStatus.RUNNING else job
+            for job in jobs if requested_by is None or job.requested_by == requested_by
+        ]
+
+    def artefact_path(self, job: ReportJob) -> Optional[Path]:
+        """The rendered file of a finished job, or None if it is not ready or was evicted"""
+        if job.status != JobStatus.DONE or job.cache_key is None:
+            return None
+        path = self._artefact(job.format, job.cache_key)
+        return path if path.exists() else None
+
+    def artefact_name(self, job: ReportJob) -> str:
+        """Download file name for a job's report or export"""
+        kind = "export" if job.format in EXPORT_FORMATS else "report"
+        return f"portfolio_{kind}_{job.created_at:%Y%m%d_%H%M}{FORMATS[job.format][1]}"
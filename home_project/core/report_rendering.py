@@ -0,0 +1,348 @@
+# core/report_rendering.py
+import csv
+import heapq
+import json
+import mmap
+import os
+import tempfile
+import zipfile
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from config.settings import settings
+from database import binary_format
+from models.project import Project, ProjectPriority, ProjectStatus
+from utils.file_utils import atomic_write
+
+# Report rendering runs in worker processes, so this module must stay
+# importable without Streamlit or any app service.
+
+try:
+    import openpyxl
+except ImportError:  # Optional; Excel reports are then unavailable
+    openpyxl = None
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:  # Optional; PDF reports are then unavailable
+    SimpleDocTemplate = None
+
+REPORT_FORMAT = 1  # Bump when the output changes so cached reports are rendered again
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# format: (label, file suffix, MIME type)
+FORMATS: Dict[str, Tuple[str, str, str]] = {
+    "xlsx": ("Excel report", ".xlsx", XLSX_MIME),
+    "pdf": ("PDF report", ".pdf", "application/pdf"),
+    "csv": ("CSV export", ".zip", "application/zip"),
+    "xlsx_export": ("Excel export", ".xlsx", XLSX_MIME),
+}
+EXPORT_FORMATS = ("csv", "xlsx_export")  # Every stored field, rather than a summary
+
+PROJECT_COLUMNS = ["Project", "ID", "Status", "Priority", "Start", "End", "Budget", "Spent", "Variance", "Progress (%)", "Overdue"]
+
+# Exported table: (sheet title, columns); milestones and team members get a row each
+EXPORT_TABLES: Dict[str, Tuple[str, List[str]]] = {
+    "projects": ("Projects", [
+        "ID", "Name", "Description", "Status", "Priority", "Start", "End", "Budget", "Spent", "Progress (%)",
+        "Latitude", "Longitude", "Milestones", "Team Size", "Created", "Updated",
+    ]),
+    "milestones": ("Milestones", [
+        "Project ID", "Project", "Title", "Due", "Completed", "Completion Date", "Description",
+    ]),
+    "team_members": ("Team Members", ["Project ID", "Project", "Member"]),
+}
+
+EXCEL_MAX_ROWS = 1048576  # Rows per worksheet, header included
+
+def available_formats() -> List[str]:
+    """Formats whose optional renderer is installed"""
+    installed = {
+        "xlsx": openpyxl is not None,
+        "pdf": SimpleDocTemplate is not None,
+        "csv": True,
+        "xlsx_export": openpyxl is not None,
+    }
+    return [name for name in FORMATS if installed[name]]
+
+class _Progress:
+    """Progress shared with the app through a small JSON file, rewritten every few thousand rows"""
+
+    def __init__(self, path: Path, total: int):
+        self.path = path
+        self.total = max(total, 1)
+
+    def update(self, done: int, message: str, final: bool = False) -> None:
+        if final or done % settings.REPORT_PROGRESS_ROWS == 0:
+            # Rendering is most of the work; the last stretch is writing the file
+            fraction = 0.95 if final else 0.95 * done / self.total
+            atomic_write(self.path, json.dumps({"progress": fraction, "message": message, "rows": done}).encode("utf-8"))
+
+class _Totals:
+    """Portfolio aggregates accumulated while rows stream past"""
+
+    def __init__(self, as_of: datetime):
+        self.as_of = as_of
+        self.projects = 0
+        self.budget = 0.0
+        self.spent = 0.0
+        self.overdue = 0
+        self.by_status: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        self.by_priority: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+
+    def is_overdue(self, project: Project) -> bool:
+        return self.as_of > project.end_date and project.status != ProjectStatus.COMPLETED
+
+    def add(self, project: Project) -> None:
+        self.projects += 1
+        self.budget += project.budget
+        self.spent += project.spent
+        self.overdue += self.is_overdue(project)
+        for group in (self.by_status[project.status.value], self.by_priority[project.priority.value]):
+            group[0] += 1
+            group[1] += project.budget
+            group[2] += project.spent
+
+    def summary_rows(self, params: Dict[str, Any]) -> List[List[Any]]:
+        """Summary table rows: headline figures, then status and priority breakdowns"""
+        rows = [
+            ["Portfolio Report"],
+            ["Generated", self.as_of.strftime("%d-%m-%Y %H:%M")],
+            ["Statuses", ", ".join(params.get("statuses") or []) or "All"],
+            [],
+            ["Projects", self.projects],
+            ["Total Budget", round(self.budget, 2)],
+            ["Total Spent", round(self.spent, 2)],
+            ["Variance", round(self.budget - self.spent, 2)],
+            ["Overdue Projects", self.overdue],
+        ]
+        for title, groups, order in (
+            ("Status", self.by_status, [s.value for s in ProjectStatus]),
+            ("Priority", self.by_priority, [p.value for p in ProjectPriority]),
+        ):
+            rows += [[], [title, "Projects", "Budget", "Spent", "Variance"]]
+            for name in order:
+                if name in groups:
+                    count, budget, spent = groups[name]
+                    rows.append([name, count, round(budget, 2), round(spent, 2), round(budget - spent, 2)])
+        return rows
+
+def _project_row(project: Project, totals: _Totals) -> List[Any]:
+    return [
+        project.name,
+        project.id,
+        project.status.value,
+        project.priority.value,
+        project.start_date.date(),
+        project.end_date.date(),
+        round(project.budget, 2),
+        round(project.spent, 2),
+        round(project.budget - project.spent, 2),
+        round(project.progress, 1),
+        "Yes" if totals.is_overdue(project) else "",
+    ]
+
+def _selected(projects: Iterable[Project], params: Dict[str, Any], progress: _Progress) -> Iterator[Project]:
+    """Projects matching the report filters, reporting progress over every project read"""
+    statuses = set(params.get("statuses") or [])
+    for done, project in enumerate(projects, 1):
+        progress.update(done, "Rendering")
+        if not statuses or project.status.value in statuses:
+            yield project
+
+def _render_excel(projects: Iterable[Project], path: Path, totals: _Totals, params: Dict[str, Any]) -> None:
+    # Write-only sheets stream rows to disk instead of holding the workbook in memory
+    workbook = openpyxl.Workbook(write_only=True)
+    summary = workbook.create_sheet("Summary")
+    sheet = workbook.create_sheet("Projects")
+    sheet.append(PROJECT_COLUMNS)
+    for project in projects:
+        totals.add(project)
+        sheet.append(_project_row(project, totals))
+    for row in totals.summary_rows(params):
+        summary.append(row)
+    workbook.save(path)
+
+def _render_pdf(projects: Iterable[Project], path: Path, totals: _Totals, params: Dict[str, Any]) -> None:
+    # Only the largest projects are listed, so memory stays bounded by REPORT_PDF_ROWS
+    largest: List[Tuple[float, int, List[Any]]] = []
+    for sequence, project in enumerate(projects):
+        totals.add(project)
+        entry = (project.budget, -sequence, _project_row(project, totals))
+        if len(largest) < settings.REPORT_PDF_ROWS:
+            heapq.heappush(largest, entry)
+        elif entry > largest[0]:
+            heapq.heapreplace(largest, entry)
+    largest.sort(reverse=True)
+
+    styles = getSampleStyleSheet()
+    grid = TableStyle([
+        ("FONTSIZE", (0, 0), (-1, -1), 7),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ])
+    summary = [[_pdf_cell(value) for value in row] for row in totals.summary_rows(params)[1:] if row]
+    story = [
+        Paragraph("Portfolio Report", styles["Title"]),
+        Table(summary, hAlign="LEFT", style=TableStyle([("FONTSIZE", (0, 0), (-1, -1), 8)])),
+        Spacer(1, 12),
+        Paragraph(f"Largest {len(largest):,} of {totals.projects:,} projects by budget", styles["Heading2"]),
+        Table(
+            [PROJECT_COLUMNS] + [[_pdf_cell(value) for value in row] for _, _, row in largest],
+            repeatRows=1,
+            style=grid
+        ),
+    ]
+    SimpleDocTemplate(str(path), pagesize=landscape(A4), title="Portfolio Report").build(story)
+
+def _pdf_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    if hasattr(value, "strftime"):
+        return value.strftime("%d-%m-%Y")
+    return str(value)
+
+def _export_rows(project: Project) -> Iterator[Tuple[str, List[Any]]]:
+    """(table, row) for a project and each of its milestones and team members"""
+    yield "projects", [
+        project.id,
+        project.name,
+        project.description,
+        project.status.value,
+        project.priority.value,
+        project.start_date,
+        project.end_date,
+        project.budget,
+        project.spent,
+        project.progress,
+        project.latitude,
+        project.longitude,
+        len(project.milestones),
+        len(project.team_members),
+        project.created_at,
+        project.updated_at,
+    ]
+    for milestone in project.milestones:
+        yield "milestones", [
+            project.id,
+            project.name,
+            milestone.title,
+            milestone.due_date,
+            milestone.completed,
+            milestone.completion_date,
+            milestone.description,
+        ]
+    for member in project.team_members:
+        yield "team_members", [project.id, project.name, member]
+
+def _export_csv(projects: Iterable[Project], path: Path, scratch: Path, totals: _Totals) -> None:
+    # Each table streams to its own file, which is then compressed into the archive in blocks
+    with tempfile.TemporaryDirectory(dir=scratch) as tables:
+        with ExitStack() as files:
+            writers = {}
+            for table, (_, columns) in EXPORT_TABLES.items():
+                f = files.enter_context(open(Path(tables) / f"{table}.csv", 'w', newline='', encoding='utf-8'))
+                writers[table] = csv.writer(f)
+                writers[table].writerow(columns)
+            for project in projects:
+                totals.add(project)
+                for table, row in _export_rows(project):
+                    writers[table].writerow(row)
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for table in EXPORT_TABLES:
+                archive.write(Path(tables) / f"{table}.csv", f"{table}.csv")
+
+class _ExcelTable:
+    """One exported table, continued on a numbered sheet whenever a sheet is full"""
+
+    def __init__(self, workbook, title: str, columns: List[str]):
+        self.workbook = workbook
+        self.title = title
+        self.columns = columns
+        self.sheets = 0
+        self._add_sheet()
+
+    def _add_sheet(self) -> None:
+        self.sheets += 1
+        name = self.title if self.sheets == 1 else f"{self.title} ({self.sheets})"
+        self.sheet = self.workbook.create_sheet(name)
+        self.sheet.append(self.columns)
+        self.rows = 1
+
+    def append(self, row: List[Any]) -> None:
+        if self.rows == EXCEL_MAX_ROWS:
+            self._add_sheet()
+        self.sheet.append(row)
+        self.rows += 1
+
+def _export_excel(projects: Iterable[Project], path: Path, totals: _Totals) -> None:
+    # Write-only sheets keep inline strings and stream each sheet to its own temporary file
+    workbook = openpyxl.Workbook(write_only=True)
+    tables = {table: _ExcelTable(workbook, title, columns) for table, (title, columns) in EXPORT_TABLES.items()}
+    for project in projects:
+        totals.add(project)
+        for table, row in _export_rows(project):
+            tables[table].append(row)
+    workbook.save(path)
+
+def render_report(snapshot_path: str, output_path: str, progress_path: str, fmt: str, params: Dict[str, Any]) -> int:
+    """
+    Render a portfolio report or data export from a project snapshot file
+
+    Runs in a worker process. Projects are decoded one at a time from the
+    memory-mapped snapshot, whose pages are released behind the reader,
+    and progress is written to progress_path as
+    they are rendered. Exports write projects, milestones and team members
+    as separate tables: three CSV files in a zip archive, or three sheets
+    of a workbook. Temporary files go next to progress_path.
+
+    Args:
+        snapshot_path (str): Snapshot in the binary project format
+        output_path (str): Where to write the report; replaced atomically
+        progress_path (str): JSON file receiving progress updates
+        fmt (str): One of FORMATS
+        params (Dict[str, Any]): Report options; "statuses" limits the projects included
+
+    Returns:
+        int: Number of projects in the report
+
+    Raises:
+        ValueError: If the format is unknown or its renderer is not installed
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Report format not available: {fmt}")
+    output = Path(output_path)
+    # Jobs of different users can render the same cache key at once; each needs its own file
+    fd, tmp_name = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    totals = _Totals(datetime.now())
+    try:
+        with open(snapshot_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            progress = _Progress(Path(progress_path), binary_format.read_header(data).count)
+            projects = _selected(
+                binary_format.iter_projects(data, release_every=settings.REPORT_PROGRESS_ROWS), params, progress
+            )
+            if fmt == "xlsx":
+                _render_excel(projects, tmp_path, totals, params)
+            elif fmt == "pdf":
+                _render_pdf(projects, tmp_path, totals, params)
+            elif fmt == "csv":
+                _export_csv(projects, tmp_path, Path(progress_path).parent, totals)
+            else:
+                _export_excel(projects, tmp_path, totals)
+        os.replace(tmp_path, output)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    progress.update(totals.projects, "Finished", final=True)
+    return totals.projects
@@ -0,0 +1,251 @@
+# core/risk_simulation.py
+import hashlib
+import threading
+from datetime import date, datetime
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from models.project import Project, ProjectStatus
+from utils.profiler import profiler
+import logging
+
+# Projects whose outcome is settled are not simulated
+SIMULATED_STATUSES = (ProjectStatus.PLANNING, ProjectStatus.IN_PROGRESS, ProjectStatus.ON_HOLD)
+
+# Input columns, one row per project
+INPUTS = ("start", "end", "budget", "spent", "progress", "slip", "volatility")
+
+class RiskModel(NamedTuple):
+    """Model parameters, passed explicitly so pool workers need no settings"""
+    schedule_bias: float
+    schedule_volatility: float
+    cost_bias: float
+    cost_volatility: float
+    correlation: float
+
+    @classmethod
+    def from_settings(cls) -> "RiskModel":
+        return cls(
+            settings.RISK_SCHEDULE_BIAS,
+            settings.RISK_SCHEDULE_VOLATILITY,
+            settings.RISK_COST_BIAS,
+            settings.RISK_COST_VOLATILITY,
+            settings.RISK_COST_SCHEDULE_CORRELATION,
+        )
+
+class ProjectRisk(NamedTuple):
+    """Simulated outcome for one project; dates are day ordinals"""
+    project_id: str
+    p50_finish: float
+    p90_finish: float
+    late_probability: float
+    p50_cost: float
+    p90_cost: float
+    overrun_probability: float
+    cost_mean: float
+    cost_variance: float
+
+    @property
+    def p50_finish_date(self) -> date:
+        return date.fromordinal(int(round(self.p50_finish)))
+
+    @property
+    def p90_finish_date(self) -> date:
+        return date.fromordinal(int(round(self.p90_finish)))
+
+class PortfolioRisk(NamedTuple):
+    """Per-project risk plus portfolio-level expectations"""
+    projects: List[ProjectRisk]
+    expected_late: float  # Expected number of projects finishing after their end date
+    expected_overruns: float  # Expected number of projects exceeding budget
+    p50_cost: float  # Total cost at completion, normal approximation over independent projects
+    p90_cost: float
+    budget: float
+
+def project_inputs(project: Project, as_of: datetime) -> Tuple[float, ...]:
+    """
+    Simulation inputs for one project, in INPUTS order; also its cache key
+
+    slip is the share of milestones already due that are not completed.
+    """
+    due = [m for m in project.milestones if m.due_date <= as_of]
+    slip = sum(1 for m in due if not m.completed) / len(due) if due else 0.0
+    volatility = settings.RISK_ON_HOLD_VOLATILITY if project.status == ProjectStatus.ON_HOLD else 1.0
+    return (
+        float(project.start_date.toordinal()),
+        float(project.end_date.toordinal()),
+        float(project.budget),
+        float(project.spent),
+        float(project.progress),
+        slip,
+        volatility,
+    )
+
+def project_seed(project_id: str) -> int:
+    """Stable 64-bit seed component for a project, independent of batch composition"""
+    return int.from_bytes(hashlib.blake2b(project_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+def simulate(
+    inputs: np.ndarray,
+    seeds: np.ndarray,
+    as_of: float,
+    samples: int,
+    seed: int,
+    model: RiskModel
+) -> np.ndarray:
+    """
+    Simulate completion dates and costs for a batch of projects
+
+    Each project draws its normals from its own generator seeded by
+    (seed, project seed), so its result does not depend on which batch or
+    worker it lands in. Everything after the draws is vectorized over the
+    whole (projects, samples) matrix.
+
+    Schedule: the projected total duration blends the plan with the pace
+    observed so far (elapsed / progress), trusting the pace more as
+    progress grows; the remaining duration is scaled by a mean-one
+    lognormal whose spread shrinks with progress and grows with milestone
+    slip. Cost follows the same scheme around an earned-value estimate at
+    completion, correlated with the schedule draw.
+
+    Args:
+        inputs (np.ndarray): (n, len(INPUTS)) project inputs
+        seeds (np.ndarray): (n,) uint64 project seeds
+        as_of (float): Valuation date as a day ordinal
+        samples (int): Draws per project
+        seed (int): Run seed
+        model (RiskModel): Bias, volatility and correlation parameters
+
+    Returns:
+        np.ndarray: (n, 8) p50/p90 finish, late probability, p50/p90 cost,
+            overrun probability, cost mean and cost variance
+    """
+    n = len(inputs)
+    normals = np.empty((n, 2, samples))
+    for row, project in enumerate(seeds.tolist()):
+        rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence([seed, project])))
+        normals[row] = rng.standard_normal((2, samples))
+
+    start, end, budget, spent, progress, slip, volatility = (inputs[:, i:i + 1] for i in range(len(INPUTS)))
+    done = np.clip(progress / 100.0, 0.0, 0.99)
+    planned = np.maximum(end - start, 1.0)
+    elapsed = np.maximum(as_of - start, 0.0)
+    uncertainty = np.sqrt(1.0 - done) * (1.0 + slip) * volatility
+
+    # Schedule
+    paced = np.where((elapsed > 0) & (done > 0), elapsed / np.maximum(done, 1e-9), planned)
+    projected = done * paced + (1.0 - done) * planned * (1.0 + model.schedule_bias)
+    remaining = np.maximum(projected - elapsed, 1.0)
+    sigma = model.schedule_volatility * uncertainty
+    schedule_draw = normals[:, 0]
+    finish = np.maximum(as_of, start) + remaining * np.exp(sigma * schedule_draw - sigma ** 2 / 2)
+
+    # Cost
+    earned = budget * done
+    performance = np.where((spent > 0) & (earned > 0), earned / np.maximum(spent, 1e-9), 1.0)
+    at_completion = spent + (budget - earned) / performance
+    estimate = np.maximum(done * at_completion + (1.0 - done) * budget * (1.0 + model.cost_bias), spent)
+    rho = model.correlation
+    cost_draw = rho * schedule_draw + np.sqrt(1.0 - rho ** 2) * normals[:, 1]
+    sigma = model.cost_volatility * uncertainty
+    cost = spent + (estimate - spent) * np.exp(sigma * cost_draw - sigma ** 2 / 2)
+
+    finish_p50, finish_p90 = np.percentile(finish, [50, 90], axis=1)
+    cost_p50, cost_p90 = np.percentile(cost, [50, 90], axis=1)
+    return np.column_stack((
+        finish_p50,
+        finish_p90,
+        (finish > end).mean(axis=1),
+        cost_p50,
+        cost_p90,
+        (cost > budget).mean(axis=1),
+        cost.mean(axis=1),
+        cost.var(axis=1),
+    ))
+
+class RiskSimulator:
+    """
+    Monte Carlo schedule and budget risk for the whole portfolio
+
+    Results are cached per project under its simulation inputs and the
+    valuation date, so only projects that changed are simulated again.
+    Large batches are split into chunks and run on a process pool; each
+    project's draws come from its own seed, so results are identical
+    whether a project is simulated alone, in a chunk or on another worker.
+    """
+
+    def __init__(self, pool_factory: Optional[Callable[[], object]] = None, seed: Optional[int] = None):
+        self.seed = settings.RISK_SEED if seed is None else seed
+        self.samples = settings.RISK_SAMPLES
+        self.model = RiskModel.from_settings()
+        self._pool_factory = pool_factory
+        self._lock = threading.Lock()
+        self._results: Dict[str, Tuple[Hashable, ProjectRisk]] = {}
+
+    @profiler.profiled("RiskSimulator.simulate_portfolio")
+    def simulate_portfolio(self, projects: Sequence[Project], as_of: Optional[datetime] = None) -> PortfolioRisk:
+        """
+        Risk for every active project and for the portfolio
+
+        Args:
+            projects (Sequence[Project]): Projects to consider; settled ones are skipped
+            as_of (Optional[datetime]): Valuation date; defaults to today
+
+        Returns:
+            PortfolioRisk: Per-project results in input order and portfolio totals
+        """
+        as_of = datetime.combine((as_of or datetime.now()).date(), datetime.min.time())
+        active = [p for p in projects if p.status in SIMULATED_STATUSES]
+        inputs = [project_inputs(p, as_of) for p in active]
+        keys = [(row, as_of.toordinal(), self.samples, self.seed, self.model) for row in inputs]
+
+        with self._lock:
+            stale = [
+                i for i, (project, key) in enumerate(zip(active, keys))
+                if self._results.get(project.id, (None,))[0] != key
+            ]
+        if stale:
+            results = self._run(
+                np.array([inputs[i] for i in stale], dtype=np.float64).reshape(-1, len(INPUTS)),
+                np.array([project_seed(active[i].id) for i in stale], dtype=np.uint64),
+                float(as_of.toordinal())
+            )
+            with self._lock:
+                for i, values in zip(stale, results.tolist()):
+                    self._results[active[i].id] = (keys[i], ProjectRisk(active[i].id, *values))
+
+        with self._lock:
+            risks = [self._results[p.id][1] for p in active]
+            live = {p.id for p in active}
+            for project_id in [i for i in self._results if i not in live]:
+                del self._results[project_id]
+
+        mean = sum(r.cost_mean for r in risks)
+        deviation = sum(r.cost_variance for r in risks) ** 0.5
+        return PortfolioRisk(
+            projects=risks,
+            expected_late=sum(r.late_probability for r in risks),
+            expected_overruns=sum(r.overrun_probability for r in risks),
+            p50_cost=mean,
+            p90_cost=mean + 1.2816 * deviation,  # z(0.9)
+            budget=sum(p.budget for p in active),
+        )
+
+    def _run(self, inputs: np.ndarray, seeds: np.ndarray, as_of: float) -> np.ndarray:
+        """Simulate inline, or in chunks on the process pool for large batches"""
+        if len(inputs) < settings.RISK_PARALLEL_THRESHOLD or self._pool_factory is None:
+            return simulate(inputs, seeds, as_of, self.samples, self.seed, self.model)
+        chunk = settings.RISK_CHUNK_SIZE
+        try:
+            pool = self._pool_factory()
+            futures = [
+                pool.submit(simulate, inputs[i:i + chunk], seeds[i:i + chunk], as_of, self.samples, self.seed, self.model)
+                for i in range(0, len(inputs), chunk)
+            ]
+            return np.concatenate([future.result() for future in futures])
+        except Exception as e:
+            # Seeds are per project, so the inline run gives the same results
+            logging.error("Risk simulation pool failed, simulating inline: %s", e)
+            return simulate(inputs, seeds, as_of, self.samples, self.seed, self.model)
@@ -0,0 +1,257 @@
+# core/scenario.py
+import dataclasses
+import math
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence
+
+from core.dependency_graph import DependencyGraph
+from core.exceptions import ValidationError
+from core.investment_metrics import InvestmentMetricsEngine, PortfolioMetrics
+from database.snapshot import ProjectSnapshot
+from models.investment import CashFlow, CashFlowType, Investment
+from models.project import Project, ProjectStatus
+from utils.profiler import profiler
+
+FIELDS = ("budget", "end_date", "status")  # What a scenario may change on a project
+
+class _Figures(NamedTuple):
+    """Portfolio aggregates over one project or a group of them"""
+    projects: int
+    active: int
+    budget: float
+    spent: float
+    overdue: FrozenSet[str]
+
+class Outlook(NamedTuple):
+    """Portfolio analytics under a scenario"""
+    summary: Dict[str, float]  # As ProjectStore.get_portfolio_summary, plus overdue_projects
+    overdue: FrozenSet[str]  # IDs of overdue projects
+    returns: PortfolioMetrics
+
+def _figures(project: Project, as_of: datetime) -> _Figures:
+    overdue = as_of > project.end_date and project.status != ProjectStatus.COMPLETED
+    return _Figures(
+        1,
+        int(project.status == ProjectStatus.IN_PROGRESS),
+        project.budget,
+        project.spent,
+        frozenset((project.id,)) if overdue else frozenset(),
+    )
+
+def _total(*parts: _Figures) -> _Figures:
+    return _Figures(
+        sum(part.projects for part in parts),
+        sum(part.active for part in parts),
+        sum(part.budget for part in parts),
+        sum(part.spent for part in parts),
+        frozenset().union(*(part.overdue for part in parts if part.overdue)),
+    )
+
+def scenario_investment(investment: Investment, base: Project, project: Project, as_of: datetime) -> Investment:
+    """
+    An investment as it would look if its project changed from base to project
+
+    A budget change is funded by the investor as of the valuation date (a
+    contribution, or a distribution when the budget is cut). Delaying or
+    advancing the project end moves an unrealized exit by the same number
+    of days, and cancelling the project writes the holding off.
+
+    Args:
+        investment (Investment): Stored investment
+        base (Project): Its project as stored
+        project (Project): Its project under the scenario
+        as_of (datetime): Valuation date
+
+    Returns:
+        Investment: A modified copy, or investment itself if nothing applies
+    """
+    if project is base:
+        return investment
+    cash_flows = investment.cash_flows
+    extra = project.budget - base.budget
+    if extra:
+        cash_flows = cash_flows + [CashFlow(
+            as_of,
+            abs(extra),
+            CashFlowType.CONTRIBUTION if extra > 0 else CashFlowType.DISTRIBUTION,
+            note="Scenario budget change"
+        )]
+    exit_value, exit_date = investment.exit_value, investment.exit_date
+    shift = project.end_date - base.end_date
+    if shift and not investment.is_realized:
+        exit_date = as_of + shift
+    if project.status == ProjectStatus.CANCELLED and base.status != ProjectStatus.CANCELLED:
+        exit_value = 0.0
+    return dataclasses.replace(investment, cash_flows=cash_flows, exit_value=exit_value, exit_date=exit_date)
+
+class Scenario:
+    """
+    A what-if sandbox over one project snapshot
+
+    Budget, end date and status changes are kept as per-project deltas on
+    the base snapshot and never written to the store. Analytics are nodes
+    of a memoized dependency graph:
+
+        project -> figures -> bucket -> summary, overdue
+        project -> investment -> returns
+
+    Projects are grouped into about sqrt(n) buckets, so changing one
+    project recomputes its figures, one bucket and the totals over the
+    buckets, plus the IRR of the investments in that project and the
+    pooled IRR; every other project keeps its memoized values.
+    """
+
+    def __init__(
+        self,
+        base: ProjectSnapshot,
+        investments: Sequence[Investment],
+        metrics: InvestmentMetricsEngine,
+        as_of: Optional[datetime] = None
+    ):
+        self.base = base
+        self.investments = list(investments)
+        self.metrics = metrics
+        self.as_of = as_of or datetime.now()
+        self._overlay: Dict[str, Dict[str, Any]] = {}
+        self._graph = DependencyGraph()
+        self._build()
+        self.baseline = self.outlook()
+
+    @profiler.profiled("Scenario.build")
+    def _build(self) -> None:
+        graph, as_of = self._graph, self.as_of
+        projects = self.base.projects
+        size = max(16, math.isqrt(len(projects)))
+        buckets = []
+        for start in range(0, len(projects), size):
+            members = []
+            for project in projects[start:start + size]:
+                graph.set_input(("project", project.id), project)
+                graph.define(("figures", project.id), lambda p: _figures(p, as_of), [("project", project.id)])
+                members.append(("figures", project.id))
+            buckets.append(("bucket", len(buckets)))
+            graph.define(buckets[-1], _total, members)
+        graph.define(("totals",), _total, buckets)
+
+        # Solved together up front; afterwards one investment at a time
+        evaluated = self.metrics.evaluate(self.investments, as_of)
+        nodes = []
+        for investment, result in zip(self.investments, evaluated):
+            node = ("investment", investment.id)
+            base = self.base.get(investment.project_id) if investment.project_id else None
+            if base is None:
+                graph.define(node, lambda result=result: result, value=result)
+            else:
+                graph.define(node, self._evaluator(investment, base), [("project", base.id)], value=result)
+            nodes.append(node)
+        graph.define(("returns",), lambda *results: self.metrics.pool(results), nodes)
+
+    def _evaluator(self, investment: Investment, base: Project):
+        def evaluate(project: Project):
+            changed = scenario_investment(investment, base, project, self.as_of)
+            return self.metrics.evaluate([changed], self.as_of)[0]
+        return evaluate
+
+    @property
+    def overlay(self) -> Dict[str, Dict[str, Any]]:
+        """Changed fields per project ID"""
+        return {project_id: dict(fields) for project_id, fields in self._overlay.items()}
+
+    @property
+    def recomputed(self) -> int:
+        """Graph nodes evaluated since the scenario was created"""
+        return self._graph.recomputed
+
+    @property
+    def node_count(self) -> int:
+        return len(self._graph)
+
+    def adjust(self, project_id: str, **changes: Any) -> None:
+        """
+        Change fields of a project in the scenario
+
+        Args:
+            project_id (str): Project ID
+            **changes: New budget, end_date and/or status; a value equal to
+                the stored one removes that change
+
+        Raises:
+            ValidationError: If the project or a field is unknown, or the result is invalid
+        """
+        base = self.base.get(project_id)
+        if base is None:
+            raise ValidationError(f"Unknown project: {project_id}")
+        unknown = set(changes) - set(FIELDS)
+        if unknown:
+            raise ValidationError(f"Cannot change {', '.join(sorted(unknown))} in a scenario")
+        if "status" in changes and not isinstance(changes["status"], ProjectStatus):
+            raise ValidationError(f"Invalid status: {changes['status']}")
+
+        fields = dict(self._overlay.get(project_id, {}), **changes)
+        fields = {name: value for name, value in fields.items() if getattr(base, name) != value}
+        project = dataclasses.replace(base, **fields) if fields else base
+        if project.budget < 0:
+            raise ValidationError("Budget cannot be negative")
+        if project.end_date < project.start_date:
+            raise ValidationError("End date cannot be before the start date")
+
+        if fields:
+            self._overlay[project_id] = fields
+        else:
+            self._overlay.pop(project_id, None)
+        self._graph.set_input(("project", project_id), project)
+
+    def reset(self, project_id: Optional[str] = None) -> None:
+        """Drop the changes to one project, or to all of them"""
+        for changed in [project_id] if project_id is not None else list(self._overlay):
+            if self._overlay.pop(changed, None) is not None:
+                self._graph.set_input(("project", changed), self.base.get(changed))
+
+    def project(self, project_id: str) -> Optional[Project]:
+        """A project as the scenario has it"""
+        if ("project", project_id) not in self._graph:
+            return None
+        return self._graph.get(("project", project_id))
+
+    @profiler.profiled("Scenario.outlook")
+    def outlook(self) -> Outlook:
+        """Portfolio analytics with the scenario's changes applied"""
+        totals = self._graph.get(("totals",))
+        summary = {
+            "total_projects": totals.projects,
+            "active_projects": totals.active,
+            "total_budget": totals.budget,
+            "total_spent": totals.spent,
+            "overdue_projects": len(totals.overdue),
+        }
+        return Outlook(summary, totals.overdue, self._graph.get(("returns",)))
+
+    def changes(self) -> List[Dict[str, Any]]:
+        """One row per changed field: project, field, stored and scenario value"""
+        rows = []
+        for project_id, fields in self._overlay.items():
+            base = self.base.get(project_id)
+            for name, value in fields.items():
+                rows.append({"project_id": project_id, "project": base.name, "field": name,
+                             "stored": getattr(base, name), "scenario": value})
+        return rows
+
+    def rebase(self, base: ProjectSnapshot, investments: Sequence[Investment]) -> "Scenario":
+        """
+        The same changes over newer data, keeping those that still apply
+
+        Args:
+            base (ProjectSnapshot): Current snapshot
+            investments (Sequence[Investment]): Current investments
+
+        Returns:
+            Scenario: A new scenario; changes to deleted projects, or that are
+                no longer valid, are dropped
+        """
+        scenario = Scenario(base, investments, self.metrics)
+        for project_id, fields in self._overlay.items():
+            try:
+                scenario.adjust(project_id, **fields)
+            except ValidationError:
+                continue
+        return scenario
@@ -0,0 +1,193 @@
+# core/services.py
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from config.settings import settings
+from core.exceptions import AppException
+
+class ServiceRegistry:
+    """
+    Process-wide registry of long-lived services.
+
+    Streamlit re-executes the app script on every interaction, but imported
+    modules stay loaded, so services registered here are created once per
+    process and shared by every session and rerun. Factories run lazily on
+    first access.
+
+    Attributes:
+        _factories (Dict[str, Callable[[], Any]]): Service constructors by name
+        _instances (Dict[str, Any]): Services created so far
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register a service factory, replacing any existing instance
+
+        Args:
+            name (str): Service name
+            factory (Callable[[], Any]): Zero-argument constructor
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance of a service, creating it on first use
+
+        Args:
+            name (str): Service name
+
+        Returns:
+            Any: Service instance
+
+        Raises:
+            AppException: If no factory is registered under that name
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise AppException(f"Unknown service: {name}")
+                self._instances[name] = factory()
+            return self._instances[name]
+
+    def reset(self) -> None:
+        """Drop all created instances so they are rebuilt on next access"""
+        with self._lock:
+            self._instances.clear()
+
+    @property
+    def user_store(self):
+        return self.get("user_store")
+
+    @property
+    def project_store(self):
+        return self.get("project_store")
+
+    @property
+    def company_store(self):
+        return self.get("company_store")
+
+    @property
+    def investment_store(self):
+        return self.get("investment_store")
+
+    @property
+    def investment_metrics(self):
+        return self.get("investment_metrics")
+
+    @property
+    def rollups(self):
+        return self.get("rollups")
+
+    @property
+    def progress_history(self):
+        return self.get("progress_history")
+
+    @property
+    def spatial_index(self):
+        return self.get("spatial_index")
+
+    @property
+    def risk_simulator(self):
+        return self.get("risk_simulator")
+
+    @property
+    def process_pool(self):
+        return self.get("process_pool")
+
+    @property
+    def report_jobs(self):
+        return self.get("report_jobs")
+
+    @property
+    def document_store(self):
+        return self.get("document_store")
+
+    @property
+    def document_previews(self):
+        return self.get("document_previews")
+
+    @property
+    def auth_service(self):
+        return self.get("auth_service")
+
+    @property
+    def executor(self):
+        return self.get("executor")
+
+    @property
+    def assets(self):
+        return self.get("assets")
+
+def _register_defaults(registry: ServiceRegistry) -> None:
+    """Register the application's default services"""
+    from core.authentication import AuthenticationService
+    from core.investment_metrics import InvestmentMetricsEngine
+    from core.document_previews import DocumentPreviews
+    from core.report_jobs import ReportJobs
+    from core.risk_simulation import RiskSimulator
+    from database.company_store import CompanyStore
+    from database.document_store import DocumentStore
+    from database.investment_store import InvestmentStore
+    from database.monthly_rollups import MonthlyRollups
+    from database.progress_history import ProgressHistory
+    from database.project_store import ProjectStore
+    from database.spatial_index import SpatialIndex
+    from database.user_store import UserStore
+    from ui.assets import AssetPipeline
+
+    registry.register("user_store", UserStore)
+    registry.register("project_store", ProjectStore)
+    registry.register("company_store", CompanyStore)
+    registry.register("investment_store", InvestmentStore)
+    registry.register("investment_metrics", InvestmentMetricsEngine)
+    registry.register("rollups", lambda: MonthlyRollups(registry.project_store))
+    registry.register("progress_history", lambda: ProgressHistory(registry.project_store))
+    registry.register("spatial_index", lambda: SpatialIndex(registry.project_store))
+    registry.register("auth_service", lambda: AuthenticationService(registry.user_store))
+    registry.register("executor", lambda: ThreadPoolExecutor(
+        max_workers=settings.BACKGROUND_WORKERS,
+        thread_name_prefix="background",
+    ))
+    # Spawned rather than forked: the app process runs threads
+    registry.register("process_pool", lambda: ProcessPoolExecutor(
+        max_workers=settings.RISK_WORKERS or None,
+        mp_context=multiprocessing.get_context("spawn"),
+    ))
+    registry.register("risk_simulator", lambda: RiskSimulator(lambda: registry.process_pool))
+    registry.register("report_jobs", lambda: ReportJobs(
+        registry.project_store,
+        registry.executor,
+        lambda: registry.process_pool,
+    ))
+    registry.register("document_store", DocumentStore)
+    registry.register("document_previews", lambda: DocumentPreviews(
+        registry.document_store.blobs,
+        registry.executor,
+    ))
+    registry.register("assets", lambda: _build_assets(AssetPipeline()))
+
+def _build_assets(pipeline):
+    """Prepare static assets when the pipeline is first created"""
+    try:
+        pipeline.build()
+    except Exception as e:
+        logging.error("Asset build failed: %s", e)
+    return pipeline
+
+services = ServiceRegistry()
+_register_defaults(services)
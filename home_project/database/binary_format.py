@@ -0,0 +1,467 @@
+# database/binary_format.py
+"""
+Compact binary snapshot format for projects.
+
+Layout (little-endian):
+
+    header   magic "PRJB", u16 version, u16 flags, u32 record count,
+             u64 offset of the string table, u64 offset of the index
+    records  u32 length + record body, one per project
+    strings  u32 count, then u16 length + UTF-8 bytes per string
+    index    one fixed-width entry per record, sorted by id hash:
+             u64 id hash, u64 record offset, u32 record length
+
+Version 1 files have no index (and no index offset in the header); they
+are still read, and are written as version 2.
+
+A record body is a fixed part (epoch-microsecond timestamps, one-byte
+status and priority codes, amounts, counts and string lengths) followed by
+the id, name and description, the team members as u32 indices into the
+string table, the milestones and, for a project with a location, its
+latitude and longitude as two f64. Readers detect the location from the
+record length, so files without locations read the same and older
+readers ignore it. The string table and index are written
+last so the file can be produced in one streaming pass; the index lets a
+single project be found and decoded without reading the others.
+
+Convert an existing file (the format is chosen by suffix):
+    python -m database.binary_format data/projects.json data/projects.bin
+"""
+import argparse
+import hashlib
+import io
+import mmap
+import struct
+from array import array
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from core.exceptions import DatabaseError
+from models.project import Project, ProjectMilestone, ProjectPriority, ProjectStatus, naive_local
+
+MAGIC = b"PRJB"
+VERSION = 2
+
+HEADER_V1 = struct.Struct("<4sHHIQ")
+HEADER = struct.Struct("<4sHHIQQ")
+# id hash, offset of the record's length prefix, record length including the prefix
+INDEX_ENTRY = struct.Struct("<QQI")
+LENGTH = struct.Struct("<I")
+# start, end, created, updated, status, priority, budget, spent, progress,
+# milestone count, team count, id length, name length, description length
+FIXED = struct.Struct("<qqqqBBdddHHHHI")
+# due date, completion date, flags, title length, description length
+MILESTONE = struct.Struct("<qqBHI")
+# latitude, longitude; present only if the record body extends past the milestones
+LOCATION = struct.Struct("<dd")
+STRING_LENGTH = struct.Struct("<H")
+_ID_LENGTH_OFFSET = struct.calcsize("<qqqqBBdddHH")
+
+class Header(NamedTuple):
+    version: int
+    count: int
+    records_offset: int
+    strings_offset: int
+    index_offset: int  # 0 when the file has no index
+
+_COMPLETED = 0x01
+_HAS_COMPLETION_DATE = 0x02
+_HAS_DESCRIPTION = 0x04
+
+# Codes are part of the file format: append new members, never renumber
+STATUS_CODES: Dict[ProjectStatus, int] = {
+    ProjectStatus.PLANNING: 0,
+    ProjectStatus.IN_PROGRESS: 1,
+    ProjectStatus.ON_HOLD: 2,
+    ProjectStatus.COMPLETED: 3,
+    ProjectStatus.CANCELLED: 4,
+}
+PRIORITY_CODES: Dict[ProjectPriority, int] = {
+    ProjectPriority.LOW: 0,
+    ProjectPriority.MEDIUM: 1,
+    ProjectPriority.HIGH: 2,
+    ProjectPriority.CRITICAL: 3,
+}
+_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+_PRIORITIES = {code: priority for priority, code in PRIORITY_CODES.items()}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _to_epoch(value: datetime) -> int:
+    """Microseconds since the epoch of the naive local time, as the JSON format stores it"""
+    return (naive_local(value) - _EPOCH) // _MICROSECOND
+
+def _from_epoch(value: int) -> datetime:
+    return _EPOCH + timedelta(0, 0, value)
+
+class _DatetimeCache(dict):
+    """
+    Epoch value -> datetime for one decode pass. Dates entered in the UI
+    are mostly midnights, so most timestamps repeat and can share one
+    (immutable) datetime instead of being rebuilt.
+    """
+    def __missing__(self, value: int) -> datetime:
+        result = self[value] = _from_epoch(value)
+        return result
+
+def encode_record(project: Project, strings: Dict[str, int]) -> bytes:
+    """
+    Encode one project, including its length prefix
+
+    Args:
+        project (Project): Project to encode
+        strings (Dict[str, int]): String table being built; new team members are added
+
+    Returns:
+        bytes: Length-prefixed record
+    """
+    id_bytes = project.id.encode("utf-8")
+    name = project.name.encode("utf-8")
+    description = project.description.encode("utf-8")
+    team = [strings.setdefault(member, len(strings)) for member in project.team_members]
+
+    parts = [
+        FIXED.pack(
+            _to_epoch(project.start_date), _to_epoch(project.end_date),
+            _to_epoch(project.created_at), _to_epoch(project.updated_at),
+            STATUS_CODES[project.status], PRIORITY_CODES[project.priority],
+            project.budget, project.spent, project.progress,
+            len(project.milestones), len(team),
+            len(id_bytes), len(name), len(description)
+        ),
+        id_bytes, name, description,
+        struct.pack(f"<{len(team)}I", *team),
+    ]
+    for milestone in project.milestones:
+        title = milestone.title.encode("utf-8")
+        milestone_description = (milestone.description or "").encode("utf-8")
+        flags = (
+            (_COMPLETED if milestone.completed else 0)
+            | (_HAS_COMPLETION_DATE if milestone.completion_date else 0)
+            | (_HAS_DESCRIPTION if milestone.description is not None else 0)
+        )
+        parts.append(MILESTONE.pack(
+            _to_epoch(milestone.due_date),
+            _to_epoch(milestone.completion_date) if milestone.completion_date else 0,
+            flags, len(title), len(milestone_description)
+        ))
+        parts.append(title)
+        parts.append(milestone_description)
+    if project.location is not None:
+        parts.append(LOCATION.pack(*project.location))
+
+    body = b"".join(parts)
+    return LENGTH.pack(len(body)) + body
+
+def decode_record(data, offset: int, strings: List[str], dates: Optional[Dict[int, datetime]] = None) -> Project:
+    """
+    Decode the record body starting at offset (just after its length prefix,
+    which gives the body's extent)
+
+    Args:
+        data: Buffer holding the snapshot (bytes or mmap)
+        offset (int): Start of the record body
+        strings (List[str]): The snapshot's string table
+        dates (Optional[Dict[int, datetime]]): Datetime cache shared across one decode pass
+
+    Returns:
+        Project: Decoded project
+    """
+    if dates is None:
+        dates = _DatetimeCache()
+    (start, end, created, updated, status, priority, budget, spent, progress,
+     milestone_count, team_count, id_len, name_len, description_len) = FIXED.unpack_from(data, offset)
+    pos = offset + FIXED.size
+    project_id = data[pos:pos + id_len].decode("utf-8")
+    pos += id_len
+    name = data[pos:pos + name_len].decode("utf-8")
+    pos += name_len
+    description = data[pos:pos + description_len].decode("utf-8")
+    pos += description_len
+    team = [strings[i] for i in struct.unpack_from(f"<{team_count}I", data, pos)]
+    pos += 4 * team_count
+
+    milestones = []
+    for _ in range(milestone_count):
+        due, completion, flags, title_len, milestone_description_len = MILESTONE.unpack_from(data, pos)
+        pos += MILESTONE.size
+        title = data[pos:pos + title_len].decode("utf-8")
+        pos += title_len
+        milestone_description = data[pos:pos + milestone_description_len].decode("utf-8")
+        pos += milestone_description_len
+        milestones.append(ProjectMilestone(
+            title=title,
+            due_date=dates[due],
+            completed=bool(flags & _COMPLETED),
+            completion_date=dates[completion] if flags & _HAS_COMPLETION_DATE else None,
+            description=milestone_description if flags & _HAS_DESCRIPTION else None
+        ))
+
+    latitude = longitude = None
+    (length,) = LENGTH.unpack_from(data, offset - LENGTH.size)
+    if pos + LOCATION.size <= offset + length:
+        latitude, longitude = LOCATION.unpack_from(data, pos)
+
+    return Project(
+        id=project_id,
+        name=name,
+        description=description,
+        start_date=dates[start],
+        end_date=dates[end],
+        status=_STATUSES[status],
+        priority=_PRIORITIES[priority],
+        budget=budget,
+        spent=spent,
+        progress=progress,
+        milestones=milestones,
+        team_members=team,
+        created_at=dates[created],
+        updated_at=dates[updated],
+        latitude=latitude,
+        longitude=longitude
+    )
+
+def _encode_strings(strings: Dict[str, int]) -> bytes:
+    parts = [LENGTH.pack(len(strings))]
+    for value in strings:  # insertion order == index order
+        encoded = value.encode("utf-8")
+        parts.append(STRING_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+def read_header(data) -> Header:
+    """
+    Validate the header
+
+    Args:
+        data: Buffer holding the snapshot
+
+    Returns:
+        Header: Record count and section offsets
+
+    Raises:
+        DatabaseError: If the buffer is not a supported snapshot
+    """
+    if len(data) < HEADER_V1.size:
+        raise DatabaseError("Project snapshot is truncated")
+    magic, version = data[:4], struct.unpack_from("<H", data, 4)[0]
+    if magic != MAGIC:
+        raise DatabaseError("Not a binary project snapshot")
+    if version == 1:
+        _, _, _flags, count, strings_offset = HEADER_V1.unpack_from(data, 0)
+        header = Header(version, count, HEADER_V1.size, strings_offset, 0)
+    elif version == VERSION and len(data) >= HEADER.size:
+        _, _, _flags, count, strings_offset, index_offset = HEADER.unpack_from(data, 0)
+        header = Header(version, count, HEADER.size, strings_offset, index_offset)
+    else:
+        raise DatabaseError(f"Unsupported project snapshot version {version}")
+    index_end = header.index_offset + count * INDEX_ENTRY.size if header.index_offset else 0
+    if max(header.strings_offset, index_end) > len(data):
+        raise DatabaseError("Project snapshot is truncated")
+    return header
+
+def read_strings(data, offset: int) -> List[str]:
+    """Decode the string table at offset"""
+    (count,) = LENGTH.unpack_from(data, offset)
+    pos = offset + LENGTH.size
+    strings = []
+    for _ in range(count):
+        (length,) = STRING_LENGTH.unpack_from(data, pos)
+        pos += STRING_LENGTH.size
+        strings.append(data[pos:pos + length].decode("utf-8"))
+        pos += length
+    return strings
+
+def id_hash(project_id: str) -> int:
+    """64-bit key of a project id in the index"""
+    return int.from_bytes(hashlib.blake2b(project_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+def record_id(data, offset: int) -> str:
+    """Id of the record whose body starts at offset, without decoding the rest"""
+    (id_len,) = STRING_LENGTH.unpack_from(data, offset + _ID_LENGTH_OFFSET)
+    start = offset + FIXED.size
+    return data[start:start + id_len].decode("utf-8")
+
+def find_record(data, header: Header, project_id: str) -> Optional[int]:
+    """
+    Binary-search the index for a project
+
+    Args:
+        data: Buffer holding a snapshot with an index
+        header (Header): Its header
+        project_id (str): Project to find
+
+    Returns:
+        Optional[int]: Offset of the record body, or None if absent
+    """
+    target = id_hash(project_id)
+    base = header.index_offset
+    lo, hi = 0, header.count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if INDEX_ENTRY.unpack_from(data, base + mid * INDEX_ENTRY.size)[0] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    # Walk the (rare) run of entries sharing this hash
+    while lo < header.count:
+        key, offset, _length = INDEX_ENTRY.unpack_from(data, base + lo * INDEX_ENTRY.size)
+        if key != target:
+            break
+        if record_id(data, offset + LENGTH.size) == project_id:
+            return offset + LENGTH.size
+        lo += 1
+    return None
+
+class _IndexBuilder:
+    """Collects (id hash, offset, length) per record in compact arrays"""
+
+    def __init__(self):
+        self.keys = array("Q")
+        self.offsets = array("Q")
+        self.lengths = array("I")
+
+    def add(self, project_id: str, offset: int, length: int) -> None:
+        self.keys.append(id_hash(project_id))
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def write(self, f: BinaryIO) -> None:
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        for chunk in range(0, len(order), 4096):
+            f.write(b"".join(
+                INDEX_ENTRY.pack(self.keys[i], self.offsets[i], self.lengths[i])
+                for i in order[chunk:chunk + 4096]
+            ))
+
+def _start(f: BinaryIO) -> int:
+    start = f.tell()
+    f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0))
+    return start
+
+def _finish(f: BinaryIO, start: int, strings: Dict[str, int], index: _IndexBuilder) -> int:
+    """Write the string table and index, then fill in the header"""
+    strings_offset = f.tell() - start
+    f.write(_encode_strings(strings))
+    index_offset = f.tell() - start
+    index.write(f)
+    end = f.tell()
+    f.seek(start)
+    f.write(HEADER.pack(MAGIC, VERSION, 0, len(index), strings_offset, index_offset))
+    f.seek(end)
+    return len(index)
+
+def write_projects(f: BinaryIO, projects: Iterable[Project]) -> int:
+    """
+    Stream projects into a seekable file as a snapshot
+
+    Args:
+        f (BinaryIO): File opened for binary writing
+        projects (Iterable[Project]): Projects to write, e.g. a generator
+
+    Returns:
+        int: Number of projects written
+    """
+    start = _start(f)
+    strings: Dict[str, int] = {}
+    index = _IndexBuilder()
+    for project in projects:
+        record = encode_record(project, strings)
+        index.add(project.id, f.tell() - start, len(record))
+        f.write(record)
+    return _finish(f, start, strings, index)
+
+def rewrite_projects(data, f: BinaryIO, changes: Dict[str, Optional[Project]]) -> int:
+    """
+    Write a new snapshot with changes applied, copying every unchanged
+    record byte for byte instead of decoding and re-encoding it. The string
+    table is carried over so copied team-member indices stay valid.
+
+    Args:
+        data: Buffer holding the current snapshot
+        f (BinaryIO): File opened for binary writing
+        changes (Dict[str, Optional[Project]]): Upserts by id; None deletes
+
+    Returns:
+        int: Number of projects written
+    """
+    header = read_header(data)
+    strings = {value: i for i, value in enumerate(read_strings(data, header.strings_offset))}
+    start = _start(f)
+    index = _IndexBuilder()
+    offset = header.records_offset
+    for _ in range(header.count):
+        (length,) = LENGTH.unpack_from(data, offset)
+        end = offset + LENGTH.size + length
+        project_id = record_id(data, offset + LENGTH.size)
+        if project_id not in changes:
+            index.add(project_id, f.tell() - start, end - offset)
+            f.write(data[offset:end])
+        offset = end
+    for project in changes.values():
+        if project is not None:
+            record = encode_record(project, strings)
+            index.add(project.id, f.tell() - start, len(record))
+            f.write(record)
+    return _finish(f, start, strings, index)
+
+def encode_projects(projects: Iterable[Project]) -> bytes:
+    """Encode projects as a complete snapshot"""
+    buffer = io.BytesIO()
+    write_projects(buffer, projects)
+    return buffer.getvalue()
+
+def iter_projects(data, release_every: int = 0) -> Iterator[Project]:
+    """
+    Decode every project in a snapshot, in file order
+
+    Args:
+        data: Buffer holding the snapshot (bytes or mmap)
+        release_every (int): For an mmap, drop the pages of records already
+            decoded from this process every so many records, so that one
+            pass over a large file does not keep all of it resident; 0 to
+            leave paging to the OS
+
+    Yields:
+        Project: Decoded projects
+
+    Raises:
+        DatabaseError: If the buffer is not a supported snapshot
+    """
+    header = read_header(data)
+    strings = read_strings(data, header.strings_offset)
+    dates = _DatetimeCache()
+    offset = header.records_offset
+    if not (hasattr(data, "madvise") and hasattr(mmap, "MADV_DONTNEED")):
+        release_every = 0
+    released = 0
+    for done in range(1, header.count + 1):
+        (length,) = LENGTH.unpack_from(data, offset)
+        yield decode_record(data, offset + LENGTH.size, strings, dates)
+        offset += LENGTH.size + length
+        if release_every and done % release_every == 0:
+            # Read-only file pages: touching them again just faults them back in
+            end = offset - offset % mmap.PAGESIZE
+            data.madvise(mmap.MADV_DONTNEED, released, end - released)
+            released = end
+
+def decode_projects(data) -> List[Project]:
+    """Decode every project in a snapshot"""
+    return list(iter_projects(data))
+
+def main() -> None:
+    from database.project_store import convert_projects_file
+
+    parser = argparse.ArgumentParser(description="Convert a projects file between JSON and binary")
+    parser.add_argument("source", help="Existing projects file (.json or .bin)")
+    parser.add_argument("target", help="File to write (.json or .bin)")
+    args = parser.parse_args()
+    count = convert_projects_file(args.source, args.target)
+    print(f"converted {count} projects: {args.source} -> {args.target}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# database/blob_store.py
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from config.settings import settings
+from core.exceptions import DatabaseError
+from utils.file_utils import fsync_directory
+from utils.profiler import profiler
+import logging
+
+class StagedBlob(NamedTuple):
+    """Content written and hashed, waiting in the staging area to be committed"""
+    path: Path
+    digest: str
+    size: int
+
+class BlobStore:
+    """
+    Local content-addressed file store
+
+        blobs/objects/3f/3fa9...e1   content, named by its SHA-256
+        blobs/staging/<uuid>         uploads in progress
+
+    Content is streamed to a staging file in fixed-size chunks and hashed
+    as it is written, so memory use does not depend on file size. Committing
+    renames the staging file into place, or drops it when the same content
+    is already stored: identical files are kept once however often they
+    are attached. Stored objects are never modified, only deleted once
+    nothing references them.
+    """
+
+    def __init__(self, root: Optional[Path] = None, chunk_size: Optional[int] = None):
+        self.root = Path(root or settings.BLOB_DIR)
+        self.chunk_size = chunk_size or settings.BLOB_CHUNK_SIZE
+        self.objects_dir = self.root / "objects"
+        self.staging_dir = self.root / "staging"
+        try:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logging.error("Failed to create blob directories: %s", e)
+            raise DatabaseError("Could not initialize blob store")
+
+    def path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    @profiler.profiled("BlobStore.stage")
+    def stage(self, stream: BinaryIO) -> StagedBlob:
+        """
+        Copy a stream into the staging area chunk by chunk, hashing as it goes
+
+        Args:
+            stream (BinaryIO): Readable binary stream, consumed to the end
+
+        Returns:
+            StagedBlob: Staging file, content digest and size
+
+        Raises:
+            DatabaseError: If the content cannot be written
+        """
+        path = self.staging_dir / uuid.uuid4().hex
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(path, 'wb') as f:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            path.unlink(missing_ok=True)
+            logging.error("Error staging blob: %s", e)
+            raise DatabaseError(f"Failed to store file: {str(e)}")
+        profiler.record_io("BlobStore.write", bytes_written=size)
+        return StagedBlob(path, digest.hexdigest(), size)
+
+    def commit(self, staged: StagedBlob) -> bool:
+        """
+        Move staged content into the store unless it is already there
+
+        Returns:
+            bool: True if the content was new, False if it was deduplicated
+        """
+        target = self.path(staged.digest)
+        if target.exists():
+            staged.path.unlink(missing_ok=True)
+            return False
+        try:
+            target.parent.mkdir(exist_ok=True)
+            os.replace(staged.path, target)
+            fsync_directory(target.parent)
+            return True
+        except Exception as e:
+            staged.path.unlink(missing_ok=True)
+            logging.error("Error committing blob %s: %s", staged.digest, e)
+            raise DatabaseError(f"Failed to store file: {str(e)}")
+
+    def discard(self, staged: StagedBlob) -> None:
+        staged.path.unlink(missing_ok=True)
+
+    def open(self, digest: str) -> BinaryIO:
+        """
+        Open stored content for reading
+
+        Raises:
+            DatabaseError: If no content has this digest
+        """
+        try:
+            return open(self.path(digest), 'rb')
+        except FileNotFoundError:
+            raise DatabaseError(f"Missing file content {digest}")
+
+    def iter_chunks(self, digest: str) -> Iterator[bytes]:
+        """Yield stored content chunk by chunk"""
+        with self.open(digest) as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    return
+                profiler.record_io("BlobStore.read", bytes_read=len(chunk))
+                yield chunk
+
+    def delete(self, digest: str) -> None:
+        """Remove stored content; callers check that nothing references it"""
+        self.path(digest).unlink(missing_ok=True)
+
@@ -0,0 +1,111 @@
+# database/company_index.py
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+_WORD = re.compile(r"\w+")
+# Sorts after any character a name can contain, closing a prefix range
+_PREFIX_END = "\U0010ffff"
+
+def normalize_name(name: str) -> str:
+    """Case-folded words of a name joined by single spaces; punctuation is dropped"""
+    return " ".join(_WORD.findall(name.casefold()))
+
+def _suffixes(key: str) -> List[str]:
+    """The key from each word after the first: "acme lyon sas" -> ["lyon sas", "sas"]"""
+    suffixes = []
+    position = key.find(" ")
+    while position != -1:
+        suffixes.append(key[position + 1:])
+        position = key.find(" ", position + 1)
+    return suffixes
+
+class NameIndex:
+    """
+    Sorted prefix index over company names, for typeahead
+
+    Names are normalized (case-folded, punctuation dropped) and kept in a
+    sorted list of (key, company id), alongside a second sorted list of the
+    key from each later word on. A query is normalized the same way and
+    answered by binary-searching the start of its range in each list and
+    reading up to the limit, so a keystroke costs O(log n + limit) however
+    many companies there are. Names that start with the query come first,
+    in name order, then names with a later word starting it: "lyon hold"
+    finds "Acme Lyon Holdings SAS".
+
+    Additions and removals keep the lists sorted in place rather than
+    rebuilding them.
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, str]] = ()):
+        self._keys: Dict[str, str] = {company_id: normalize_name(name) for company_id, name in names}
+        self._by_name: List[Tuple[str, str]] = sorted((key, company_id) for company_id, key in self._keys.items())
+        self._by_suffix: List[Tuple[str, str]] = sorted(
+            (suffix, company_id) for company_id, key in self._keys.items() for suffix in _suffixes(key)
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, company_id: str) -> bool:
+        return company_id in self._keys
+
+    def ordered(self) -> List[str]:
+        """Every company id, in name order"""
+        return [company_id for _, company_id in self._by_name]
+
+    def add(self, company_id: str, name: str) -> None:
+        """Index a company, replacing its previous name if it was indexed"""
+        key = normalize_name(name)
+        if self._keys.get(company_id) == key:
+            return
+        self.remove(company_id)
+        self._keys[company_id] = key
+        insort(self._by_name, (key, company_id))
+        for suffix in _suffixes(key):
+            insort(self._by_suffix, (suffix, company_id))
+
+    def remove(self, company_id: str) -> None:
+        key = self._keys.pop(company_id, None)
+        if key is None:
+            return
+        _discard(self._by_name, (key, company_id))
+        for suffix in _suffixes(key):
+            _discard(self._by_suffix, (suffix, company_id))
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """
+        Ids of up to limit companies matching a typed prefix
+
+        Args:
+            query (str): Text typed so far; an empty query lists names from the start
+            limit (int): Maximum number of ids returned
+
+        Returns:
+            List[str]: Matching company ids, best matches first
+        """
+        prefix = normalize_name(query)
+        start, end = _prefix_range(self._by_name, prefix)
+        matches = [company_id for _, company_id in self._by_name[start:min(end, start + limit)]]
+        if len(matches) >= limit or not prefix:
+            return matches
+
+        seen = set(matches)
+        start, end = _prefix_range(self._by_suffix, prefix)
+        for position in range(start, end):
+            company_id = self._by_suffix[position][1]
+            # A name repeating a word has one entry per occurrence
+            if company_id not in seen:
+                seen.add(company_id)
+                matches.append(company_id)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+def _prefix_range(keys: List[Tuple[str, str]], prefix: str) -> Tuple[int, int]:
+    return bisect_left(keys, (prefix,)), bisect_left(keys, (prefix + _PREFIX_END,))
+
+def _discard(keys: List[Tuple[str, str]], key: Tuple[str, str]) -> None:
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
@@ -0,0 +1,310 @@
+# database/company_store.py
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from config.settings import settings
+from core.exceptions import DatabaseError
+from database.company_index import NameIndex
+from database.sharded_projects import ShardedProjects
+from models.company import Company, CompanyType
+from utils.file_utils import atomic_write
+from utils.profiler import profiler
+import logging
+
+class CompanyStore:
+    """
+    Handles storage of SPVs, counterparties and other companies
+
+    Companies are stored in one JSON file keyed by id, or, when projects
+    use the sharded layout, in a directory of one file per company (see
+    database/sharded_projects.py); like ProjectStore, a path without a
+    suffix selects the sharded layout. The binary formats are specific to
+    project records, so the "binary" and "mmap" settings keep companies in
+    JSON.
+
+    The parsed data is cached until the file or manifest changes, together
+    with a name index for typeahead (database/company_index.py) and an
+    index from each project to the companies linked to it. Writes update
+    both indexes in place rather than rebuilding them.
+    """
+    def __init__(self, file_path: Optional[Path] = None):
+        if file_path is None:
+            sharded = settings.PROJECT_STORAGE_FORMAT == "sharded"
+            file_path = settings.COMPANIES_SHARD_DIR if sharded else settings.COMPANIES_FILE
+        self.file_path = Path(file_path)
+        self._ensure_database_directory()
+        self._shards: Optional[ShardedProjects] = None
+        if not self.file_path.suffix:
+            self._shards = ShardedProjects(
+                self.file_path,
+                self._serialize_company,
+                self._deserialize_company,
+                bucket_chars=settings.SHARD_BUCKET_CHARS,
+                workers=settings.SHARD_LOAD_WORKERS
+            )
+        self._lock = threading.RLock()
+        self._companies: Optional[Dict[str, Company]] = None
+        # Stored form of each company, kept so a JSON write re-encodes only what changed
+        self._records: Dict[str, Dict] = {}
+        self._stamp: Optional[Tuple] = None
+        self._names = NameIndex()
+        self._links: Dict[str, Tuple[str, ...]] = {}  # Project ids per company, as indexed
+        self._by_project: Dict[str, Set[str]] = {}
+
+    def _ensure_database_directory(self) -> None:
+        """Ensure database directory exists"""
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logging.error("Failed to create database directory: %s", e)
+            raise DatabaseError("Could not initialize database directory")
+
+    def _serialize_company(self, company: Company) -> Dict:
+        """Convert Company object to dictionary for storage"""
+        return {
+            "id": company.id,
+            "name": company.name,
+            "type": company.type.value,
+            "jurisdiction": company.jurisdiction,
+            "registration_number": company.registration_number,
+            "project_ids": company.project_ids,
+            "created_at": company.created_at.isoformat(),
+            "updated_at": company.updated_at.isoformat()
+        }
+
+    def _deserialize_company(self, data: Dict) -> Company:
+        """Convert stored dictionary to Company object"""
+        return Company(
+            id=data["id"],
+            name=data["name"],
+            type=CompanyType(data.get("type", CompanyType.OTHER.value)),
+            jurisdiction=data.get("jurisdiction"),
+            registration_number=data.get("registration_number"),
+            project_ids=data.get("project_ids", []),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"])
+        )
+
+    def _file_stamp(self) -> Optional[Tuple]:
+        """Token that changes with the stored data, or None if nothing is stored yet"""
+        if self._shards is not None:
+            return self._shards.stamp()
+        try:
+            stat = self.file_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _read(self, stamp: Optional[Tuple]) -> List[Company]:
+        """Parse every stored company"""
+        self._records = {}
+        if stamp is None:
+            return []
+        try:
+            if self._shards is not None:
+                self._shards.exists()
+                start = time.perf_counter()
+                companies, size = self._shards.load_all()
+                profiler.record_io("CompanyStore.read", bytes_read=size, parse_time=time.perf_counter() - start)
+                return companies
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            start = time.perf_counter()
+            self._records = json.loads(raw)
+            companies = [self._deserialize_company(item) for item in self._records.values()]
+            profiler.record_io("CompanyStore.read", bytes_read=len(raw), parse_time=time.perf_counter() - start)
+            return companies
+        except Exception as e:
+            logging.error("Error reading companies: %s", e)
+            raise DatabaseError(f"Failed to retrieve companies: {str(e)}")
+
+    def _load(self) -> Dict[str, Company]:
+        """All companies by id, re-read and re-indexed only when the data changed; call with the lock held"""
+        stamp = self._file_stamp()
+        if self._companies is not None and stamp == self._stamp:
+            return self._companies
+        companies = {company.id: company for company in self._read(stamp)}
+        by_project = defaultdict(set)
+        for company in companies.values():
+            for project_id in company.project_ids:
+                by_project[project_id].add(company.id)
+        self._companies = companies
+        self._stamp = stamp
+        self._names = NameIndex((company.id, company.name) for company in companies.values())
+        self._links = {company.id: tuple(company.project_ids) for company in companies.values()}
+        self._by_project = dict(by_project)
+        return companies
+
+    @profiler.profiled("CompanyStore.get_all_companies")
+    def get_all_companies(self) -> List[Company]:
+        """All companies, in name order"""
+        with self._lock:
+            companies = self._load()
+            return [companies[company_id] for company_id in self._names.ordered()]
+
+    def get_company(self, company_id: str) -> Optional[Company]:
+        with self._lock:
+            return self._load().get(company_id)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    @profiler.profiled("CompanyStore.search")
+    def search(self, query: str, limit: Optional[int] = None) -> List[Company]:
+        """
+        Companies whose name matches a typed prefix, for typeahead
+
+        Args:
+            query (str): Text typed so far
+            limit (Optional[int]): Maximum results; defaults to COMPANY_SEARCH_LIMIT
+
+        Returns:
+            List[Company]: Names starting with the query first, then names
+            with a later word starting with it
+        """
+        with self._lock:
+            companies = self._load()
+            ids = self._names.search(query, limit or settings.COMPANY_SEARCH_LIMIT)
+            return [companies[company_id] for company_id in ids]
+
+    @profiler.profiled("CompanyStore.get_companies_for_project")
+    def get_companies_for_project(self, project_id: str) -> List[Company]:
+        """Companies linked to a project, in name order"""
+        with self._lock:
+            companies = self._load()
+            linked = [companies[company_id] for company_id in self._by_project.get(project_id, ())]
+        return sorted(linked, key=lambda c: c.name.casefold())
+
+    @profiler.profiled("CompanyStore.create_company")
+    def create_company(self, company: Company) -> bool:
+        """Create new company"""
+        with self._lock:
+            if company.id in self._load():
+                return False
+            self._write({company.id: company})
+            return True
+
+    @profiler.profiled("CompanyStore.update_company")
+    def update_company(self, company: Company) -> bool:
+        """Update existing company"""
+        with self._lock:
+            if company.id not in self._load():
+                return False
+            company.updated_at = datetime.now()
+            self._write({company.id: company})
+            return True
+
+    @profiler.profiled("CompanyStore.delete_company")
+    def delete_company(self, company_id: str) -> bool:
+        """Delete company by ID"""
+        with self._lock:
+            if company_id not in self._load():
+                return False
+            self._write({company_id: None})
+            return True
+
+    def link_project(self, company_id: str, project_id: str) -> bool:
+        """
+        Link a project to a company
+
+        Returns:
+            bool: False if the company does not exist or the link already did
+        """
+        with self._lock:
+            company = self._load().get(company_id)
+            if company is None or project_id in company.project_ids:
+                return False
+            return self.update_company(replace(company, project_ids=company.project_ids + [project_id]))
+
+    def unlink_project(self, company_id: str, project_id: str) -> bool:
+        """
+        Remove a project link from a company
+
+        Returns:
+            bool: False if the company or the link did not exist
+        """
+        with self._lock:
+            company = self._load().get(company_id)
+            if company is None or project_id not in company.project_ids:
+                return False
+            return self.update_company(replace(
+                company, project_ids=[pid for pid in company.project_ids if pid != project_id]
+            ))
+
+    @profiler.profiled("CompanyStore.import_companies")
+    def import_companies(self, companies: Iterable[Company]) -> int:
+        """
+        Replace all stored companies
+
+        Args:
+            companies (Iterable[Company]): Companies to store, e.g. a generator
+
+        Returns:
+            int: Number of companies written
+
+        Raises:
+            DatabaseError: If the data cannot be written
+        """
+        with self._lock:
+            try:
+                if self._shards is not None:
+                    count = self._shards.replace_all(companies)
+                else:
+                    data = {company.id: self._serialize_company(company) for company in companies}
+                    raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                    atomic_write(self.file_path, raw)
+                    profiler.record_io("CompanyStore.write", bytes_written=len(raw))
+                    count = len(data)
+            except Exception as e:
+                logging.error("Error importing companies: %s", e)
+                raise DatabaseError(f"Failed to import companies: {str(e)}")
+            self._companies = None
+            return count
+
+    def _write(self, changes: Dict[str, Optional[Company]]) -> None:
+        """Persist changes (None deletes), then patch the cache and indexes; call with the lock held"""
+        companies = self._load()
+        try:
+            start = time.perf_counter()
+            if self._shards is not None:
+                written = self._shards.apply(changes)
+            else:
+                records = dict(self._records)
+                for company_id, company in changes.items():
+                    if company is None:
+                        records.pop(company_id, None)
+                    else:
+                        records[company_id] = self._serialize_company(company)
+                raw = json.dumps(records, ensure_ascii=False).encode('utf-8')
+                atomic_write(self.file_path, raw)
+                self._records = records
+                written = len(raw)
+            profiler.record_io("CompanyStore.write", bytes_written=written, parse_time=time.perf_counter() - start)
+        except Exception as e:
+            logging.error("Error saving companies: %s", e)
+            raise DatabaseError(f"Failed to save companies: {str(e)}")
+
+        for company_id, company in changes.items():
+            # Unlink using the links as indexed: callers may have edited the cached object
+            for project_id in self._links.pop(company_id, ()):
+                linked = self._by_project.get(project_id)
+                if linked is not None:
+                    linked.discard(company_id)
+                    if not linked:
+                        del self._by_project[project_id]
+            if company is None:
+                companies.pop(company_id, None)
+                self._names.remove(company_id)
+                continue
+            companies[company_id] = company
+            self._links[company_id] = tuple(company.project_ids)
+            for project_id in company.project_ids:
+                self._by_project.setdefault(project_id, set()).add(company_id)
+            self._names.add(company_id, company.name)
+        self._stamp = self._file_stamp()
@@ -0,0 +1,223 @@
+# database/document_store.py
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from config.settings import settings
+from core.exceptions import DatabaseError
+from database.blob_store import BlobStore
+from models.document import Document, DocumentCategory
+from utils.file_utils import atomic_write
+from utils.profiler import profiler
+import logging
+
+class DocumentStore:
+    """
+    Per-project document references over a content-addressed blob store
+
+    Metadata lives in one JSON file keyed by document id; content lives in
+    the blob store, where each distinct file is kept once. Attaching a
+    file that is already stored only adds a reference, and content is
+    deleted when its last reference is removed. Reference changes and
+    blob commits/deletes happen under one lock, so an upload can never
+    land on content that is being deleted.
+    """
+    def __init__(self, file_path: Optional[Path] = None, blobs: Optional[BlobStore] = None):
+        self.file_path = Path(file_path or settings.DOCUMENTS_FILE)
+        self.blobs = blobs or BlobStore()
+        self._lock = threading.RLock()
+        self._documents: Optional[Dict[str, Document]] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._by_project: Dict[str, List[Document]] = {}
+        self._references: Dict[str, int] = {}
+
+    def _serialize_document(self, document: Document) -> Dict:
+        """Convert Document object to dictionary for storage"""
+        return {
+            "id": document.id,
+            "project_id": document.project_id,
+            "name": document.name,
+            "digest": document.digest,
+            "size": document.size,
+            "content_type": document.content_type,
+            "category": document.category.value,
+            "uploaded_by": document.uploaded_by,
+            "uploaded_at": document.uploaded_at.isoformat()
+        }
+
+    def _deserialize_document(self, data: Dict) -> Document:
+        """Convert stored dictionary to Document object"""
+        return Document(
+            id=data["id"],
+            project_id=data["project_id"],
+            name=data["name"],
+            digest=data["digest"],
+            size=data["size"],
+            content_type=data.get("content_type"),
+            category=DocumentCategory(data.get("category", DocumentCategory.OTHER.value)),
+            uploaded_by=data.get("uploaded_by"),
+            uploaded_at=datetime.fromisoformat(data["uploaded_at"])
+        )
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the documents file, or None if it is missing"""
+        try:
+            stat = self.file_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> Dict[str, Document]:
+        """All documents by id, re-read only when the file changed; call with the lock held"""
+        stamp = self._file_stamp()
+        if self._documents is not None and stamp == self._stamp:
+            return self._documents
+        documents = {}
+        if stamp is not None:
+            try:
+                with open(self.file_path, 'rb') as f:
+                    raw = f.read()
+                start = time.perf_counter()
+                documents = {
+                    document_id: self._deserialize_document(item)
+                    for document_id, item in json.loads(raw).items()
+                }
+                profiler.record_io("DocumentStore.read", bytes_read=len(raw), parse_time=time.perf_counter() - start)
+            except Exception as e:
+                logging.error("Error reading documents file: %s", e)
+                raise DatabaseError(f"Failed to read documents: {str(e)}")
+        self._set(documents, stamp)
+        return documents
+
+    def _set(self, documents: Dict[str, Document], stamp: Optional[Tuple[int, int]]) -> None:
+        """Adopt documents and rebuild the per-project and per-digest indexes"""
+        by_project = defaultdict(list)
+        references = defaultdict(int)
+        for document in documents.values():
+            by_project[document.project_id].append(document)
+            references[document.digest] += 1
+        for project_documents in by_project.values():
+            project_documents.sort(key=lambda d: d.uploaded_at, reverse=True)
+        self._documents = documents
+        self._stamp = stamp
+        self._by_project = dict(by_project)
+        self._references = dict(references)
+
+    def _save(self, documents: Dict[str, Document]) -> None:
+        """Write all documents; call with the lock held"""
+        try:
+            data = {document_id: self._serialize_document(d) for document_id, d in documents.items()}
+            raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            atomic_write(self.file_path, raw)
+            profiler.record_io("DocumentStore.write", bytes_written=len(raw))
+        except Exception as e:
+            logging.error("Error writing documents file: %s", e)
+            raise DatabaseError(f"Failed to save documents: {str(e)}")
+        self._set(documents, self._file_stamp())
+
+    @profiler.profiled("DocumentStore.get_documents")
+    def get_documents(self, project_id: str) -> List[Document]:
+        """A project's documents, newest first"""
+        with self._lock:
+            self._load()
+            return list(self._by_project.get(project_id, []))
+
+    def get_document(self, document_id: str) -> Optional[Document]:
+        with self._lock:
+            return self._load().get(document_id)
+
+    def reference_count(self, digest: str) -> int:
+        """Number of documents, across all projects, sharing this content"""
+        with self._lock:
+            self._load()
+            return self._references.get(digest, 0)
+
+    @profiler.profiled("DocumentStore.attach")
+    def attach(
+        self,
+        project_id: str,
+        name: str,
+        stream: BinaryIO,
+        content_type: Optional[str] = None,
+        category: DocumentCategory = DocumentCategory.OTHER,
+        uploaded_by: Optional[str] = None
+    ) -> Document:
+        """
+        Stream a file into the blob store and attach it to a project
+
+        The content is staged and hashed without holding the lock, so large
+        uploads do not block other writers.
+
+        Returns:
+            Document: The new reference
+
+        Raises:
+            DatabaseError: If the content or metadata cannot be written
+        """
+        staged = self.blobs.stage(stream)
+        try:
+            with self._lock:
+                self.blobs.commit(staged)
+                return self._add(Document(
+                    id=str(uuid.uuid4()),
+                    project_id=project_id,
+                    name=name,
+                    digest=staged.digest,
+                    size=staged.size,
+                    content_type=content_type,
+                    category=category,
+                    uploaded_by=uploaded_by
+                ))
+        finally:
+            self.blobs.discard(staged)
+
+    @profiler.profiled("DocumentStore.link")
+    def link(self, document_id: str, project_id: str, uploaded_by: Optional[str] = None) -> Document:
+        """
+        Attach an already stored document to another project without copying it
+
+        Raises:
+            DatabaseError: If the document does not exist
+        """
+        with self._lock:
+            source = self._load().get(document_id)
+            if source is None:
+                raise DatabaseError(f"Document not found: {document_id}")
+            return self._add(Document(
+                id=str(uuid.uuid4()),
+                project_id=project_id,
+                name=source.name,
+                digest=source.digest,
+                size=source.size,
+                content_type=source.content_type,
+                category=source.category,
+                uploaded_by=uploaded_by
+            ))
+
+    def _add(self, document: Document) -> Document:
+        documents = dict(self._load())
+        documents[document.id] = document
+        self._save(documents)
+        return document
+
+    @profiler.profiled("DocumentStore.detach")
+    def detach(self, document_id: str) -> bool:
+        """
+        Remove a document reference, deleting the content if nothing else uses it
+
+        Returns:
+            bool: True if the document existed
+        """
+        with self._lock:
+            documents = dict(self._load())
+            document = documents.pop(document_id, None)
+            if document is None:
+                return False
+            self._save(documents)
+            if document.digest not in self._references:
+                self.blobs.delete(document.digest)
+            return True
@@ -0,0 +1,243 @@
+# database/investment_store.py
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from config.settings import settings
+from core.exceptions import DatabaseError
+from models.investment import CashFlow, CashFlowType, Investment
+from utils.file_utils import atomic_write
+from utils.profiler import profiler
+import logging
+
+class InvestmentStore:
+    """
+    Handles investment and cash-flow storage
+
+    Investments are kept in one JSON file keyed by id. The parsed file is
+    cached and reused until the file changes on disk. Every write that
+    touches an investment's cash flows or exit bumps its version, which is
+    what metric caches key on.
+    """
+    def __init__(self, file_path=None):
+        self.file_path = file_path or settings.INVESTMENTS_FILE
+        self._ensure_database_directory()
+        self._lock = threading.Lock()
+        self._cache: Optional[Dict[str, Investment]] = None
+        self._cache_stamp: Optional[Tuple[int, int]] = None
+
+    def _ensure_database_directory(self) -> None:
+        """Ensure database directory exists"""
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logging.error("Failed to create database directory: %s", e)
+            raise DatabaseError("Could not initialize database directory")
+
+    def _serialize_investment(self, investment: Investment) -> Dict:
+        """Convert Investment object to dictionary for storage"""
+        return {
+            "id": investment.id,
+            "name": investment.name,
+            "project_id": investment.project_id,
+            "cash_flows": [
+                {
+                    "date": cf.date.isoformat(),
+                    "amount": cf.amount,
+                    "type": cf.type.value,
+                    "note": cf.note
+                }
+                for cf in investment.cash_flows
+            ],
+            "exit_value": investment.exit_value,
+            "exit_date": investment.exit_date.isoformat() if investment.exit_date else None,
+            "version": investment.version,
+            "created_at": investment.created_at.isoformat(),
+            "updated_at": investment.updated_at.isoformat()
+        }
+
+    def _deserialize_investment(self, data: Dict) -> Investment:
+        """Convert stored dictionary to Investment object"""
+        return Investment(
+            id=data["id"],
+            name=data["name"],
+            project_id=data.get("project_id"),
+            cash_flows=[
+                CashFlow(
+                    date=datetime.fromisoformat(cf["date"]),
+                    amount=cf["amount"],
+                    type=CashFlowType(cf["type"]),
+                    note=cf.get("note")
+                )
+                for cf in data["cash_flows"]
+            ],
+            exit_value=data.get("exit_value", 0.0),
+            exit_date=datetime.fromisoformat(data["exit_date"]) if data.get("exit_date") else None,
+            version=data.get("version", 1),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"])
+        )
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the investments file, or None if it is missing"""
+        try:
+            stat = self.file_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load_investments(self) -> Dict[str, Investment]:
+        """
+        Return all investments by id, re-reading the file only if it changed
+
+        Raises:
+            DatabaseError: If the file cannot be read or parsed
+        """
+        stamp = self._file_stamp()
+        with self._lock:
+            if self._cache is not None and stamp == self._cache_stamp:
+                return self._cache
+        if stamp is None:
+            investments = {}
+        else:
+            try:
+                with open(self.file_path, 'rb') as f:
+                    raw = f.read()
+                start = time.perf_counter()
+                data = json.loads(raw)
+                investments = {
+                    investment_id: self._deserialize_investment(item)
+                    for investment_id, item in data.items()
+                }
+                profiler.record_io("InvestmentStore.read", bytes_read=len(raw), parse_time=time.perf_counter() - start)
+            except json.JSONDecodeError as e:
+                logging.error("JSON decode error reading investments file: %s", e)
+                raise DatabaseError("Invalid JSON in investments file")
+            except Exception as e:
+                logging.error("Error reading investments file: %s", e)
+                raise DatabaseError(f"Failed to read investments data: {str(e)}")
+        with self._lock:
+            self._cache = investments
+            self._cache_stamp = stamp
+        return investments
+
+    def _save_investments(self, investments: Dict[str, Investment]) -> None:
+        """
+        Write all investments and make them the cached copy
+
+        Raises:
+            DatabaseError: If the file cannot be written
+        """
+        try:
+            data = {investment_id: self._serialize_investment(item) for investment_id, item in investments.items()}
+            raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            atomic_write(self.file_path, raw)
+            profiler.record_io("InvestmentStore.write", bytes_written=len(raw))
+        except Exception as e:
+            logging.error("Error writing investments file: %s", e)
+            raise DatabaseError(f"Failed to save investments data: {str(e)}")
+        with self._lock:
+            self._cache = investments
+            self._cache_stamp = self._file_stamp()
+
+    @profiler.profiled("InvestmentStore.get_all_investments")
+    def get_all_investments(self) -> List[Investment]:
+        """
+        Get all investments
+
+        Returns:
+            List[Investment]: Investments ordered by creation time
+        """
+        return sorted(self._load_investments().values(), key=lambda i: (i.created_at, i.id))
+
+    @profiler.profiled("InvestmentStore.get_investment")
+    def get_investment(self, investment_id: str) -> Optional[Investment]:
+        """Get one investment, or None if it does not exist"""
+        return self._load_investments().get(investment_id)
+
+    @profiler.profiled("InvestmentStore.create_investment")
+    def create_investment(self, investment: Investment) -> bool:
+        """
+        Create a new investment
+
+        Returns:
+            bool: True if created, False if the id already exists
+
+        Raises:
+            DatabaseError: If database operations fail
+        """
+        investments = dict(self._load_investments())
+        if investment.id in investments:
+            return False
+        investments[investment.id] = investment
+        self._save_investments(investments)
+        return True
+
+    @profiler.profiled("InvestmentStore.update_investment")
+    def update_investment(self, investment: Investment) -> bool:
+        """
+        Replace a stored investment, bumping its version when its cash flows
+        or exit changed
+
+        Returns:
+            bool: True if updated, False if the investment does not exist
+
+        Raises:
+            DatabaseError: If database operations fail
+        """
+        investments = dict(self._load_investments())
+        current = investments.get(investment.id)
+        if current is None:
+            return False
+        if (current.cash_flows, current.exit_value, current.exit_date) != (
+            investment.cash_flows, investment.exit_value, investment.exit_date
+        ):
+            investment.version = current.version + 1
+        investment.updated_at = datetime.now()
+        investments[investment.id] = investment
+        self._save_investments(investments)
+        return True
+
+    @profiler.profiled("InvestmentStore.add_cash_flow")
+    def add_cash_flow(self, investment_id: str, cash_flow: CashFlow) -> bool:
+        """
+        Append a cash flow to an investment
+
+        Returns:
+            bool: True if added, False if the investment does not exist
+        """
+        current = self.get_investment(investment_id)
+        if current is None:
+            return False
+        flows = sorted(current.cash_flows + [cash_flow], key=lambda cf: cf.date)
+        updated = Investment(**{**vars(current), "cash_flows": flows})
+        return self.update_investment(updated)
+
+    @profiler.profiled("InvestmentStore.delete_investment")
+    def delete_investment(self, investment_id: str) -> bool:
+        """
+        Delete an investment
+
+        Returns:
+            bool: True if deleted, False if it does not exist
+        """
+        investments = dict(self._load_investments())
+        if investments.pop(investment_id, None) is None:
+            return False
+        self._save_investments(investments)
+        return True
+
+    def import_investments(self, investments: Iterable[Investment]) -> int:
+        """
+        Replace all stored investments
+
+        Args:
+            investments: Investments to store, e.g. a generator
+
+        Returns:
+            int: Number of investments written
+        """
+        stored = {investment.id: investment for investment in investments}
+        self._save_investments(stored)
+        return len(stored)
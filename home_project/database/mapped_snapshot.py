@@ -0,0 +1,67 @@
+# database/mapped_snapshot.py
+import mmap
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from core.exceptions import DatabaseError
+from database import binary_format
+from models.project import Project
+
+class MappedSnapshot:
+    """
+    Read-only memory map of a binary projects file.
+
+    Lookups binary-search the file's fixed-width index and decode a single
+    record, so nothing is read beyond the pages touched. The mapping is
+    backed by the OS page cache, which every process mapping the same file
+    shares: several Streamlit workers hold one physical copy of the data
+    rather than one parsed copy each.
+
+    A replaced file (writes go to a new file renamed over the old one) does
+    not affect an existing mapping, which keeps serving the version it was
+    opened on until it is garbage collected.
+    """
+
+    def __init__(self, path: Path):
+        try:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise DatabaseError(f"Failed to map projects file: {str(e)}")
+        self.header = binary_format.read_header(self._map)
+        self._strings: Optional[List[str]] = None
+
+    @property
+    def indexed(self) -> bool:
+        """Whether the file has an index; version 1 files do not"""
+        return bool(self.header.index_offset)
+
+    @property
+    def size(self) -> int:
+        return len(self._map)
+
+    def __len__(self) -> int:
+        return self.header.count
+
+    def __contains__(self, project_id: str) -> bool:
+        return binary_format.find_record(self._map, self.header, project_id) is not None
+
+    def get(self, project_id: str) -> Optional[Project]:
+        """Decode one project, or return None if it is not stored"""
+        offset = binary_format.find_record(self._map, self.header, project_id)
+        if offset is None:
+            return None
+        return binary_format.decode_record(self._map, offset, self._string_table())
+
+    def projects(self) -> List[Project]:
+        """Decode every project"""
+        return binary_format.decode_projects(self._map)
+
+    def rewrite(self, f: BinaryIO, changes: Dict[str, Optional[Project]]) -> int:
+        """Write this snapshot with changes applied to f; see binary_format.rewrite_projects"""
+        return binary_format.rewrite_projects(self._map, f, changes)
+
+    def _string_table(self) -> List[str]:
+        if self._strings is None:
+            self._strings = binary_format.read_strings(self._map, self.header.strings_offset)
+        return self._strings
@@ -0,0 +1,296 @@
+# database/monthly_rollups.py
+import csv
+import io
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from core.exceptions import DatabaseError
+from database.project_store import ProjectChanges, ProjectStore
+from models.project import Project, ProjectPriority, ProjectStatus
+from utils.file_utils import atomic_write
+from utils.profiler import profiler
+import logging
+
+ROLLUP_FORMAT = 1
+STATUSES = list(ProjectStatus)
+PRIORITIES = list(ProjectPriority)
+MEASURES = ("projects", "budget", "spent")
+DIMENSIONS = ("total", "status", "priority")
+
+_STATUS_INDEX = {status: i for i, status in enumerate(STATUSES)}
+_PRIORITY_INDEX = {priority: i for i, priority in enumerate(PRIORITIES)}
+
+def month_index(date: datetime) -> int:
+    """Months since year 0, so consecutive months are consecutive integers"""
+    return date.year * 12 + date.month - 1
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def project_span(project: Project) -> Tuple[int, int]:
+    """First and last month a project is active, both inclusive"""
+    first = month_index(project.start_date)
+    return first, max(first, month_index(project.end_date))
+
+class _Contribution(NamedTuple):
+    """What one project adds to the table: its span, cell and per-month shares"""
+    first: int
+    last: int
+    status: int
+    priority: int
+    budget: float
+    spent: float
+
+def _contribution(project: Project) -> _Contribution:
+    first, last = project_span(project)
+    months = last - first + 1
+    return _Contribution(
+        first, last, _STATUS_INDEX[project.status], _PRIORITY_INDEX[project.priority],
+        project.budget / months, project.spent / months
+    )
+
+class MonthlyRollups:
+    """
+    Materialized monthly budget vs spent, by status and priority
+
+    A project counts towards every month from its start to its end date,
+    with its budget and spent spread evenly over those months. The table
+    is a (month, status, priority, measure) array; reports by status, by
+    priority or in total are sums over its small axes, so rendering never
+    touches project records.
+
+    The table follows the project store through its change listener: a
+    write subtracts what each changed project contributed, as recorded
+    when it was added, and adds the new version, touching only the months
+    the two spans cover. The recorded contribution is used rather than the
+    store's previous version because callers may have edited the cached
+    object they got from the store before saving it. The table is
+    persisted with the store's data stamp, and rebuilt from the projects
+    in one vectorized pass whenever that stamp shows the data changed
+    behind its back (another process, a bulk import, a missed batch).
+    Contributions are kept in memory only, so a table read from disk is
+    used for reports until the next write, and is then rebuilt.
+    """
+
+    def __init__(self, project_store: ProjectStore, file_path: Optional[Path] = None):
+        self.project_store = project_store
+        self.file_path = Path(file_path or settings.ROLLUPS_FILE)
+        self._lock = threading.RLock()
+        self._origin = 0  # month index of the first row
+        self._cells = np.zeros((0, len(STATUSES), len(PRIORITIES), len(MEASURES)))
+        self._stamp: Optional[Tuple] = None
+        self._loaded = False  # Whether the table holds the data at self._stamp
+        self._contributions: Optional[Dict[str, _Contribution]] = None  # By project ID; None if not known
+        project_store.add_change_listener(self._on_change)
+
+    def _on_change(self, changes: ProjectChanges) -> None:
+        """Apply a persisted batch in place if the table was up to date before it"""
+        with self._lock:
+            contributions = self._contributions
+            if (changes.previous is None or contributions is None or not self._loaded
+                    or self._stamp != changes.stamp_before):
+                self._loaded = False
+                self._contributions = None
+                return
+            for project_id, project in changes.current.items():
+                stored = contributions.pop(project_id, None)
+                if stored is not None:
+                    self._add(stored, -1.0)
+                if project is not None:
+                    contributions[project_id] = _contribution(project)
+                    self._add(contributions[project_id], 1.0)
+            self._stamp = changes.stamp_after
+            self._save_file()
+
+    def _add(self, contribution: _Contribution, sign: float) -> None:
+        """Add (sign 1) or remove (sign -1) one project's share in each month it spans"""
+        first, last = contribution.first, contribution.last
+        self._ensure_months(first, last)
+        row = first - self._origin
+        self._cells[row:row + last - first + 1, contribution.status, contribution.priority] += (
+            sign * np.array([1.0, contribution.budget, contribution.spent])
+        )
+
+    def _ensure_months(self, first: int, last: int) -> None:
+        """Grow the month axis to cover first..last"""
+        end = self._origin + len(self._cells)
+        if not len(self._cells):
+            self._origin, end = first, first
+        if first >= self._origin and last < end:
+            return
+        origin = min(first, self._origin)
+        cells = np.zeros((max(last + 1, end) - origin,) + self._cells.shape[1:])
+        cells[self._origin - origin:self._origin - origin + len(self._cells)] = self._cells
+        self._origin, self._cells = origin, cells
+
+    def _refresh(self) -> None:
+        """Make the table match the stored projects, from disk or by a rebuild"""
+        stamp = self.project_store.data_stamp()
+        with self._lock:
+            if not self._loaded:
+                self._load_file()
+            if self._loaded and self._stamp == stamp:
+                return
+        # The rebuild must see exactly the stored data: queued write-behind
+        # changes would otherwise be counted again when their batch lands
+        self.project_store.flush()
+        stamp = self.project_store.data_stamp()
+        projects = self.project_store.get_all_projects()
+        self.rebuild(projects, stamp)
+
+    @profiler.profiled("MonthlyRollups.rebuild")
+    def rebuild(self, projects: Iterable[Project], stamp: Optional[Tuple]) -> None:
+        """
+        Recompute the whole table from projects
+
+        Spans are accumulated with a difference array along the month axis
+        (+share at the first month, -share after the last) and one
+        cumulative sum, so the cost is linear in projects plus months.
+
+        Args:
+            projects (Iterable[Project]): Every stored project
+            stamp (Optional[Tuple]): Store data stamp the projects were read at
+        """
+        projects = list(projects)
+        with self._lock:
+            self._origin = 0
+            self._cells = np.zeros((0,) + self._cells.shape[1:])
+            self._contributions = {}
+            if projects:
+                spans = np.array([project_span(p) for p in projects], dtype=np.int64).reshape(-1, 2)
+                first, last = spans[:, 0], spans[:, 1]
+                months = (last - first + 1).astype(np.float64)
+                status = np.array([_STATUS_INDEX[p.status] for p in projects])
+                priority = np.array([_PRIORITY_INDEX[p.priority] for p in projects])
+                shares = np.column_stack((
+                    np.ones(len(projects)),
+                    np.array([p.budget for p in projects]) / months,
+                    np.array([p.spent for p in projects]) / months,
+                ))
+                self._origin = int(first.min())
+                diff = np.zeros((int(last.max()) - self._origin + 2,) + self._cells.shape[1:])
+                np.add.at(diff, (first - self._origin, status, priority), shares)
+                np.add.at(diff, (last + 1 - self._origin, status, priority), -shares)
+                self._cells = np.cumsum(diff, axis=0)[:-1]
+                self._contributions = dict(zip(
+                    (p.id for p in projects),
+                    map(_Contribution._make, zip(
+                        first.tolist(), last.tolist(), status.tolist(), priority.tolist(),
+                        shares[:, 1].tolist(), shares[:, 2].tolist()
+                    ))
+                ))
+            self._stamp = stamp
+            self._loaded = True
+            self._save_file()
+
+    def _load_file(self) -> None:
+        """Adopt the persisted table and the data stamp it was built at"""
+        self._loaded = False
+        self._contributions = None
+        if not self.file_path.exists():
+            return
+        try:
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            start = time.perf_counter()
+            data = json.loads(raw)
+            profiler.record_io("MonthlyRollups.read", bytes_read=len(raw), parse_time=time.perf_counter() - start)
+        except Exception as e:
+            # A damaged table is derived data: rebuild rather than fail the report
+            logging.error("Error reading rollups file: %s", e)
+            return
+        if data.get("format") != ROLLUP_FORMAT:
+            return
+        self._origin = data["origin"]
+        cells = np.array(data["cells"], dtype=np.float64)
+        self._cells = cells.reshape((-1, len(STATUSES), len(PRIORITIES), len(MEASURES)))
+        stamp = data["stamp"]
+        self._stamp = tuple(stamp) if stamp is not None else None
+        self._loaded = True
+
+    def _save_file(self) -> None:
+        try:
+            raw = json.dumps({
+                "format": ROLLUP_FORMAT,
+                "stamp": self._stamp,
+                "origin": self._origin,
+                "cells": self._cells.tolist(),
+            }).encode("utf-8")
+            atomic_write(self.file_path, raw)
+            profiler.record_io("MonthlyRollups.write", bytes_written=len(raw))
+        except Exception as e:
+            logging.error("Error writing rollups file: %s", e)
+            raise DatabaseError(f"Failed to save rollups: {str(e)}")
+
+    @profiler.profiled("MonthlyRollups.report")
+    def report(
+        self,
+        dimension: str = "total",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Monthly budget vs spent rows read from the rollup table
+
+        Args:
+            dimension (str): "total", "status" or "priority"
+            start (Optional[datetime]): First month to include
+            end (Optional[datetime]): Last month to include
+
+        Returns:
+            List[Dict]: Rows with month, group (for status/priority), projects,
+                budget, spent and variance (budget - spent), ordered by month
+
+        Raises:
+            DatabaseError: If the dimension is unknown
+        """
+        if dimension not in DIMENSIONS:
+            raise DatabaseError(f"Unknown report dimension: {dimension}")
+        self._refresh()
+        with self._lock:
+            origin, cells = self._origin, self._cells
+        first = origin if start is None else max(origin, month_index(start))
+        last = origin + len(cells) - 1 if end is None else min(origin + len(cells) - 1, month_index(end))
+        window = cells[max(0, first - origin):max(0, last - origin + 1)]
+
+        if dimension == "status":
+            grouped, labels = window.sum(axis=2), [s.value for s in STATUSES]
+        elif dimension == "priority":
+            grouped, labels = window.sum(axis=1), [p.value for p in PRIORITIES]
+        else:
+            grouped, labels = window.sum(axis=(1, 2))[:, None, :], [None]
+
+        rows = []
+        for offset, month in enumerate(grouped.round(2).tolist()):
+            label = month_label(first + offset)
+            for group, (projects, budget, spent) in zip(labels, month):
+                if not projects:
+                    continue
+                row = {"month": label}
+                if group is not None:
+                    row[dimension] = group
+                row.update({
+                    "projects": int(round(projects)),
+                    "budget": budget,
+                    "spent": spent,
+                    "variance": round(budget - spent, 2),
+                })
+                rows.append(row)
+        return rows
+
+    def export_csv(self, dimension: str = "total", start: Optional[datetime] = None, end: Optional[datetime] = None) -> bytes:
+        """The same rows as report(), as UTF-8 CSV"""
+        rows = self.report(dimension, start, end)
+        fields = ["month"] + ([dimension] if dimension != "total" else []) + list(MEASURES) + ["variance"]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
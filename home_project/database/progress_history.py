@@ -0,0 +1,491 @@
+# database/progress_history.py
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from core.exceptions import DatabaseError
+from database.project_store import ProjectChanges, ProjectStore
+from models.project import Project
+from utils.file_utils import atomic_write
+from utils.profiler import profiler
+
+HISTORY_FORMAT = 1
+MEASURES = ("progress", "spent", "budget")
+PORTFOLIO_MEASURES = ("spent", "budget")  # progress does not add up across projects
+SAMPLE = np.dtype([
+    ("project", "<i4"),  # line number in the project id file
+    ("time", "<i8"),  # epoch seconds
+    ("progress", "<f8"),
+    ("spent", "<f8"),
+    ("budget", "<f8"),
+])
+COLUMNS = SAMPLE.names
+
+class Series(NamedTuple):
+    """A measure downsampled into equal time buckets, one array entry per bucket"""
+    times: np.ndarray  # bucket ends, epoch seconds
+    low: np.ndarray
+    high: np.ndarray
+    last: np.ndarray
+
+    def rows(self) -> List[Dict]:
+        """Chart rows with time, low, high and last, skipping buckets before the first sample"""
+        rows = []
+        for t, low, high, last in zip(self.times.tolist(), self.low.tolist(), self.high.tolist(), self.last.tolist()):
+            if last == last:  # NaN before the first sample
+                rows.append({"time": datetime.fromtimestamp(t), "low": low, "high": high, "last": last})
+        return rows
+
+def _epoch(moment: datetime) -> int:
+    return int(moment.timestamp())
+
+def downsample(times: np.ndarray, values: np.ndarray, start: float, end: float, width: int) -> Series:
+    """
+    Min, max and last value of a step function in each of width equal buckets
+
+    A sample holds until the next one, so each bucket's range also covers
+    the value carried in from the bucket before; buckets before the first
+    sample are NaN. The cost is two binary searches per bucket edge and
+    one reduceat pass over the samples inside the window.
+
+    Args:
+        times (np.ndarray): Sample times, ascending
+        values (np.ndarray): Value from each sample on
+        start (float): Start of the first bucket
+        end (float): End of the last bucket
+        width (int): Number of buckets, e.g. the chart width in pixels
+
+    Returns:
+        Series: Bucket ends with the low, high and last value in each
+    """
+    width = max(1, int(width))
+    edges = np.linspace(start, max(start, end), width + 1)
+    if not len(times):
+        empty = np.full(width, np.nan)
+        return Series(edges[1:], empty, empty.copy(), empty.copy())
+    # Bucket i holds the samples in (edges[i], edges[i + 1]]
+    bounds = np.searchsorted(times, edges, side="right")
+    first, stop = bounds[:-1], bounds[1:]
+    carried = np.where(first > 0, values[np.maximum(first - 1, 0)], np.nan)
+    last = np.where(stop > 0, values[np.maximum(stop - 1, 0)], np.nan)
+    low, high = carried.copy(), carried.copy()
+    filled = stop > first
+    if filled.any():
+        # Empty buckets hold no samples, so the filled ones tile this slice
+        lo, hi = first[filled][0], stop[filled][-1]
+        offsets = first[filled] - lo
+        low[filled] = np.fmin(low[filled], np.minimum.reduceat(values[lo:hi], offsets))
+        high[filled] = np.fmax(high[filled], np.maximum.reduceat(values[lo:hi], offsets))
+    return Series(edges[1:], low, high, last)
+
+class ProgressHistory:
+    """
+    Append-only history of each project's progress, spent and budget
+
+    The project store keeps only current values, so this records a sample
+    (project, time, progress, spent, budget) whenever a persisted write
+    changes one of them, taking the time from the project's updated_at.
+    A deleted project gets a zero sample so it drops out of portfolio
+    totals.
+
+    Samples are appended to a tail file of fixed-size records. Once the
+    tail holds HISTORY_CHUNK_ROWS samples it is sealed into a chunk
+    directory with one .npy file per column, sorted by project and time,
+    which later reads memory-map; manifest.json lists the sealed chunks
+    and the current tail, and is replaced atomically. Project ids are
+    stored once, in an append-only file, and samples refer to them by
+    line number.
+
+    Writes arrive through the store's change listener. When its data stamp
+    shows a write went by unseen (another process, a bulk import), the
+    next read compares every project with its latest sample and records
+    the differences.
+    """
+
+    def __init__(self, project_store: ProjectStore, root: Optional[Path] = None, chunk_rows: Optional[int] = None):
+        self.project_store = project_store
+        self.root = Path(root or settings.HISTORY_DIR)
+        self.chunk_rows = chunk_rows or settings.HISTORY_CHUNK_ROWS
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._ids: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._chunks: List[Dict] = []  # manifest entries, plus their memory-mapped columns
+        self._tail_name = "tail-000000.bin"
+        self._tail = np.empty(0, dtype=SAMPLE)
+        self._tail_rows = 0
+        # Latest sample by time per project code: (time, progress, spent, budget)
+        self._latest: Dict[int, Tuple[int, float, float, float]] = {}
+        self._stamp: Optional[Tuple] = None
+        self._in_sync = False  # Whether the samples cover the store's data at self._stamp
+        # Portfolio step function, extended in place while samples arrive in time order
+        self._portfolio: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._pending: List[Tuple[int, float, float]] = []
+        project_store.add_change_listener(self._on_change)
+
+    def _on_change(self, changes: ProjectChanges) -> None:
+        """Record the samples a persisted batch produces"""
+        with self._lock:
+            self._ensure_loaded()
+            if changes.previous is None:
+                # The whole dataset was replaced: compare it all on the next read
+                self._in_sync = False
+                return
+            in_sync = self._in_sync and self._stamp == changes.stamp_before
+            now = int(time.time())
+            samples = []
+            for project_id, project in changes.current.items():
+                sample = self._sample(project_id, project, now)
+                if sample is not None:
+                    samples.append(sample)
+            self._append(samples)
+            self._stamp, self._in_sync = changes.stamp_after, in_sync
+
+    def _sample(self, project_id: str, project: Optional[Project], now: int) -> Optional[Tuple]:
+        """The sample recording a project's stored state, or None if it matches the latest one"""
+        if project is None:
+            values, moment = (0.0, 0.0, 0.0), now
+        else:
+            values, moment = (float(project.progress), float(project.spent), float(project.budget)), _epoch(project.updated_at)
+        code = self._codes.get(project_id)
+        latest = self._latest.get(code) if code is not None else None
+        if latest is None:
+            if project is None:
+                return None
+        elif latest[1:] == values:
+            return None
+        return (project_id, moment) + values
+
+    def _refresh(self) -> None:
+        """Record whatever changed in the store since the samples were last in sync"""
+        stamp = self.project_store.data_stamp()
+        with self._lock:
+            self._ensure_loaded()
+            if self._in_sync and self._stamp == stamp:
+                return
+        self.project_store.flush()
+        stamp = self.project_store.data_stamp()
+        projects = self.project_store.get_all_projects()
+        with self._lock:
+            if self._in_sync and self._stamp == stamp:
+                return
+            if self.project_store.data_stamp() != stamp:
+                # Written meanwhile; the listener records it and the next read retries
+                return
+            now = int(time.time())
+            stored = {project.id for project in projects}
+            samples = [self._sample(project.id, project, now) for project in projects]
+            samples.extend(
+                self._sample(project_id, None, now)
+                for project_id in self._ids if project_id not in stored
+            )
+            self._append([sample for sample in samples if sample is not None])
+            self._stamp, self._in_sync = stamp, True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load()
+            self._loaded = True
+
+    @profiler.profiled("ProgressHistory.load")
+    def _load(self) -> None:
+        """Open the id file, the sealed chunks and the tail"""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._ids = self._read_lines(self.root / "projects.txt")
+            self._codes = {project_id: code for code, project_id in enumerate(self._ids)}
+
+            manifest_path = self.root / "manifest.json"
+            if manifest_path.exists():
+                manifest = json.loads(manifest_path.read_bytes())
+                if manifest.get("format") != HISTORY_FORMAT:
+                    raise DatabaseError(f"Unsupported history format: {manifest.get('format')}")
+                self._tail_name = manifest["tail"]
+                self._chunks = [self._open_chunk(entry) for entry in manifest["chunks"]]
+
+            tail_path = self.root / self._tail_name
+            raw = tail_path.read_bytes() if tail_path.exists() else b""
+            rows = len(raw) // SAMPLE.itemsize
+            if len(raw) != rows * SAMPLE.itemsize:
+                # A record cut short by a crash mid-append
+                with open(tail_path, 'r+b') as f:
+                    f.truncate(rows * SAMPLE.itemsize)
+            self._tail = np.frombuffer(raw, dtype=SAMPLE, count=rows).copy()
+            self._tail_rows = rows
+            profiler.record_io("ProgressHistory.read", bytes_read=len(raw))
+        except DatabaseError:
+            raise
+        except Exception as e:
+            logging.error("Error reading progress history: %s", e)
+            raise DatabaseError(f"Failed to load progress history: {str(e)}")
+        self._index()
+
+    @staticmethod
+    def _read_lines(path: Path) -> List[str]:
+        """Lines of an append-only file, dropping a last line a crash left unfinished"""
+        if not path.exists():
+            return []
+        raw = path.read_bytes()
+        complete = raw[:raw.rfind(b"\n") + 1]
+        if len(complete) != len(raw):
+            with open(path, 'r+b') as f:
+                f.truncate(len(complete))
+        return complete.decode("utf-8").splitlines()
+
+    @staticmethod
+    def _write_appending(path: Path, data: bytes) -> None:
+        with open(path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _open_chunk(self, entry: Dict) -> Dict:
+        chunk = dict(entry)
+        chunk["columns"] = {
+            name: np.load(self.root / entry["name"] / f"{name}.npy", mmap_mode="r")
+            for name in COLUMNS
+        }
+        return chunk
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """Every sample, sealed chunks first, then the tail in arrival order"""
+        tail = self._tail[:self._tail_rows]
+        return {
+            name: np.concatenate([chunk["columns"][name] for chunk in self._chunks] + [tail[name]])
+            for name in COLUMNS
+        }
+
+    @profiler.profiled("ProgressHistory.index")
+    def _index(self) -> None:
+        """
+        Rebuild the latest sample per project and the portfolio step function
+
+        Samples are put in (project, time) order, with ties kept in arrival
+        order, and differenced within each project; the differences, put in
+        time order and summed cumulatively, give the portfolio totals after
+        every sample.
+        """
+        columns = self._columns()
+        order = np.lexsort((columns["time"], columns["project"]))
+        projects, times = columns["project"][order], columns["time"][order]
+        values = np.column_stack([columns[name][order] for name in MEASURES])
+
+        ends = np.flatnonzero(np.r_[projects[1:] != projects[:-1], True]) if len(projects) else []
+        self._latest = {
+            int(projects[i]): (int(times[i]),) + tuple(values[i].tolist())
+            for i in ends
+        }
+
+        totals = values[:, [MEASURES.index(name) for name in PORTFOLIO_MEASURES]]
+        same = projects[1:] == projects[:-1]
+        deltas = totals.copy()
+        deltas[1:][same] -= totals[:-1][same]
+        by_time = np.argsort(times, kind="stable")
+        self._portfolio = (times[by_time], np.cumsum(deltas[by_time], axis=0))
+        self._pending = []
+
+    def _append(self, samples: List[Tuple]) -> None:
+        """Persist samples (project_id, time, progress, spent, budget) and index them"""
+        if not samples:
+            return
+        try:
+            new_ids = [s[0] for s in samples if s[0] not in self._codes]
+            if new_ids:
+                new_ids = list(dict.fromkeys(new_ids))
+                self._write_appending(self.root / "projects.txt", "".join(f"{i}\n" for i in new_ids).encode("utf-8"))
+                for project_id in new_ids:
+                    self._codes[project_id] = len(self._ids)
+                    self._ids.append(project_id)
+
+            records = np.empty(len(samples), dtype=SAMPLE)
+            records["project"] = [self._codes[s[0]] for s in samples]
+            records["time"] = [s[1] for s in samples]
+            for i, name in enumerate(MEASURES):
+                records[name] = [s[2 + i] for s in samples]
+            self._write_appending(self.root / self._tail_name, records.tobytes())
+            profiler.record_io("ProgressHistory.write", bytes_written=records.nbytes)
+        except Exception as e:
+            logging.error("Error writing progress history: %s", e)
+            raise DatabaseError(f"Failed to save progress history: {str(e)}")
+
+        if self._tail_rows + len(records) > len(self._tail):
+            grown = np.empty(max(2 * len(self._tail), self._tail_rows + len(records), 1024), dtype=SAMPLE)
+            grown[:self._tail_rows] = self._tail[:self._tail_rows]
+            self._tail = grown
+        self._tail[self._tail_rows:self._tail_rows + len(records)] = records
+        self._tail_rows += len(records)
+
+        for code, moment, *values in records.tolist():
+            self._index_sample(code, moment, values)
+        if self._tail_rows >= self.chunk_rows:
+            self._seal()
+
+    def _index_sample(self, code: int, moment: int, values: List[float]) -> None:
+        """Fold one new sample into the latest values and the portfolio step function"""
+        latest = self._latest.get(code)
+        if self._portfolio is not None:
+            times, totals = self._portfolio
+            end = self._pending[-1][0] if self._pending else (int(times[-1]) if len(times) else None)
+            if end is not None and moment < end:
+                # Earlier than samples already summed: recompute on next read
+                self._portfolio = None
+            else:
+                running = self._pending[-1][1:] if self._pending else (tuple(totals[-1].tolist()) if len(totals) else (0.0,) * len(PORTFOLIO_MEASURES))
+                before = latest[1:] if latest is not None else (0.0,) * len(MEASURES)
+                self._pending.append((moment,) + tuple(
+                    total + values[MEASURES.index(name)] - before[MEASURES.index(name)]
+                    for total, name in zip(running, PORTFOLIO_MEASURES)
+                ))
+        if latest is None or moment >= latest[0]:
+            self._latest[code] = (moment,) + tuple(values)
+
+    @profiler.profiled("ProgressHistory.seal")
+    def _seal(self) -> None:
+        """Move the tail into a sorted, columnar chunk and start a new tail"""
+        rows = self._tail[:self._tail_rows]
+        sealed = rows[np.lexsort((rows["time"], rows["project"]))]
+        number = int(self._tail_name.split("-")[1].split(".")[0])
+        name = f"chunk-{number:06d}"
+        tail_name = f"tail-{number + 1:06d}.bin"
+        entry = {"name": name, "rows": len(sealed), "start": int(sealed["time"].min()), "end": int(sealed["time"].max())}
+        try:
+            staging = self.root / f".{name}.tmp"
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.rmtree(self.root / name, ignore_errors=True)  # left by a seal that never reached the manifest
+            staging.mkdir()
+            for column in COLUMNS:
+                with open(staging / f"{column}.npy", 'wb') as f:
+                    np.save(f, np.ascontiguousarray(sealed[column]))
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(staging, self.root / name)
+            atomic_write(self.root / tail_name, b"")
+            manifest = [{k: v for k, v in chunk.items() if k != "columns"} for chunk in self._chunks] + [entry]
+            atomic_write(self.root / "manifest.json", json.dumps({
+                "format": HISTORY_FORMAT,
+                "chunks": manifest,
+                "tail": tail_name,
+            }).encode("utf-8"))
+            (self.root / self._tail_name).unlink(missing_ok=True)
+        except Exception as e:
+            logging.error("Error sealing progress history chunk: %s", e)
+            raise DatabaseError(f"Failed to save progress history: {str(e)}")
+        self._chunks.append(self._open_chunk(entry))
+        self._tail_name = tail_name
+        self._tail_rows = 0
+
+    def _check_measure(self, measure: str, allowed: Tuple[str, ...]) -> None:
+        if measure not in allowed:
+            raise DatabaseError(f"Unknown history measure: {measure}")
+
+    def _window(self, times: np.ndarray, start: Optional[datetime], end: Optional[datetime]) -> Tuple[float, float]:
+        """Chart window, defaulting to the first sample through now"""
+        first = _epoch(start) if start is not None else (float(times[0]) if len(times) else time.time())
+        last = _epoch(end) if end is not None else max(time.time(), float(times[-1]) if len(times) else 0.0)
+        return first, last
+
+    @profiler.profiled("ProgressHistory.project_series")
+    def project_series(
+        self,
+        project_id: str,
+        measure: str = "progress",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        width: Optional[int] = None
+    ) -> Series:
+        """
+        One project's measure over time, downsampled for a chart
+
+        Args:
+            project_id (str): Project ID
+            measure (str): "progress", "spent" or "budget"
+            start (Optional[datetime]): Window start; defaults to the first sample
+            end (Optional[datetime]): Window end; defaults to now
+            width (Optional[int]): Buckets; defaults to CHART_POINTS
+
+        Returns:
+            Series: Low, high and last value per bucket
+
+        Raises:
+            DatabaseError: If the measure is unknown
+        """
+        self._check_measure(measure, MEASURES)
+        self._refresh()
+        with self._lock:
+            code = self._codes.get(project_id)
+            parts = []
+            if code is not None:
+                for chunk in self._chunks:
+                    columns = chunk["columns"]
+                    # Chunks are sorted by project, so a project's samples are one slice
+                    lo, hi = np.searchsorted(columns["project"], [code, code + 1])
+                    if hi > lo:
+                        parts.append((columns["time"][lo:hi], columns[measure][lo:hi]))
+                tail = self._tail[:self._tail_rows]
+                mask = tail["project"] == code
+                parts.append((tail["time"][mask], tail[measure][mask]))
+        if parts:
+            times = np.concatenate([p[0] for p in parts])
+            values = np.concatenate([p[1] for p in parts])
+            order = np.argsort(times, kind="stable")
+            times, values = times[order], values[order]
+        else:
+            times, values = np.empty(0, dtype=np.int64), np.empty(0)
+        first, last = self._window(times, start, end)
+        return downsample(times, values, first, last, width or settings.CHART_POINTS)
+
+    @profiler.profiled("ProgressHistory.portfolio_series")
+    def portfolio_series(
+        self,
+        measure: str = "spent",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        width: Optional[int] = None
+    ) -> Series:
+        """
+        A measure summed over every project over time, downsampled for a chart
+
+        Args:
+            measure (str): "spent" or "budget"
+            start (Optional[datetime]): Window start; defaults to the first sample
+            end (Optional[datetime]): Window end; defaults to now
+            width (Optional[int]): Buckets; defaults to CHART_POINTS
+
+        Returns:
+            Series: Low, high and last total per bucket
+
+        Raises:
+            DatabaseError: If the measure is unknown
+        """
+        self._check_measure(measure, PORTFOLIO_MEASURES)
+        self._refresh()
+        with self._lock:
+            if self._portfolio is None:
+                self._index()
+            if self._pending:
+                times, totals = self._portfolio
+                pending = np.array(self._pending, dtype=np.float64).reshape(-1, 1 + len(PORTFOLIO_MEASURES))
+                self._portfolio = (
+                    np.concatenate([times, pending[:, 0].astype(np.int64)]),
+                    np.concatenate([totals, pending[:, 1:]]),
+                )
+                self._pending = []
+            times, totals = self._portfolio
+        values = totals[:, PORTFOLIO_MEASURES.index(measure)]
+        first, last = self._window(times, start, end)
+        return downsample(times, values, first, last, width or settings.CHART_POINTS)
+
+    def sample_count(self) -> int:
+        """Number of samples recorded"""
+        with self._lock:
+            self._ensure_loaded()
+            return sum(chunk["rows"] for chunk in self._chunks) + self._tail_rows
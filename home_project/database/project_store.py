@@ -1,23 +1,116 @@
+import atexit
 import json
-from typing import List, Optional, Dict
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Dict, Tuple
 from datetime import datetime
-from models.project import Project, ProjectStatus, ProjectPriority,ProjectMilestone
+from pathlib import Path
+from models.project import Project, ProjectStatus, ProjectPriority,ProjectMilestone, naive_local
+from database import binary_format
+from database.mapped_snapshot import MappedSnapshot
+from database.sharded_projects import ShardedProjects
+from database.snapshot import ProjectSnapshot, ReadScope
+from database.write_behind import WriteBehindQueue
 from core.exceptions import DatabaseError
 from config.settings import settings
+from utils.file_utils import fsync_directory
+from utils.profiler import profiler
 import logging
 
+class ProjectChanges(NamedTuple):
+    """
+    A batch of writes that has reached storage, as passed to change
+    listeners. previous is None when the whole dataset was replaced.
+    """
+    previous: Optional[Dict[str, Optional[Project]]]  # Stored versions before the write; None: did not exist
+    current: Dict[str, Optional[Project]]  # Written versions; None: deleted
+    stamp_before: Optional[Tuple]
+    stamp_after: Optional[Tuple]
+
 class ProjectStore:
-    """Handles project data storage operations"""
-    def __init__(self):
-        self.file_path = settings.DATABASE_DIR / "projects.json"
+    """
+    Handles project data storage operations
+
+    In write-behind mode, create/update/delete return as soon as the change
+    is queued; readers see it immediately and a background thread persists
+    coalesced batches. Call flush() where durability is required.
+
+    Projects are stored as JSON or in the binary snapshot format
+    (database/binary_format.py), chosen by the file suffix. A binary store
+    with no file yet converts the JSON file next to it on first read.
+
+    A memory-mapped binary store answers get_project() and existence
+    checks from the file's index, decoding a single record, until a full
+    load is needed anyway; writes copy unchanged records byte for byte.
+
+    A path without a suffix is a sharded directory with one file per
+    project (database/sharded_projects.py): single-project reads and
+    writes touch one small file, and an existing projects.bin or
+    projects.json next to it is migrated on first use.
+
+    Derived data (e.g. reporting rollups) can follow writes through
+    add_change_listener(); listeners run once a batch is on disk, in the
+    write-behind thread when that is enabled.
+    """
+    def __init__(
+        self,
+        write_behind: Optional[bool] = None,
+        file_path: Optional[Path] = None,
+        memory_map: Optional[bool] = None
+    ):
+        storage = settings.PROJECT_STORAGE_FORMAT
+        if file_path is None:
+            file_path = {
+                "json": settings.PROJECTS_FILE,
+                "sharded": settings.PROJECTS_SHARD_DIR,
+            }.get(storage, settings.PROJECTS_BINARY_FILE)
+        self.file_path = Path(file_path)
+        self.storage_format = _storage_format(self.file_path)
+        self.memory_mapped = storage == "mmap" if memory_map is None else memory_map
+        if self.memory_mapped and self.storage_format != "binary":
+            raise DatabaseError("Memory-mapped storage requires a binary (.bin) projects file")
         self._ensure_database_directory()
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        # Parsed file contents, and the snapshot readers see (file + queued changes)
+        self._base: Optional[Dict[str, Project]] = None
+        self._base_stamp: Optional[Tuple[int, int]] = None
+        self._cache: Optional[ProjectSnapshot] = None
+        self._scope: ContextVar[Optional[ReadScope]] = ContextVar(f"project_read_scope_{id(self)}", default=None)
+        self._mapped: Optional[MappedSnapshot] = None
+        self._mapped_stamp: Optional[Tuple[int, int]] = None
+        self._shards: Optional[ShardedProjects] = None
+        if self.storage_format == "sharded":
+            self._shards = ShardedProjects(
+                self.file_path,
+                self._serialize_project,
+                self._deserialize_project,
+                bucket_chars=settings.SHARD_BUCKET_CHARS,
+                workers=settings.SHARD_LOAD_WORKERS
+            )
+
+        self._listeners: List[Callable[[ProjectChanges], None]] = []
+
+        if write_behind is None:
+            write_behind = settings.PROJECT_WRITE_BEHIND
+        self._write_queue: Optional[WriteBehindQueue] = None
+        if write_behind:
+            self._write_queue = WriteBehindQueue(self._flush_batch, settings.WRITE_BEHIND_INTERVAL)
+            atexit.register(self._write_queue.close)
+
+    @property
+    def write_behind(self) -> bool:
+        return self._write_queue is not None
 
     def _ensure_database_directory(self) -> None:
         """Ensure database directory exists"""
         try:
-            settings.DATABASE_DIR.mkdir(parents=True, exist_ok=True)
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            logging.error(f"Failed to create database directory: {str(e)}")
+            logging.error("Failed to create database directory: %s", e)
             raise DatabaseError("Could not initialize database directory")
 
     def _serialize_project(self, project: Project) -> Dict:
@@ -26,8 +119,8 @@ class ProjectStore:
             "id": project.id,
             "name": project.name,
             "description": project.description,
-            "start_date": project.start_date.isoformat(),
-            "end_date": project.end_date.isoformat(),
+            "start_date": _iso(project.start_date),
+            "end_date": _iso(project.end_date),
             "status": project.status.value,
             "priority": project.priority.value,
             "budget": project.budget,
@@ -36,16 +129,18 @@ class ProjectStore:
             "milestones": [
                 {
                     "title": m.title,
-                    "due_date": m.due_date.isoformat(),
+                    "due_date": _iso(m.due_date),
                     "completed": m.completed,
-                    "completion_date": m.completion_date.isoformat() if m.completion_date else None,
+                    "completion_date": _iso(m.completion_date) if m.completion_date else None,
                     "description": m.description
                 }
                 for m in project.milestones
             ],
             "team_members": project.team_members,
-            "created_at": project.created_at.isoformat(),
-            "updated_at": project.updated_at.isoformat()
+            "created_at": _iso(project.created_at),
+            "updated_at": _iso(project.updated_at),
+            "latitude": project.latitude,
+            "longitude": project.longitude
         }
 
     def _deserialize_project(self, data: Dict) -> Project:
@@ -54,8 +149,8 @@ class ProjectStore:
             id=data["id"],
             name=data["name"],
             description=data["description"],
-            start_date=datetime.fromisoformat(data["start_date"]),
-            end_date=datetime.fromisoformat(data["end_date"]),
+            start_date=_parse_datetime(data["start_date"]),
+            end_date=_parse_datetime(data["end_date"]),
             status=ProjectStatus(data["status"]),
             priority=ProjectPriority(data["priority"]),
             budget=data["budget"],
@@ -64,82 +159,566 @@ class ProjectStore:
             milestones=[
                 ProjectMilestone(
                     title=m["title"],
-                    due_date=datetime.fromisoformat(m["due_date"]),
+                    due_date=_parse_datetime(m["due_date"]),
                     completed=m["completed"],
-                    completion_date=datetime.fromisoformat(m["completion_date"]) if m["completion_date"] else None,
+                    completion_date=_parse_datetime(m["completion_date"]) if m["completion_date"] else None,
                     description=m["description"]
                 )
                 for m in data["milestones"]
             ],
             team_members=data["team_members"],
-            created_at=datetime.fromisoformat(data["created_at"]),
-            updated_at=datetime.fromisoformat(data["updated_at"])
+            created_at=_parse_datetime(data["created_at"]),
+            updated_at=_parse_datetime(data["updated_at"]),
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude")
         )
 
-    def get_all_projects(self) -> List[Project]:
-        """Retrieve all projects"""
+    def _encode(self, projects: List[Project]) -> bytes:
+        """Encode projects in this store's file format"""
+        if self.storage_format == "binary":
+            return binary_format.encode_projects(projects)
+        return json.dumps([self._serialize_project(p) for p in projects], indent=2).encode('utf-8')
+
+    def _decode(self, raw: bytes) -> List[Project]:
+        """Decode projects from this store's file format"""
+        if self.storage_format == "binary":
+            return binary_format.decode_projects(raw)
+        return [self._deserialize_project(p) for p in json.loads(raw)]
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the projects file, or None if it is missing"""
+        if self._shards is not None:
+            return self._shards.stamp()
+        try:
+            stat = self.file_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def data_stamp(self) -> Optional[Tuple]:
+        """
+        Token that changes whenever the stored data changes, or None if
+        nothing is stored yet
+        """
+        self._ensure_file()
+        return self._file_stamp()
+
+    def add_change_listener(self, listener: Callable[[ProjectChanges], None]) -> None:
+        """
+        Call listener after every batch of changes is persisted
+
+        Args:
+            listener (Callable[[ProjectChanges], None]): Receives each persisted batch
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, changes: ProjectChanges) -> None:
+        """Pass a persisted batch to the listeners; their failures never fail the write"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                logging.error("Project change listener failed: %s", e)
+
+    def _stored_versions(self, project_ids: Iterable[str]) -> Dict[str, Optional[Project]]:
+        """The stored versions of the given projects, read one by one where possible"""
+        reader = None
+        if (self.memory_mapped or self._shards is not None) and not self._base_is_current():
+            reader = self._record_reader()
+            if reader is None:
+                return {project_id: None for project_id in project_ids}
+        if reader is not None:
+            return {project_id: reader.get(project_id) for project_id in project_ids}
+        base = self._load_base()
+        return {project_id: base.get(project_id) for project_id in project_ids}
+
+    def _set_base(self, projects: List[Project], stamp: Optional[Tuple[int, int]]) -> None:
+        """Record the file contents and drop the derived snapshot"""
+        with self._lock:
+            self._base = {p.id: p for p in projects}
+            self._base_stamp = stamp
+            self._cache = None
+        self._invalidate_scope()
+
+    def _invalidate_scope(self) -> None:
+        scope = self._scope.get()
+        if scope is not None:
+            # Reads later in the same unit of work see this context's writes
+            scope.snapshot = None
+
+    def _ensure_file(self) -> bool:
+        """
+        Whether the projects data exists, first migrating a single-file
+        store next to a missing binary file or shard directory
+        """
+        if self._shards is not None:
+            if self._shards.exists():
+                return True
+            candidates = [self.file_path.with_suffix(".bin"), self.file_path.with_suffix(".json")]
+        elif self.file_path.exists():
+            return True
+        elif self.storage_format == "binary":
+            candidates = [self.file_path.with_suffix(".json")]
+        else:
+            return False
+        existing = [path for path in candidates if path.exists()]
+        if not existing:
+            return False
+        legacy = max(existing, key=lambda path: path.stat().st_mtime_ns)
+        logging.info("Converting %s to the %s format", legacy, self.storage_format)
+        convert_projects_file(legacy, self.file_path)
+        return True
+
+    def _mapping(self) -> Optional[MappedSnapshot]:
+        """Memory map of the current projects file, remapped after it is replaced"""
+        stamp = self._file_stamp()
+        with self._lock:
+            if self._mapped is not None and stamp == self._mapped_stamp:
+                return self._mapped
+        if not self._ensure_file():
+            return None
+        stamp = self._file_stamp()
+        mapped = MappedSnapshot(self.file_path)
+        if not mapped.indexed:
+            logging.info("Adding an index to %s", self.file_path)
+            convert_projects_file(self.file_path, self.file_path)
+            stamp = self._file_stamp()
+            mapped = MappedSnapshot(self.file_path)
+        with self._lock:
+            self._mapped = mapped
+            self._mapped_stamp = stamp
+        return mapped
+
+    def _record_reader(self):
+        """
+        Source of single-project reads that avoid a full load: the memory
+        map or the shard directory. None for whole-file storage.
+        """
+        if self.memory_mapped:
+            return self._mapping()
+        if self._shards is not None and self._ensure_file():
+            return self._shards
+        return None
+
+    def _base_is_current(self) -> bool:
+        """Whether the parsed file contents are loaded and up to date"""
+        with self._lock:
+            base, stamp = self._base, self._base_stamp
+        return base is not None and stamp == self._file_stamp()
+
+    def _read_file(self) -> List[Project]:
+        """Parse every project from the projects file"""
         try:
-            if not self.file_path.exists():
+            if self._shards is not None:
+                if not self._ensure_file():
+                    return []
+                start = time.perf_counter()
+                projects, size = self._shards.load_all()
+                profiler.record_io("ProjectStore.read", bytes_read=size, parse_time=time.perf_counter() - start)
+                return projects
+            if self.memory_mapped:
+                mapped = self._mapping()
+                if mapped is None:
+                    return []
+                start = time.perf_counter()
+                projects = mapped.projects()
+                profiler.record_io("ProjectStore.read", bytes_read=mapped.size, parse_time=time.perf_counter() - start)
+                return projects
+            if not self._ensure_file():
                 return []
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [self._deserialize_project(p) for p in data]
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            start = time.perf_counter()
+            projects = self._decode(raw)
+            profiler.record_io("ProjectStore.read", bytes_read=len(raw), parse_time=time.perf_counter() - start)
+            return projects
         except Exception as e:
-            logging.error(f"Error reading projects: {str(e)}")
+            logging.error("Error reading projects: %s", e)
             raise DatabaseError(f"Failed to retrieve projects: {str(e)}")
 
+    def _load_base(self) -> Dict[str, Project]:
+        """Return the file contents, re-reading the file only if it changed"""
+        stamp = self._file_stamp()
+        with self._lock:
+            if self._base is not None and stamp == self._base_stamp:
+                return self._base
+        projects = self._read_file()
+        with self._lock:
+            self._base = {p.id: p for p in projects}
+            self._base_stamp = stamp
+            self._cache = None
+            return self._base
+
+    def _load_snapshot(self) -> ProjectSnapshot:
+        """Latest data: the stored projects plus any queued, unflushed changes"""
+        base = self._load_base()
+        with self._lock:
+            if self._cache is not None and base is self._base:
+                return self._cache
+            projects = base
+            if self._write_queue is not None:
+                pending = self._write_queue.pending()
+                if pending:
+                    projects = _apply_changes(base, pending)
+            snapshot = ProjectSnapshot(projects.values())
+            if base is self._base:
+                self._cache = snapshot
+            return snapshot
+
+    @contextmanager
+    def read_scope(self) -> Iterator[ReadScope]:
+        """
+        Serve every read inside the block from one snapshot, taken on the
+        first read. Nested scopes share the outermost snapshot.
+        """
+        scope = self._scope.get()
+        if scope is not None:
+            yield scope
+            return
+        token = self._scope.set(ReadScope())
+        try:
+            yield self._scope.get()
+        finally:
+            self._scope.reset(token)
+
+    def snapshot(self) -> ProjectSnapshot:
+        """
+        Consistent view of all projects; within a read scope the same
+        snapshot is returned for every call
+        """
+        scope = self._scope.get()
+        if scope is None:
+            return self._load_snapshot()
+        if scope.snapshot is None:
+            scope.snapshot = self._load_snapshot()
+        return scope.snapshot
+
+    @profiler.profiled("ProjectStore.get_all_projects")
+    def get_all_projects(self) -> List[Project]:
+        """Retrieve all projects"""
+        return list(self.snapshot().projects)
+
+    @profiler.profiled("ProjectStore.get_portfolio_summary")
+    def get_portfolio_summary(self) -> Dict[str, float]:
+        """
+        Portfolio-wide aggregates, computed once per version of the data
+
+        Returns:
+            Dict[str, float]: total_projects, active_projects, total_budget, total_spent
+        """
+        return self.snapshot().summary
+
+    def warm_up(self) -> None:
+        """Load projects and aggregates ahead of the first dashboard render"""
+        try:
+            self._load_snapshot().summary
+        except DatabaseError:
+            # The dashboard render will surface the error to the user
+            pass
+
+    @profiler.profiled("ProjectStore.get_project")
     def get_project(self, project_id: str) -> Optional[Project]:
         """Retrieve specific project by ID"""
-        projects = self.get_all_projects()
-        return next((p for p in projects if p.id == project_id), None)
+        scope = self._scope.get()
+        single_record = self.memory_mapped or self._shards is not None
+        if not single_record or (scope is not None and scope.snapshot is not None) or self._base_is_current():
+            return self.snapshot().get(project_id)
+        if self._write_queue is not None:
+            queued, project = self._write_queue.lookup(project_id)
+            if queued:
+                return project
+        try:
+            reader = self._record_reader()
+            return reader.get(project_id) if reader is not None else None
+        except Exception as e:
+            logging.error("Error reading project %s: %s", project_id, e)
+            raise DatabaseError(f"Failed to retrieve project: {str(e)}")
 
+    @profiler.profiled("ProjectStore.get_team_members")
+    def get_team_members(self) -> List[str]:
+        """All team members assigned to any project, sorted"""
+        return sorted({member for p in self.snapshot().projects for member in p.team_members})
+
+    @profiler.profiled("ProjectStore.create_project")
     def create_project(self, project: Project) -> bool:
         """Create new project"""
         try:
-            projects = self.get_all_projects()
-            if any(p.id == project.id for p in projects):
-                return False
-            
-            projects.append(project)
-            self._save_projects(projects)
+            with self._write_lock:
+                if self._exists(project.id):
+                    return False
+                self._write({project.id: project})
             return True
         except Exception as e:
-            logging.error(f"Error creating project: {str(e)}")
+            logging.error("Error creating project: %s", e)
             raise DatabaseError(f"Failed to create project: {str(e)}")
 
+    @profiler.profiled("ProjectStore.update_project")
     def update_project(self, project: Project) -> bool:
         """Update existing project"""
         try:
-            projects = self.get_all_projects()
-            for i, p in enumerate(projects):
-                if p.id == project.id:
-                    project.updated_at = datetime.now()
-                    projects[i] = project
-                    self._save_projects(projects)
-                    return True
-            return False
+            with self._write_lock:
+                if not self._exists(project.id):
+                    return False
+                project.updated_at = datetime.now()
+                self._write({project.id: project})
+            return True
         except Exception as e:
-            logging.error(f"Error updating project: {str(e)}")
+            logging.error("Error updating project: %s", e)
             raise DatabaseError(f"Failed to update project: {str(e)}")
 
+    @profiler.profiled("ProjectStore.delete_project")
     def delete_project(self, project_id: str) -> bool:
         """Delete project by ID"""
         try:
-            projects = self.get_all_projects()
-            filtered_projects = [p for p in projects if p.id != project_id]
-            if len(filtered_projects) == len(projects):
-                return False
-            self._save_projects(filtered_projects)
+            with self._write_lock:
+                if not self._exists(project_id):
+                    return False
+                self._write({project_id: None})
             return True
         except Exception as e:
-            logging.error(f"Error deleting project: {str(e)}")
+            logging.error("Error deleting project: %s", e)
             raise DatabaseError(f"Failed to delete project: {str(e)}")
 
+    @profiler.profiled("ProjectStore.flush")
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Durability barrier: block until every change made so far is on disk.
+        A no-op unless write-behind is enabled.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait
+
+        Raises:
+            DatabaseError: If pending writes could not be persisted
+        """
+        if self._write_queue is not None:
+            self._write_queue.flush(timeout)
+
+    def close(self) -> None:
+        """Persist outstanding changes and stop the write-behind thread, if any"""
+        if self._write_queue is not None:
+            self._write_queue.close()
+            # The exit hook holds the queue and, through it, the whole store
+            atexit.unregister(self._write_queue.close)
+
+    @profiler.profiled("ProjectStore.import_projects")
+    def import_projects(self, projects: Iterable[Project]) -> int:
+        """
+        Replace all stored projects, streaming them to disk one at a time so
+        the input is never held in memory as a whole
+
+        Args:
+            projects (Iterable[Project]): Projects to store, e.g. a generator
+
+        Returns:
+            int: Number of projects written
+
+        Raises:
+            DatabaseError: If the file cannot be written
+        """
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        count = 0
+        try:
+            with self._write_lock:
+                self.flush()
+                if self._shards is not None:
+                    count = self._shards.replace_all(projects)
+                    with self._lock:
+                        self._base = None
+                        self._cache = None
+                    self._invalidate_scope()
+                    self._notify(ProjectChanges(None, {}, None, self._file_stamp()))
+                    return count
+                with open(tmp_path, 'wb') as f:
+                    if self.storage_format == "binary":
+                        count = binary_format.write_projects(f, projects)
+                    else:
+                        f.write(b"[")
+                        for project in projects:
+                            f.write(b",\n" if count else b"\n")
+                            f.write(json.dumps(self._serialize_project(project), indent=2).encode('utf-8'))
+                            count += 1
+                        f.write(b"\n]")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.file_path)
+                fsync_directory(self.file_path.parent)
+                with self._lock:
+                    self._base = None
+                    self._cache = None
+                self._invalidate_scope()
+                self._notify(ProjectChanges(None, {}, None, self._file_stamp()))
+            return count
+        except Exception as e:
+            logging.error("Error importing projects: %s", e)
+            raise DatabaseError(f"Failed to import projects: {str(e)}")
+
+    def _exists(self, project_id: str) -> bool:
+        """Check the latest data for a project without building a snapshot"""
+        if self._write_queue is not None:
+            queued, project = self._write_queue.lookup(project_id)
+            if queued:
+                return project is not None
+        if (self.memory_mapped or self._shards is not None) and not self._base_is_current():
+            reader = self._record_reader()
+            return reader is not None and project_id in reader
+        return project_id in self._load_base()
+
+    def _write(self, changes: Dict[str, Optional[Project]]) -> None:
+        """Persist changes now, or queue them in write-behind mode"""
+        if self._write_queue is None:
+            self._flush_batch(changes)
+            return
+        for project_id, project in changes.items():
+            self._write_queue.put(project_id, project)
+        with self._lock:
+            self._cache = None
+        self._invalidate_scope()
+
+    def _flush_batch(self, changes: Dict[str, Optional[Project]]) -> None:
+        """Apply a batch of changes (None deletes) to storage and tell the listeners"""
+        if not self._listeners:
+            self._persist_batch(changes)
+            return
+        previous = self._stored_versions(changes)
+        stamp_before = self._file_stamp()
+        self._persist_batch(changes)
+        self._notify(ProjectChanges(previous, dict(changes), stamp_before, self._file_stamp()))
+
+    def _persist_batch(self, changes: Dict[str, Optional[Project]]) -> None:
+        """Apply a batch of changes (None deletes) to the file in one write"""
+        if self._shards is not None:
+            self._write_shards(changes)
+            return
+        if self.memory_mapped:
+            mapped = self._mapping()
+            if mapped is not None:
+                self._rewrite_mapped(mapped, changes)
+                return
+        projects = _apply_changes(self._load_base(), changes)
+        self._save_projects(list(projects.values()))
+
+    def _rewrite_mapped(self, mapped: MappedSnapshot, changes: Dict[str, Optional[Project]]) -> None:
+        """Atomically replace the mapped file with changes applied, without parsing it"""
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        base = self._current_base(self._mapped_stamp)
+        try:
+            start = time.perf_counter()
+            with open(tmp_path, 'wb') as f:
+                mapped.rewrite(f, changes)
+                written = f.tell()
+                f.flush()
+                os.fsync(f.fileno())
+            encode_time = time.perf_counter() - start
+            os.replace(tmp_path, self.file_path)
+            fsync_directory(self.file_path.parent)
+            profiler.record_io("ProjectStore.write", bytes_written=written, parse_time=encode_time)
+        except Exception as e:
+            logging.error("Error saving projects: %s", e)
+            raise DatabaseError(f"Failed to save projects: {str(e)}")
+        self._update_base(base, changes)
+
+    def _write_shards(self, changes: Dict[str, Optional[Project]]) -> None:
+        """Rewrite only the files of the changed projects"""
+        try:
+            self._ensure_file()
+            base = self._current_base(self._file_stamp())
+            start = time.perf_counter()
+            written = self._shards.apply(changes)
+            profiler.record_io("ProjectStore.write", bytes_written=written, parse_time=time.perf_counter() - start)
+        except Exception as e:
+            logging.error("Error saving projects: %s", e)
+            raise DatabaseError(f"Failed to save projects: {str(e)}")
+        self._update_base(base, changes)
+
+    def _current_base(self, stamp: Optional[Tuple[int, int]]) -> Optional[Dict[str, Project]]:
+        """The parsed contents if they match the given stamp, else None"""
+        with self._lock:
+            if self._base is not None and self._base_stamp == stamp:
+                return self._base
+        return None
+
+    def _update_base(self, base: Optional[Dict[str, Project]], changes: Dict[str, Optional[Project]]) -> None:
+        """After a partial write, patch the parsed contents or drop them"""
+        if base is not None:
+            # Keep an already parsed copy warm rather than re-reading the data
+            updated = _apply_changes(base, changes)
+            stamp = self._file_stamp()
+            with self._lock:
+                self._base = updated
+                self._base_stamp = stamp
+                self._cache = None
+            self._invalidate_scope()
+        else:
+            with self._lock:
+                self._base = None
+                self._cache = None
+            self._invalidate_scope()
+
     def _save_projects(self, projects: List[Project]) -> None:
-        """Save projects to file"""
+        """Atomically replace the projects file and fsync it"""
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump([self._serialize_project(p) for p in projects], f, indent=2)
+            start = time.perf_counter()
+            raw = self._encode(projects)
+            encode_time = time.perf_counter() - start
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+            fsync_directory(self.file_path.parent)
+            profiler.record_io("ProjectStore.write", bytes_written=len(raw), parse_time=encode_time)
+            self._set_base(projects, self._file_stamp())
         except Exception as e:
-            logging.error(f"Error saving projects: {str(e)}")
-            raise DatabaseError(f"Failed to save projects: {str(e)}")
\ No newline at end of file
+            logging.error("Error saving projects: %s", e)
+            raise DatabaseError(f"Failed to save projects: {str(e)}")
+
+def _iso(value: datetime) -> str:
+    """Stored form of a datetime: naive local time, as every storage format keeps it"""
+    return naive_local(value).isoformat()
+
+def _parse_datetime(text: str) -> datetime:
+    """Parse a stored datetime; offsets in files written before normalisation are converted"""
+    return naive_local(datetime.fromisoformat(text))
+
+def _storage_format(path: Path) -> str:
+    """Storage format implied by a projects path's suffix"""
+    if path.suffix == ".bin":
+        return "binary"
+    if not path.suffix:
+        return "sharded"
+    return "json"
+
+def convert_projects_file(source, target) -> int:
+    """
+    Convert projects between the JSON, binary and sharded formats; each
+    format is chosen by the path suffix (.json, .bin, or none for a shard
+    directory)
+
+    Args:
+        source: Existing projects file
+        target: File to write, replaced atomically
+
+    Returns:
+        int: Number of projects converted
+
+    Raises:
+        DatabaseError: If either file cannot be processed
+    """
+    reader = ProjectStore(write_behind=False, file_path=Path(source), memory_map=False)
+    writer = ProjectStore(write_behind=False, file_path=Path(target), memory_map=False)
+    return writer.import_projects(reader._read_file())
+
+def _apply_changes(projects: Dict[str, Project], changes: Dict[str, Optional[Project]]) -> Dict[str, Project]:
+    """Return a copy of projects with upserts applied and None entries removed"""
+    result = dict(projects)
+    for project_id, project in changes.items():
+        if project is None:
+            result.pop(project_id, None)
+        else:
+            result[project_id] = project
+    return result
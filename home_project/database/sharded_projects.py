@@ -0,0 +1,268 @@
+# database/sharded_projects.py
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from core.exceptions import DatabaseError
+from models.project import Project
+from utils.file_utils import atomic_write, fsync_directory
+
+MANIFEST_NAME = "manifest.json"
+LAYOUT_VERSION = 2
+SWAP_RETRIES = 3  # Reads retried when another writer swaps the data directory away mid-read
+
+def _write_synced(path: Path, raw: bytes) -> None:
+    with open(path, 'wb') as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+
+class ShardedProjects:
+    """
+    Directory of one JSON file per project, bucketed by a prefix of the
+    id's hash, inside a data directory named by the manifest:
+
+        projects/manifest.json
+        projects/data-<hex>/3f/<quoted id>.json
+
+    Writing a project replaces just its file, so write cost does not grow
+    with the portfolio. The manifest records the layout, the active data
+    directory and a generation token that changes on every write, which is
+    how readers notice that the data changed. Replacing the whole dataset
+    fills a new data directory and then switches the manifest to it, so the
+    root and a complete dataset exist at every moment. Layout 1 kept the
+    buckets directly under the root; it is still read, as data ".".
+
+    Writers in different processes do not coordinate beyond atomic
+    renames: each change lands intact, but a process may keep serving its
+    cached copy until the next manifest change it has not made itself.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        serialize: Callable[[Project], Dict],
+        deserialize: Callable[[Dict], Project],
+        bucket_chars: int = 2,
+        workers: int = 8
+    ):
+        self.root = Path(root)
+        self._serialize = serialize
+        self._deserialize = deserialize
+        self.bucket_chars = bucket_chars
+        self.workers = workers
+        self._layout_checked = False
+        self._data_name = "."
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    @property
+    def data_dir(self) -> Path:
+        """Directory holding the buckets, as last read from the manifest"""
+        if not self._layout_checked and self.manifest_path.exists():
+            self.check_layout()
+        return self.root / self._data_name
+
+    def exists(self) -> bool:
+        """Whether the directory holds data, checking its layout the first time"""
+        if not self.manifest_path.exists():
+            return False
+        if not self._layout_checked:
+            self.check_layout()
+        return True
+
+    def stamp(self) -> Optional[Tuple[int, str]]:
+        """
+        (mtime_ns, generation) of the manifest, or None if there is no data
+        yet. The generation is read rather than trusting mtime alone, which
+        is too coarse to tell back-to-back writes apart.
+        """
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                manifest = json.loads(f.read())
+                return os.fstat(f.fileno()).st_mtime_ns, manifest["generation"]
+        except FileNotFoundError:
+            return None
+
+    def shard_path(self, project_id: str, root: Optional[Path] = None) -> Path:
+        bucket = hashlib.blake2b(project_id.encode("utf-8"), digest_size=8).hexdigest()[:self.bucket_chars]
+        return (root or self.data_dir) / bucket / f"{quote(project_id, safe='')}.json"
+
+    def __contains__(self, project_id: str) -> bool:
+        if self.shard_path(project_id).exists():
+            return True
+        return self._reload() and self.shard_path(project_id).exists()
+
+    def get(self, project_id: str) -> Optional[Project]:
+        """Read one project's file, or return None if it is not stored"""
+        for _ in range(SWAP_RETRIES):
+            try:
+                raw = self.shard_path(project_id).read_bytes()
+            except FileNotFoundError:
+                if self._reload():
+                    continue
+                return None
+            return self._deserialize(json.loads(raw))
+        return None
+
+    def load_all(self) -> Tuple[List[Project], int]:
+        """
+        Parse every shard, one bucket per thread-pool task
+
+        Returns:
+            Tuple[List[Project], int]: Projects ordered by creation time, and bytes read
+
+        Raises:
+            DatabaseError: If the data directory kept being replaced while it was read
+        """
+        for _ in range(SWAP_RETRIES):
+            try:
+                results = self._load_buckets(self.data_dir)
+            except FileNotFoundError:
+                if self._reload():
+                    continue
+                raise
+            projects = [project for bucket, _ in results for project in bucket]
+            projects.sort(key=lambda p: (p.created_at, p.id))
+            return projects, sum(size for _, size in results)
+        raise DatabaseError(f"Project shards in {self.root} kept changing while they were read")
+
+    def _load_buckets(self, data: Path) -> List[Tuple[List[Project], int]]:
+        # Only bucket names: a layout 1 root also holds the data directories of later layouts
+        buckets = [
+            entry.path for entry in os.scandir(data)
+            if entry.is_dir() and len(entry.name) == self.bucket_chars and not entry.name.startswith(".")
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard-load") as pool:
+            return list(pool.map(self._load_bucket, buckets))
+
+    def _load_bucket(self, path: str) -> Tuple[List[Project], int]:
+        projects = []
+        size = 0
+        for entry in os.scandir(path):
+            # Skip in-flight temporary files (".name.tmp")
+            if entry.name.startswith(".") or not entry.name.endswith(".json"):
+                continue
+            with open(entry.path, 'rb') as f:
+                raw = f.read()
+            size += len(raw)
+            projects.append(self._deserialize(json.loads(raw)))
+        return projects, size
+
+    def _reload(self) -> bool:
+        """Re-read the manifest; whether it now names another data directory"""
+        previous = self._data_name
+        try:
+            self.check_layout()
+        except FileNotFoundError:
+            return False
+        return self._data_name != previous
+
+    def apply(self, changes: Dict[str, Optional[Project]]) -> int:
+        """
+        Write or delete one file per changed project, then bump the manifest
+
+        Args:
+            changes (Dict[str, Optional[Project]]): Upserts by id; None deletes
+
+        Returns:
+            int: Bytes written
+        """
+        if not self.exists():
+            self.replace_all(())
+        else:
+            self._reload()
+        written = 0
+        for project_id, project in changes.items():
+            path = self.shard_path(project_id)
+            if project is None:
+                try:
+                    path.unlink()
+                    fsync_directory(path.parent)
+                except FileNotFoundError:
+                    pass
+                continue
+            raw = json.dumps(self._serialize(project)).encode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, raw)
+            written += len(raw)
+        self._write_manifest(self._data_name)
+        return written
+
+    def replace_all(self, projects: Iterable[Project]) -> int:
+        """
+        Replace the whole dataset: shards are streamed into a new data
+        directory, so memory use stays flat, and the manifest is then
+        switched to it. Readers see the old dataset or the new one, never
+        a missing or partial one.
+
+        Args:
+            projects (Iterable[Project]): Projects to store, e.g. a generator
+
+        Returns:
+            int: Number of projects written
+        """
+        name = f"data-{uuid.uuid4().hex}"
+        staging = self.root / f".{name}.tmp"
+        count = 0
+        try:
+            staging.mkdir(parents=True)
+            buckets = set()
+            for project in projects:
+                path = self.shard_path(project.id, staging)
+                if path.parent not in buckets:
+                    path.parent.mkdir(exist_ok=True)
+                    buckets.add(path.parent)
+                _write_synced(path, json.dumps(self._serialize(project)).encode("utf-8"))
+                count += 1
+            for bucket in buckets:
+                fsync_directory(bucket)
+            fsync_directory(staging)
+            os.replace(staging, self.root / name)
+            fsync_directory(self.root)
+            self._write_manifest(name)
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise DatabaseError(f"Failed to write project shards: {str(e)}")
+        self._data_name = name
+        self._layout_checked = True
+        self._remove_retired()
+        return count
+
+    def _remove_retired(self) -> None:
+        """Delete data directories, and layout 1 buckets, the manifest no longer names"""
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and not entry.name.startswith(".") and entry.name != self._data_name:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _write_manifest(self, data_name: str) -> None:
+        manifest = {
+            "layout_version": LAYOUT_VERSION,
+            "bucket_chars": self.bucket_chars,
+            "shard_format": "json",
+            "data": data_name,
+            "generation": uuid.uuid4().hex,
+        }
+        atomic_write(self.manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    def check_layout(self) -> None:
+        """
+        Adopt the bucket width and data directory recorded in the manifest
+
+        Raises:
+            DatabaseError: If the manifest describes an unsupported layout
+        """
+        manifest = json.loads(self.manifest_path.read_text())
+        if manifest.get("layout_version") not in (1, LAYOUT_VERSION) or manifest.get("shard_format") != "json":
+            raise DatabaseError(f"Unsupported project shard layout in {self.root}")
+        self.bucket_chars = manifest["bucket_chars"]
+        self._data_name = manifest.get("data", ".")
+        self._layout_checked = True
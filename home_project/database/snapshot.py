@@ -0,0 +1,52 @@
+# database/snapshot.py
+from typing import Dict, Iterable, Optional, Tuple
+from models.project import Project, ProjectStatus
+
+class ProjectSnapshot:
+    """
+    Consistent, read-only view of every project at one point in time.
+
+    The collection cannot be changed once built; the Project objects it
+    holds are shared with other readers and must not be mutated.
+    """
+
+    __slots__ = ("_projects", "_by_id", "_summary")
+
+    def __init__(self, projects: Iterable[Project]):
+        self._projects: Tuple[Project, ...] = tuple(projects)
+        self._by_id: Dict[str, Project] = {p.id: p for p in self._projects}
+        self._summary: Optional[Dict[str, float]] = None
+
+    @property
+    def projects(self) -> Tuple[Project, ...]:
+        return self._projects
+
+    def get(self, project_id: str) -> Optional[Project]:
+        """Look up a project by ID"""
+        return self._by_id.get(project_id)
+
+    def __len__(self) -> int:
+        return len(self._projects)
+
+    @property
+    def summary(self) -> Dict[str, float]:
+        """Portfolio-wide aggregates, computed on first access"""
+        if self._summary is None:
+            self._summary = {
+                "total_projects": len(self._projects),
+                "active_projects": sum(1 for p in self._projects if p.status == ProjectStatus.IN_PROGRESS),
+                "total_budget": sum(p.budget for p in self._projects),
+                "total_spent": sum(p.spent for p in self._projects),
+            }
+        return dict(self._summary)
+
+class ReadScope:
+    """
+    Unit of work for one rerun: the first read takes a snapshot, and every
+    later read in the same scope is served from it.
+    """
+
+    __slots__ = ("snapshot",)
+
+    def __init__(self):
+        self.snapshot: Optional[ProjectSnapshot] = None
@@ -0,0 +1,397 @@
+# database/spatial_index.py
+import heapq
+import math
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from config.settings import settings
+from database.project_store import ProjectChanges, ProjectStore
+from models.project import Project, ProjectStatus
+from utils.profiler import profiler
+
+EARTH_RADIUS_KM = 6371.0088
+
+class Location(NamedTuple):
+    """What the map needs to know about a located project"""
+    project_id: str
+    name: str
+    latitude: float
+    longitude: float
+    status: ProjectStatus
+    budget: float
+
+class Cluster(NamedTuple):
+    """Projects merged into one marker; the position is their mean"""
+    latitude: float
+    longitude: float
+    count: int
+    budget: float
+
+class Viewport(NamedTuple):
+    """Contents of a map view: individual locations, or clusters when there are too many"""
+    locations: List[Location]
+    clusters: List[Cluster]
+    total: int  # Projects in view
+
+class _Cell:
+    """Locations in one grid cell, with running sums for clustering"""
+    __slots__ = ("locations", "latitude_sum", "longitude_sum", "budget_sum")
+
+    def __init__(self):
+        self.locations: Dict[str, Location] = {}
+        self.latitude_sum = 0.0
+        self.longitude_sum = 0.0
+        self.budget_sum = 0.0
+
+    def add(self, location: Location, sign: float) -> None:
+        self.latitude_sum += sign * location.latitude
+        self.longitude_sum += sign * location.longitude
+        self.budget_sum += sign * location.budget
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in degrees"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def _longitude_gap_km(latitude: float, degrees: float) -> float:
+    """
+    Lower bound on the distance from a point to anything at least the given
+    longitude difference away: its distance to that meridian's great circle
+    """
+    degrees = min(degrees, 90.0)
+    return EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(math.radians(latitude)) * math.sin(math.radians(degrees))))
+
+def _normalize_longitude(longitude: float) -> float:
+    return (longitude + 180.0) % 360.0 - 180.0
+
+def _width(west: float, east: float) -> float:
+    """Degrees of longitude from west eastward to east; a box with west > east crosses the antimeridian"""
+    return east - west if east >= west else east - west + 360.0
+
+def _bin_points(locations: List[Location], degrees: float, west: float) -> Dict[Tuple[int, int], List[float]]:
+    """[count, latitude sum, longitude sum, budget sum] per square bin of the given size"""
+    bins: Dict[Tuple[int, int], List[float]] = {}
+    for location in locations:
+        key = (math.floor(location.latitude / degrees), math.floor((location.longitude - west) % 360.0 / degrees))
+        totals = bins.setdefault(key, [0, 0.0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += location.latitude
+        totals[2] += location.longitude
+        totals[3] += location.budget
+    return bins
+
+class SpatialIndex:
+    """
+    Uniform grid over project locations for map viewports
+
+    Located projects are bucketed into square cells of SPATIAL_CELL_DEGREES.
+    A bounding-box query visits only the cells overlapping the box and
+    checks individual points in the cells along its edges. Nearest-neighbour
+    queries search rings of cells outward from the query point until no
+    unvisited cell can beat the k-th distance found, then switch to ranking
+    the remaining occupied cells by their distance bound when the grid is
+    sparse. Each cell keeps running sums, so at low zoom whole cells are
+    merged into clusters without visiting their points: the cost of a
+    clustered view depends on the number of occupied cells, not projects.
+    Views narrower than a few cells cluster the visible points directly.
+
+    The index follows the project store through its change listener, moving
+    or dropping only the changed projects, and is rebuilt from the projects
+    whenever the store's data stamp shows it missed a change.
+    """
+
+    def __init__(self, project_store: ProjectStore, cell_degrees: Optional[float] = None):
+        self.project_store = project_store
+        self.cell_degrees = cell_degrees or settings.SPATIAL_CELL_DEGREES
+        self._columns = math.ceil(360.0 / self.cell_degrees)
+        self._top_row = math.ceil(90.0 / self.cell_degrees) - 1  # holds latitude 90 too
+        self._lock = threading.RLock()
+        self._cells: Dict[Tuple[int, int], _Cell] = {}
+        self._keys: Dict[str, Tuple[int, int]] = {}  # project id -> cell
+        self._stamp: Optional[Tuple] = None
+        self._loaded = False
+        project_store.add_change_listener(self._on_change)
+
+    def _on_change(self, changes: ProjectChanges) -> None:
+        """Apply a persisted batch in place if the index was up to date before it"""
+        with self._lock:
+            if changes.previous is None or not self._loaded or self._stamp != changes.stamp_before:
+                self._loaded = False
+                return
+            for project_id, project in changes.current.items():
+                self._remove(project_id)
+                if project is not None:
+                    self._insert(project)
+            self._stamp = changes.stamp_after
+
+    def _refresh(self) -> None:
+        """Rebuild from the stored projects unless the index matches them"""
+        # Stamp first: a batch landing during the rebuild then forces another one
+        stamp = self.project_store.data_stamp()
+        with self._lock:
+            if self._loaded and self._stamp == stamp:
+                return
+        self.rebuild(self.project_store.get_all_projects(), stamp)
+
+    @profiler.profiled("SpatialIndex.rebuild")
+    def rebuild(self, projects: Iterable[Project], stamp: Optional[Tuple]) -> None:
+        """
+        Index every located project from scratch
+
+        Args:
+            projects (Iterable[Project]): Every stored project
+            stamp (Optional[Tuple]): Store data stamp the projects were read at
+        """
+        with self._lock:
+            self._cells = {}
+            self._keys = {}
+            for project in projects:
+                self._insert(project)
+            self._stamp = stamp
+            self._loaded = True
+
+    def _key(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        row = math.floor(latitude / self.cell_degrees)
+        if row > self._top_row:
+            row = self._top_row
+        return row, math.floor(((longitude + 180.0) % 360.0 - 180.0) / self.cell_degrees)
+
+    def _insert(self, project: Project) -> None:
+        if project.location is None:
+            return
+        location = Location(
+            project.id, project.name, project.latitude, project.longitude, project.status, project.budget
+        )
+        key = self._key(project.latitude, project.longitude)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = _Cell()
+        cell.locations[project.id] = location
+        cell.add(location, 1.0)
+        self._keys[project.id] = key
+
+    def _remove(self, project_id: str) -> None:
+        key = self._keys.pop(project_id, None)
+        if key is None:
+            return
+        cell = self._cells[key]
+        cell.add(cell.locations.pop(project_id), -1.0)
+        if not cell.locations:
+            del self._cells[key]
+
+    def __len__(self) -> int:
+        self._refresh()
+        with self._lock:
+            return len(self._keys)
+
+    def bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """(south, west, north, east) of the occupied cells, or None if no project has a location"""
+        self._refresh()
+        with self._lock:
+            if not self._cells:
+                return None
+            rows = [row for row, _ in self._cells]
+            columns = [column for _, column in self._cells]
+        return (
+            min(rows) * self.cell_degrees, min(columns) * self.cell_degrees,
+            (max(rows) + 1) * self.cell_degrees, (max(columns) + 1) * self.cell_degrees
+        )
+
+    def _column_ranges(self, west: float, width: float) -> List[Tuple[int, int]]:
+        """Inclusive column ranges covering width degrees east of west, split at the antimeridian"""
+        first_column, last_column = -(self._columns // 2), self._columns - self._columns // 2 - 1
+        if width >= 360.0:
+            return [(first_column, last_column)]
+        west = _normalize_longitude(west)
+        east = west + width
+        if east < 180.0:
+            return [(self._key(0.0, west)[1], self._key(0.0, east)[1])]
+        return [(self._key(0.0, west)[1], last_column), (first_column, self._key(0.0, east - 360.0)[1])]
+
+    def _overlapping(
+        self, south: float, west: float, north: float, east: float
+    ) -> Iterator[Tuple[Tuple[int, int], _Cell, bool]]:
+        """
+        Occupied cells overlapping a box, and whether each lies wholly inside
+        it; call with the lock held
+        """
+        first_row, last_row = self._key(south, 0.0)[0], self._key(north, 0.0)[0]
+        column_ranges = self._column_ranges(west, _width(west, east))
+        span = (last_row - first_row + 1) * sum(last - first + 1 for first, last in column_ranges)
+        if span <= len(self._cells):
+            keys = (
+                (row, column)
+                for row in range(first_row, last_row + 1)
+                for first, last in column_ranges
+                for column in range(first, last + 1)
+            )
+            candidates = ((key, self._cells.get(key)) for key in keys)
+        else:
+            candidates = iter(self._cells.items())
+        for (row, column), cell in candidates:
+            if cell is None or not first_row <= row <= last_row:
+                continue
+            for first, last in column_ranges:
+                if first <= column <= last:
+                    inside = first_row < row < last_row and first < column < last
+                    yield (row, column), cell, inside
+                    break
+
+    @profiler.profiled("SpatialIndex.within")
+    def within(self, south: float, west: float, north: float, east: float) -> List[Location]:
+        """
+        Located projects inside a bounding box
+
+        Args:
+            south (float): Minimum latitude
+            west (float): Western longitude; greater than east when the box crosses the antimeridian
+            north (float): Maximum latitude
+            east (float): Eastern longitude
+
+        Returns:
+            List[Location]: Projects in the box, in no particular order
+        """
+        self._refresh()
+        with self._lock:
+            return self._collect(list(self._overlapping(south, west, north, east)), south, west, north, east)
+
+    @staticmethod
+    def _collect(
+        overlapping: List[Tuple[Tuple[int, int], _Cell, bool]], south: float, west: float, north: float, east: float
+    ) -> List[Location]:
+        """Locations in the box from its overlapping cells, checking points in edge cells"""
+        width = _width(west, east)
+        result = []
+        for _, cell, inside in overlapping:
+            if inside:
+                result.extend(cell.locations.values())
+                continue
+            for location in cell.locations.values():
+                if south <= location.latitude <= north and (location.longitude - west) % 360.0 <= width:
+                    result.append(location)
+        return result
+
+    @profiler.profiled("SpatialIndex.viewport")
+    def viewport(
+        self, south: float, west: float, north: float, east: float, max_locations: Optional[int] = None
+    ) -> Viewport:
+        """
+        What to draw for a map view
+
+        Args:
+            south, west, north, east (float): Visible bounds, as for within()
+            max_locations (Optional[int]): Most individual markers before
+                clustering; defaults to MAP_MAX_LOCATIONS
+
+        Returns:
+            Viewport: Individual locations when few enough are in view,
+            otherwise clusters about a MAP_CLUSTER_BINS-th of its width
+        """
+        self._refresh()
+        max_locations = max_locations or settings.MAP_MAX_LOCATIONS
+        with self._lock:
+            overlapping = list(self._overlapping(south, west, north, east))
+            if sum(len(cell.locations) for _, cell, _ in overlapping) <= max_locations:
+                locations = self._collect(overlapping, south, west, north, east)
+                return Viewport(locations, [], len(locations))
+
+            width = min(_width(west, east), 360.0)
+            bin_degrees = width / settings.MAP_CLUSTER_BINS
+            if bin_degrees < self.cell_degrees:
+                # Zoomed in past the grid: bin the visible points themselves
+                locations = self._collect(overlapping, south, west, north, east)
+                if len(locations) <= max_locations:
+                    return Viewport(locations, [], len(locations))
+                bins = _bin_points(locations, bin_degrees, west)
+            else:
+                # Merge whole cells into coarser bins; edge cells count in full
+                span = max(1, math.floor(bin_degrees / self.cell_degrees))
+                bins = {}
+                for (row, column), cell, _ in overlapping:
+                    totals = bins.setdefault((row // span, column // span), [0, 0.0, 0.0, 0.0])
+                    totals[0] += len(cell.locations)
+                    totals[1] += cell.latitude_sum
+                    totals[2] += cell.longitude_sum
+                    totals[3] += cell.budget_sum
+        clusters = [
+            Cluster(latitude / count, longitude / count, count, budget)
+            for count, latitude, longitude, budget in bins.values()
+        ]
+        return Viewport([], clusters, sum(cluster.count for cluster in clusters))
+
+    @profiler.profiled("SpatialIndex.nearest")
+    def nearest(self, latitude: float, longitude: float, k: int) -> List[Tuple[Location, float]]:
+        """
+        The k located projects closest to a point
+
+        Args:
+            latitude (float): Query latitude
+            longitude (float): Query longitude
+            k (int): Number of projects
+
+        Returns:
+            List[Tuple[Location, float]]: Projects with their great-circle
+            distance in km, closest first
+        """
+        self._refresh()
+        if k <= 0:
+            return []
+        best: List[Tuple[float, str, Location]] = []  # max-heap on distance, as negatives
+
+        def consider(cell: _Cell) -> None:
+            for location in cell.locations.values():
+                distance = haversine_km(latitude, longitude, location.latitude, location.longitude)
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, location.project_id, location))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, location.project_id, location))
+
+        with self._lock:
+            row, column = self._key(latitude, longitude)
+            visited = set()
+            ring = 0
+            # Rings pay off while the cells they cover are few next to the occupied ones
+            while (2 * ring + 1) ** 2 <= len(self._cells):
+                for key in self._ring(row, column, ring):
+                    if key not in visited:
+                        visited.add(key)
+                        cell = self._cells.get(key)
+                        if cell is not None:
+                            consider(cell)
+                if len(best) == k and -best[0][0] <= _longitude_gap_km(latitude, ring * self.cell_degrees):
+                    break
+                ring += 1
+            else:
+                remaining = sorted(
+                    (self._cell_bound_km(latitude, longitude, key), key)
+                    for key in self._cells if key not in visited
+                )
+                for bound, key in remaining:
+                    if len(best) == k and -best[0][0] <= bound:
+                        break
+                    consider(self._cells[key])
+        return [(location, -distance) for distance, _, location in sorted(best, reverse=True)]
+
+    def _ring(self, row: int, column: int, ring: int) -> Iterator[Tuple[int, int]]:
+        """Cells at Chebyshev distance ring, wrapping around the antimeridian"""
+        half = self._columns // 2
+        for d_row in range(-ring, ring + 1):
+            step = 1 if abs(d_row) == ring else 2 * ring or 1
+            for d_column in range(-ring, ring + 1, step):
+                yield row + d_row, (column + d_column + half) % self._columns - half
+
+    def _cell_bound_km(self, latitude: float, longitude: float, key: Tuple[int, int]) -> float:
+        """
+        Lower bound on the distance from a point to anything in a cell: the
+        distance to its center less the distance from the center to its
+        farthest corner (triangle inequality)
+        """
+        row, column = key
+        center_latitude = (row + 0.5) * self.cell_degrees
+        center_longitude = (column + 0.5) * self.cell_degrees
+        # The corner nearer the equator is the farthest from the center
+        corner_latitude = row * self.cell_degrees if center_latitude >= 0 else (row + 1) * self.cell_degrees
+        radius = haversine_km(center_latitude, center_longitude, corner_latitude, column * self.cell_degrees)
+        return max(0.0, haversine_km(latitude, longitude, center_latitude, center_longitude) - radius)
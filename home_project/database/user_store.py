@@ -1,9 +1,13 @@
 # database/user_store.py
 import json
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
 from dataclasses import dataclass, asdict
 from config.settings import settings
 from core.exceptions import DatabaseError
+from utils.bloom_filter import BloomFilter
+from utils.profiler import profiler
 import logging
 
 @dataclass
@@ -12,13 +16,14 @@ class User:
     username: str
     name: str
     password: str  # In a real app, this would be hashed
+    role: str = "user"
 
     def to_dict(self) -> Dict:
         """Convert user object to dictionary"""
         try:
             return asdict(self)
         except Exception as e:
-            logging.error(f"Error converting user to dict: {str(e)}")
+            logging.error("Error converting user to dict: %s", e)
             raise DatabaseError("Failed to convert user data")
 
 class UserStore:
@@ -26,13 +31,16 @@ class UserStore:
     def __init__(self):
         self.file_path = settings.USERS_FILE
         self._ensure_database_directory()
+        self._filter_lock = threading.Lock()
+        self._username_filter: Optional[BloomFilter] = None
+        self._filter_stamp: Optional[Tuple[int, int]] = None
 
     def _ensure_database_directory(self) -> None:
         """Ensure database directory exists"""
         try:
             settings.DATABASE_DIR.mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            logging.error(f"Failed to create database directory: {str(e)}")
+            logging.error("Failed to create database directory: %s", e)
             raise DatabaseError("Could not initialize database directory")
 
     def _read_users(self) -> Dict:
@@ -48,16 +56,19 @@ class UserStore:
         try:
             if not self.file_path.exists():
                 return {}
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if not isinstance(data, dict):
-                    raise DatabaseError("Invalid data format in users file")
-                return data
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            start = time.perf_counter()
+            data = json.loads(raw)
+            profiler.record_io("UserStore.read", bytes_read=len(raw), parse_time=time.perf_counter() - start)
+            if not isinstance(data, dict):
+                raise DatabaseError("Invalid data format in users file")
+            return data
         except json.JSONDecodeError as e:
-            logging.error(f"JSON decode error reading users file: {str(e)}")
+            logging.error("JSON decode error reading users file: %s", e)
             raise DatabaseError("Invalid JSON in users file")
         except Exception as e:
-            logging.error(f"Error reading users file: {str(e)}")
+            logging.error("Error reading users file: %s", e)
             raise DatabaseError(f"Failed to read users data: {str(e)}")
 
     def _write_users(self, users: Dict) -> None:
@@ -71,15 +82,69 @@ class UserStore:
             DatabaseError: If file operations fail
         """
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(users, f, indent=2, ensure_ascii=False)
+            raw = json.dumps(users, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(self.file_path, 'wb') as f:
+                f.write(raw)
+            profiler.record_io("UserStore.write", bytes_written=len(raw))
         except (IOError, OSError) as e:
-            logging.error(f"IO error writing users file: {str(e)}")
+            logging.error("IO error writing users file: %s", e)
             raise DatabaseError("Failed to write to users file")
         except Exception as e:
-            logging.error(f"Unexpected error writing users file: {str(e)}")
+            logging.error("Unexpected error writing users file: %s", e)
             raise DatabaseError(f"Failed to save users data: {str(e)}")
 
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the users file, or None if it is missing"""
+        try:
+            stat = self.file_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _get_username_filter(self) -> BloomFilter:
+        """
+        Return the in-memory username filter, rebuilding it from storage when
+        the users file was changed by another writer or the filter is full
+
+        Returns:
+            BloomFilter: Filter over all stored usernames
+        """
+        stamp = self._file_stamp()
+        with self._filter_lock:
+            bloom = self._username_filter
+            if bloom is not None and stamp == self._filter_stamp and not bloom.is_saturated:
+                return bloom
+
+        users = self._read_users()
+        capacity = max(settings.USERNAME_FILTER_MIN_CAPACITY, 2 * len(users))
+        bloom = BloomFilter.from_items(users.keys(), capacity, settings.USERNAME_FILTER_ERROR_RATE)
+        with self._filter_lock:
+            self._username_filter = bloom
+            self._filter_stamp = stamp
+        return bloom
+
+    @profiler.profiled("UserStore.username_exists")
+    def username_exists(self, username: str) -> bool:
+        """
+        Check whether a username is taken, answering from the in-memory
+        filter and reading storage only on a possible hit
+
+        Args:
+            username: Username to look up
+
+        Returns:
+            bool: True if the username is already registered
+
+        Raises:
+            DatabaseError: If database operations fail
+        """
+        if not username:
+            return False
+        if username not in self._get_username_filter():
+            return False
+        return self.get_user(username) is not None
+
+    @profiler.profiled("UserStore.get_user")
     def get_user(self, username: str) -> Optional[User]:
         """
         Get user by username
@@ -103,16 +168,18 @@ class UserStore:
                 return User(
                     username=username,
                     name=user_data['name'],
-                    password=user_data['password']
+                    password=user_data['password'],
+                    role=user_data.get('role', 'user')
                 )
             return None
         except KeyError as e:
-            logging.error(f"Missing required user field: {str(e)}")
+            logging.error("Missing required user field: %s", e)
             raise DatabaseError("Invalid user data format")
         except Exception as e:
-            logging.error(f"Error retrieving user: {str(e)}")
+            logging.error("Error retrieving user: %s", e)
             raise DatabaseError(f"Failed to retrieve user: {str(e)}")
 
+    @profiler.profiled("UserStore.create_user")
     def create_user(self, user: User) -> bool:
         """
         Create new user
@@ -136,8 +203,47 @@ class UserStore:
                 
             users[user.username] = user.to_dict()
             self._write_users(users)
+
+            with self._filter_lock:
+                if self._username_filter is not None:
+                    self._username_filter.add(user.username)
+                    self._filter_stamp = self._file_stamp()
             return True
             
         except Exception as e:
-            logging.error(f"Error creating user: {str(e)}")
+            logging.error("Error creating user: %s", e)
             raise DatabaseError(f"Failed to create user: {str(e)}")
+
+    def import_users(self, users: Iterable[User]) -> int:
+        """
+        Replace all stored users, streaming them to disk one at a time so
+        the input is never held in memory as a whole
+
+        Args:
+            users: Users to store, e.g. a generator
+
+        Returns:
+            int: Number of users written
+
+        Raises:
+            DatabaseError: If the file cannot be written
+        """
+        tmp_path = self.file_path.with_suffix(".json.tmp")
+        count = 0
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write("{")
+                for user in users:
+                    f.write(",\n" if count else "\n")
+                    f.write(f"  {json.dumps(user.username)}: {json.dumps(user.to_dict(), ensure_ascii=False)}")
+                    count += 1
+                f.write("\n}")
+            tmp_path.replace(self.file_path)
+
+            with self._filter_lock:
+                self._username_filter = None
+                self._filter_stamp = None
+            return count
+        except Exception as e:
+            logging.error("Error importing users: %s", e)
+            raise DatabaseError(f"Failed to import users: {str(e)}")
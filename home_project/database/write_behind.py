@@ -0,0 +1,152 @@
+# database/write_behind.py
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.exceptions import DatabaseError
+
+class WriteBehindQueue:
+    """
+    Coalescing write-behind buffer drained by a background thread.
+
+    Changes are keyed by record ID; a later change to the same record
+    replaces the earlier one, so a burst of edits costs a single write.
+    A value of None marks a deletion. The flush callback receives every
+    pending change as one batch and must persist it durably.
+
+    Attributes:
+        flush_batch (Callable[[Dict[str, Optional[Any]]], None]): Persists a batch
+        interval (float): Seconds to wait for more changes before flushing
+    """
+
+    def __init__(self, flush_batch: Callable[[Dict[str, Optional[Any]]], None], interval: float = 0.5):
+        self.flush_batch = flush_batch
+        self.interval = interval
+        self._pending: Dict[str, Optional[Any]] = {}
+        self._inflight: Dict[str, Optional[Any]] = {}
+        self._condition = threading.Condition()
+        self._enqueued = 0
+        self._flushed = 0
+        self._flush_requested = False
+        self._closed = False
+        self._failures = 0
+        self._last_error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def put(self, key: str, value: Optional[Any]) -> None:
+        """
+        Queue a change; returns immediately
+
+        Args:
+            key (str): Record ID
+            value (Optional[Any]): New record, or None to delete it
+        """
+        with self._condition:
+            if self._closed:
+                raise DatabaseError("Write-behind queue is closed")
+            self._pending[key] = value
+            self._enqueued += 1
+            self._condition.notify_all()
+
+    def pending(self) -> Dict[str, Optional[Any]]:
+        """All changes not yet durable, including the batch being written"""
+        with self._condition:
+            changes = dict(self._inflight)
+            changes.update(self._pending)
+            return changes
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """
+        Return (True, value) if a change to the record is still pending,
+        otherwise (False, None)
+        """
+        with self._condition:
+            if key in self._pending:
+                return True, self._pending[key]
+            if key in self._inflight:
+                return True, self._inflight[key]
+            return False, None
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Durability barrier: block until every change queued before the call
+        has been written. A batch failing while it waits fails the call; an
+        earlier failure only means the batch is being retried.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait
+
+        Raises:
+            DatabaseError: If the write failed or the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            target = self._enqueued
+            failures = self._failures
+            if self._flushed >= target:
+                # Nothing to wait for; a request left set would cut the next batch's window short
+                return
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._flushed < target:
+                if self._failures != failures:
+                    raise DatabaseError(f"Failed to flush pending writes: {str(self._last_error)}")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DatabaseError("Timed out waiting for pending writes")
+                self._condition.wait(remaining)
+
+    def close(self) -> None:
+        """Flush outstanding changes and stop the background thread"""
+        with self._condition:
+            if self._closed:
+                return
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed and not self._pending:
+                    return
+                # Give further edits a moment to coalesce into this batch
+                deadline = time.monotonic() + self.interval
+                while not self._flush_requested and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                self._inflight = self._pending
+                self._pending = {}
+                self._flush_requested = False
+                batch_end = self._enqueued
+
+            try:
+                self.flush_batch(dict(self._inflight))
+            except Exception as e:
+                logging.error("Write-behind flush failed: %s", e)
+                with self._condition:
+                    # Keep the failed batch, letting newer changes win
+                    self._inflight.update(self._pending)
+                    self._pending = self._inflight
+                    self._inflight = {}
+                    self._failures += 1
+                    self._last_error = e
+                    self._condition.notify_all()
+                time.sleep(self.interval)
+                continue
+
+            with self._condition:
+                self._inflight = {}
+                self._flushed = batch_end
+                self._last_error = None
+                self._condition.notify_all()
@@ -0,0 +1,30 @@
+# models/company.py
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+class CompanyType(Enum):
+    SPV = "SPV"
+    COUNTERPARTY = "Counterparty"
+    LENDER = "Lender"
+    CONTRACTOR = "Contractor"
+    TENANT = "Tenant"
+    OTHER = "Other"
+
+@dataclass
+class Company:
+    """A legal entity involved in one or more projects"""
+    id: str
+    name: str
+    type: CompanyType = CompanyType.OTHER
+    jurisdiction: Optional[str] = None
+    registration_number: Optional[str] = None
+    project_ids: List[str] = None  # Linked projects
+    created_at: datetime = None
+    updated_at: datetime = None
+
+    def __post_init__(self):
+        self.project_ids = self.project_ids or []
+        self.created_at = self.created_at or datetime.now()
+        self.updated_at = self.updated_at or datetime.now()
@@ -0,0 +1,27 @@
+# models/document.py
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+class DocumentCategory(Enum):
+    LEASE = "Lease"
+    VALUATION = "Valuation"
+    CONTRACT = "Contract"
+    OTHER = "Other"
+
+@dataclass
+class Document:
+    """A file attached to a project; the content lives in the blob store under digest"""
+    id: str
+    project_id: str
+    name: str
+    digest: str  # SHA-256 of the content, hex
+    size: int
+    content_type: Optional[str] = None
+    category: DocumentCategory = DocumentCategory.OTHER
+    uploaded_by: Optional[str] = None
+    uploaded_at: datetime = None
+
+    def __post_init__(self):
+        self.uploaded_at = self.uploaded_at or datetime.now()
@@ -0,0 +1,51 @@
+# models/investment.py
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from enum import Enum
+
+class CashFlowType(Enum):
+    CONTRIBUTION = "Contribution"
+    DISTRIBUTION = "Distribution"
+
+@dataclass
+class CashFlow:
+    """A dated movement of cash; amounts are positive, the type gives the direction"""
+    date: datetime
+    amount: float
+    type: CashFlowType
+    note: Optional[str] = None
+
+    @property
+    def signed_amount(self) -> float:
+        """Amount from the investor's point of view: contributions are negative"""
+        return -self.amount if self.type == CashFlowType.CONTRIBUTION else self.amount
+
+@dataclass
+class Investment:
+    id: str
+    name: str
+    project_id: Optional[str] = None
+    cash_flows: List[CashFlow] = None
+    exit_value: float = 0.0  # Sale proceeds, or current valuation while still held
+    exit_date: Optional[datetime] = None  # None: valued as of today
+    version: int = 1  # Bumped whenever cash flows or exit change
+    created_at: datetime = None
+    updated_at: datetime = None
+
+    def __post_init__(self):
+        self.cash_flows = self.cash_flows or []
+        self.created_at = self.created_at or datetime.now()
+        self.updated_at = self.updated_at or datetime.now()
+
+    @property
+    def contributed(self) -> float:
+        return sum(cf.amount for cf in self.cash_flows if cf.type == CashFlowType.CONTRIBUTION)
+
+    @property
+    def distributed(self) -> float:
+        return sum(cf.amount for cf in self.cash_flows if cf.type == CashFlowType.DISTRIBUTION)
+
+    @property
+    def is_realized(self) -> bool:
+        return self.exit_date is not None
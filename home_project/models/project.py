@@ -1,7 +1,7 @@
 # models/project.py
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from enum import Enum
 
 class ProjectStatus(Enum):
@@ -17,6 +17,15 @@ class ProjectPriority(Enum):
     HIGH = "High"
     CRITICAL = "Critical"
 
+def naive_local(value: datetime) -> datetime:
+    """
+    Project datetimes are naive local time, comparable with datetime.now();
+    a timezone-aware value is converted to local time and its offset dropped
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
 @dataclass
 class ProjectMilestone:
     title: str
@@ -41,6 +50,8 @@ class Project:
     team_members: List[str] = None
     created_at: datetime = None
     updated_at: datetime = None
+    latitude: Optional[float] = None  # WGS84 degrees; set together with longitude
+    longitude: Optional[float] = None
 
     def __post_init__(self):
         self.milestones = self.milestones or []
@@ -53,6 +64,13 @@ class Project:
         """Returns budget utilization percentage"""
         return (self.spent / self.budget * 100) if self.budget > 0 else 0
 
+    @property
+    def location(self) -> Optional[Tuple[float, float]]:
+        """(latitude, longitude), or None if the project has no location"""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
     @property
     def is_overdue(self) -> bool:
         """Check if project is overdue"""
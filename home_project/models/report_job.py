@@ -0,0 +1,35 @@
+# models/report_job.py
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+class JobStatus(Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    DONE = "Done"
+    FAILED = "Failed"
+
+@dataclass
+class ReportJob:
+    """A request for a rendered report; the output lives in the report cache under cache_key"""
+    id: str
+    format: str  # Key of report_rendering.FORMATS
+    params: Dict[str, Any] = field(default_factory=dict)
+    cache_key: Optional[str] = None  # Set once the data generation is known
+    generation: Optional[str] = None  # Project store data stamp the report reflects
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0  # 0..1
+    message: str = ""
+    rows: int = 0
+    error: Optional[str] = None
+    requested_by: Optional[str] = None
+    created_at: datetime = None
+    finished_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        self.created_at = self.created_at or datetime.now()
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
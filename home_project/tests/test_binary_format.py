@@ -0,0 +1,83 @@
+# tests/test_binary_format.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from database import binary_format
+from database.project_store import ProjectStore, convert_projects_file
+from models.project import Project, ProjectMilestone, ProjectPriority, ProjectStatus, naive_local
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+def _project(project_id: str, tz=None) -> Project:
+    return Project(
+        id=project_id,
+        name=f"Project {project_id}",
+        description="Round trip",
+        start_date=datetime(2024, 1, 15, 9, 30, tzinfo=tz),
+        end_date=datetime(2024, 12, 31, 18, 0, tzinfo=tz),
+        status=ProjectStatus.IN_PROGRESS,
+        priority=ProjectPriority.HIGH,
+        budget=250000.0,
+        spent=1200.5,
+        progress=12.5,
+        milestones=[
+            ProjectMilestone("Design", datetime(2024, 3, 1, tzinfo=tz), True, datetime(2024, 2, 27, 16, 45, tzinfo=tz)),
+            ProjectMilestone("Build", datetime(2024, 9, 1, tzinfo=tz), description="Main works"),
+        ],
+        team_members=["Alice", "Bob"],
+        created_at=datetime(2024, 1, 10, 8, 0, 0, 123456, tzinfo=tz),
+        updated_at=datetime(2024, 1, 11, 8, 0, tzinfo=tz),
+        latitude=48.85,
+        longitude=2.35,
+    )
+
+def _datetimes(project: Project):
+    values = [project.start_date, project.end_date, project.created_at, project.updated_at]
+    for milestone in project.milestones:
+        values += [milestone.due_date, milestone.completion_date]
+    return [value for value in values if value is not None]
+
+def _expected(project: Project) -> Project:
+    """The project as every format stores it: naive local datetimes"""
+    return Project(**{
+        **vars(project),
+        **{name: naive_local(getattr(project, name)) for name in ("start_date", "end_date", "created_at", "updated_at")},
+        "milestones": [
+            ProjectMilestone(
+                m.title, naive_local(m.due_date), m.completed,
+                naive_local(m.completion_date) if m.completion_date else None, m.description
+            )
+            for m in project.milestones
+        ],
+    })
+
+@pytest.mark.parametrize("tz", [None, timezone.utc, IST])
+def test_encode_decode_round_trip(tz):
+    project = _project("p1", tz)
+    decoded = binary_format.decode_projects(binary_format.encode_projects([project]))
+    assert decoded == [_expected(project)]
+    assert all(value.tzinfo is None for value in _datetimes(decoded[0]))
+
+@pytest.mark.parametrize("suffix", [".bin", ""])
+def test_json_conversion_is_lossless(tmp_path, suffix):
+    projects = [_project("naive"), _project("utc", timezone.utc), _project("ist", IST)]
+    source = tmp_path / "projects.json"
+    ProjectStore(write_behind=False, file_path=source, memory_map=False).import_projects(projects)
+
+    convert_projects_file(source, tmp_path / f"converted{suffix}")
+    convert_projects_file(tmp_path / f"converted{suffix}", tmp_path / "back.json")
+
+    stored = ProjectStore(write_behind=False, file_path=source, memory_map=False).get_all_projects()
+    back = ProjectStore(write_behind=False, file_path=tmp_path / "back.json", memory_map=False).get_all_projects()
+    assert sorted(back, key=lambda p: p.id) == sorted(stored, key=lambda p: p.id)
+    assert sorted(stored, key=lambda p: p.id) == sorted((_expected(p) for p in projects), key=lambda p: p.id)
+
+def test_memory_mapped_reads_are_naive(tmp_path):
+    path = tmp_path / "projects.bin"
+    ProjectStore(write_behind=False, file_path=path, memory_map=False).import_projects([_project("ist", IST)])
+    store = ProjectStore(write_behind=False, file_path=path, memory_map=True)
+    project = store.get_project("ist")
+    assert project == _expected(_project("ist", IST))
+    # Compares against datetime.now() without mixing naive and aware values
+    assert isinstance(project.is_overdue, bool)
@@ -0,0 +1,89 @@
+# tests/test_investment_metrics.py
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.investment_metrics import InvestmentMetricsEngine, npv, solve_irr
+from models.investment import CashFlow, CashFlowType, Investment
+
+def _random_flows(rows: int, width: int, seed: int = 0, mixed: bool = False):
+    """Contributions then distributions; mixed adds later contributions, which can give two roots"""
+    rng = np.random.default_rng(seed)
+    amounts = rng.uniform(10, 1000, (rows, width))
+    amounts[:, :2] *= -2
+    if mixed:
+        amounts[:, 2:] *= np.where(rng.random((rows, width - 2)) < 0.2, -1, 1)
+    years = np.cumsum(rng.uniform(0.1, 2.0, (rows, width)), axis=1)
+    years -= years[:, :1]
+    return amounts, years
+
+def test_irr_of_a_single_period():
+    rates = solve_irr(np.array([[-100.0, 110.0]]), np.array([[0.0, 1.0]]))
+    assert rates[0] == pytest.approx(0.1, abs=1e-10)
+
+def test_bisection_fallback_matches_newton():
+    amounts, years = _random_flows(200, 8)
+    newton = solve_irr(amounts, years)
+    # No Newton iterations: every row is solved by the fallback
+    bisected = solve_irr(amounts, years, max_iterations=0)
+
+    assert not np.isnan(newton).any()
+    np.testing.assert_allclose(bisected, newton, rtol=1e-7, atol=1e-9)
+
+def test_rates_are_roots_of_the_npv():
+    amounts, years = _random_flows(200, 8, seed=1, mixed=True)
+    for max_iterations in (50, 0):
+        rates = solve_irr(amounts, years, max_iterations=max_iterations)
+        solved = ~np.isnan(rates)
+        # Flows with a later contribution may have no bracketed root; the rest must solve
+        assert solved.sum() > 150
+        # The NPV changes sign within a hair of each rate; near -100% it is too steep to test for zero
+        rate, step = rates[solved], 1e-8 * (1 + np.abs(rates[solved]))
+        below = npv(rate - step, amounts[solved], years[solved])
+        above = npv(rate + step, amounts[solved], years[solved])
+        assert (np.sign(below) != np.sign(above)).all()
+
+def test_fallback_widens_the_bracket_for_high_rates():
+    amounts = np.array([[-1.0, 1000.0], [-100.0, 110.0]])
+    years = np.array([[0.0, 1.0], [0.0, 1.0]])
+    # Two Newton steps from 10% do not reach 99,900%, so that row falls back
+    rates = solve_irr(amounts, years, max_iterations=2)
+    assert rates[0] == pytest.approx(999.0, rel=1e-8)
+    assert rates[1] == pytest.approx(0.1, abs=1e-10)
+
+def test_irr_is_nan_without_a_sign_change():
+    amounts = np.array([[-100.0, -50.0, 0.0], [100.0, 50.0, 0.0], [0.0, 0.0, 0.0]])
+    years = np.array([[0.0, 1.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0]])
+    assert np.isnan(solve_irr(amounts, years)).all()
+    assert np.isnan(solve_irr(amounts, years, max_iterations=0)).all()
+
+def test_engine_metrics_and_cache():
+    start = datetime(2020, 1, 1)
+    investment = Investment(
+        id="inv-1",
+        name="Warehouse",
+        cash_flows=[
+            CashFlow(start, 1000.0, CashFlowType.CONTRIBUTION),
+            CashFlow(start + timedelta(days=365), 100.0, CashFlowType.DISTRIBUTION),
+        ],
+        exit_value=1100.0,
+        exit_date=start + timedelta(days=730),
+    )
+    engine = InvestmentMetricsEngine(discount_rate=0.08)
+    portfolio = engine.compute([investment])
+    metrics = portfolio.investments[0]
+
+    # 1000 = 100 / (1 + r) + 1100 / (1 + r) ** 2 at r = 10%
+    assert metrics.irr == pytest.approx(0.1, abs=1e-9)
+    assert metrics.npv == pytest.approx(-1000 + 100 / 1.08 + 1100 / 1.08 ** 2)
+    assert (metrics.contributed, metrics.distributed, metrics.exit_value) == (1000.0, 100.0, 1100.0)
+    assert metrics.moic == pytest.approx(1.2)
+    assert metrics.dpi == pytest.approx(0.1)
+    assert portfolio.irr == pytest.approx(metrics.irr)
+
+    assert engine.compute([investment]) is portfolio
+    investment.cash_flows[1].amount = 0.0
+    investment.version += 1
+    assert math.isclose(engine.compute([investment]).investments[0].dpi, 0.0)
@@ -0,0 +1,37 @@
+# tests/test_logger.py
+import json
+import logging
+import queue
+
+from config.logger import DeferredQueueHandler, JsonFormatter
+
+def _queued_logger(name):
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    return logger, log_queue
+
+def test_message_is_interpolated_at_call_time():
+    logger, log_queue = _queued_logger("tests.logger.interpolation")
+    members = ["ann"]
+    logger.info("Team: %s", members)
+    members.append("ben")
+
+    record = log_queue.get_nowait()
+    assert record.args is None
+    assert json.loads(JsonFormatter().format(record))["message"] == "Team: ['ann']"
+
+def test_exception_is_formatted_before_queueing():
+    logger, log_queue = _queued_logger("tests.logger.exception")
+    try:
+        raise ValueError("bad budget")
+    except ValueError:
+        logger.exception("Save failed")
+
+    record = log_queue.get_nowait()
+    assert record.exc_info is None
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Save failed"
+    assert "ValueError: bad budget" in entry["exc_info"]
@@ -0,0 +1,67 @@
+# tests/test_monthly_rollups.py
+import dataclasses
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generate_projects
+from database.monthly_rollups import MonthlyRollups
+from database.project_store import ProjectStore
+from models.project import ProjectPriority, ProjectStatus
+
+BACKENDS = {
+    "json": dict(file_name="projects.json", write_behind=False),
+    "json write-behind": dict(file_name="projects.json", write_behind=True),
+    "binary": dict(file_name="projects.bin", write_behind=False),
+    "mmap": dict(file_name="projects.bin", write_behind=False, memory_map=True),
+    "sharded": dict(file_name="projects", write_behind=False),
+}
+
+def _store(tmp_path, file_name, write_behind, memory_map=False):
+    return ProjectStore(write_behind=write_behind, file_path=tmp_path / file_name, memory_map=memory_map)
+
+def _table(rollups: MonthlyRollups):
+    """Cells keyed by absolute month, without empty edge months"""
+    filled = np.flatnonzero(np.abs(rollups._cells).sum(axis=(1, 2, 3)) > 1e-6)
+    if not len(filled):
+        return 0, rollups._cells[:0]
+    return rollups._origin + filled[0], rollups._cells[filled[0]:filled[-1] + 1]
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_incremental_updates_match_a_rebuild(tmp_path, backend):
+    store = _store(tmp_path, **BACKENDS[backend])
+    projects = list(generate_projects(200))
+    store.import_projects(projects)
+    rollups = MonthlyRollups(store, file_path=tmp_path / "rollups.json")
+    rollups.report()
+    rebuild, calls = rollups.rebuild, []
+    rollups.rebuild = lambda *args: (calls.append(args), rebuild(*args))
+
+    # Edited in place, the way the pages edit what get_project returned
+    for project in projects[:20]:
+        edited = store.get_project(project.id)
+        edited.budget += 12345.0
+        edited.spent = edited.spent / 2
+        edited.end_date += timedelta(days=150)
+        edited.status = ProjectStatus.ON_HOLD
+        edited.priority = ProjectPriority.CRITICAL
+        store.update_project(edited)
+    store.update_project(dataclasses.replace(store.get_project(projects[20].id), budget=1.0))
+    store.delete_project(projects[21].id)
+    store.create_project(dataclasses.replace(
+        projects[22], id="new-project", start_date=projects[22].start_date - timedelta(days=3650)
+    ))
+    store.flush()
+
+    rollups.report()
+    assert not calls, "the table should have been updated in place"
+    fresh = MonthlyRollups(store, file_path=tmp_path / "fresh.json")
+    fresh.rebuild(store.get_all_projects(), store.data_stamp())
+
+    origin, cells = _table(rollups)
+    fresh_origin, fresh_cells = _table(fresh)
+    assert origin == fresh_origin
+    np.testing.assert_allclose(cells, fresh_cells, atol=1e-6)
+    assert rollups.report("status") == fresh.report("status")
+    store.close()
@@ -0,0 +1,96 @@
+# tests/test_progress_history.py
+import dataclasses
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generate_projects
+from database.progress_history import ProgressHistory, downsample
+from database.project_store import ProjectStore
+
+def _brute_downsample(times, values, start, end, width):
+    """Bucket i covers (edges[i], edges[i + 1]]; values hold until the next sample"""
+    edges = np.linspace(start, end, width + 1)
+    low, high, last = [], [], []
+
+    def value_at(moment):
+        index = np.searchsorted(times, moment, side="right") - 1
+        return values[index] if index >= 0 else math.nan
+
+    for left, right in zip(edges[:-1], edges[1:]):
+        inside = [v for t, v in zip(times, values) if left < t <= right]
+        seen = [v for v in [value_at(left)] + inside if not math.isnan(v)]
+        low.append(min(seen) if seen else math.nan)
+        high.append(max(seen) if seen else math.nan)
+        last.append(value_at(right))
+    return edges[1:], np.array(low), np.array(high), np.array(last)
+
+@pytest.mark.parametrize("width", [1, 7, 50, 400])
+def test_downsample_matches_brute_force(width):
+    rng = np.random.default_rng(width)
+    times = np.sort(rng.integers(1000, 2000, 300))  # repeated times included
+    values = rng.uniform(0, 100, 300)
+    for start, end in [(900, 2100), (1200, 1300), (1500, 1500.5), (2500, 3000)]:
+        series = downsample(times, values, start, end, width)
+        expected = _brute_downsample(times, values, start, end, width)
+        for actual, wanted in zip(series, expected):
+            np.testing.assert_allclose(actual, wanted)
+
+def test_downsample_without_samples():
+    series = downsample(np.empty(0, dtype=np.int64), np.empty(0), 0.0, 10.0, 5)
+    assert len(series.times) == 5 and np.isnan(series.last).all()
+    assert series.rows() == []
+
+class _Clock(datetime):
+    """datetime whose now() is set by the test; the store stamps updated_at with it"""
+    current = datetime(2026, 1, 1)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+def test_series_survive_sealing_and_reopening(tmp_path, monkeypatch):
+    monkeypatch.setattr("database.project_store.datetime", _Clock)
+    store = ProjectStore(write_behind=False, file_path=tmp_path / "projects.json")
+    first, second = generate_projects(2)
+    start = datetime(2026, 1, 1)
+    first = dataclasses.replace(first, progress=0.0, spent=0.0, updated_at=start)
+    second = dataclasses.replace(second, progress=0.0, spent=0.0, updated_at=start)
+    store.import_projects([first, second])
+    history = ProgressHistory(store, root=tmp_path / "history", chunk_rows=8)
+    history.sample_count()
+
+    moments, progress = [], []
+    for step in range(1, 30):
+        moment = start + timedelta(hours=step)
+        project = first if step % 3 else second
+        _Clock.current = moment
+        project = dataclasses.replace(project, progress=float(step), spent=step * 10.0)
+        store.update_project(project)
+        if project.id == first.id:
+            first = project
+            moments.append(moment.timestamp())
+            progress.append(float(step))
+        else:
+            second = project
+
+    assert len(list((tmp_path / "history").glob("chunk-*"))) >= 3
+    window = (start, start + timedelta(hours=30))
+    series = history.project_series(first.id, "progress", *window, width=30)
+    expected = _brute_downsample(
+        np.array([start.timestamp()] + moments), np.array([0.0] + progress),
+        start.timestamp(), window[1].timestamp(), 30
+    )
+    np.testing.assert_allclose(series.last, expected[3])
+    np.testing.assert_allclose(series.high, expected[2])
+
+    total = history.portfolio_series("spent", *window, width=30)
+    assert total.last[-1] == pytest.approx(first.spent + second.spent)
+
+    reopened = ProgressHistory(store, root=tmp_path / "history", chunk_rows=8)
+    assert reopened.sample_count() == history.sample_count()
+    again = reopened.project_series(first.id, "progress", *window, width=30)
+    np.testing.assert_allclose(again.last, series.last)
+    np.testing.assert_allclose(reopened.portfolio_series("spent", *window, width=30).last, total.last)
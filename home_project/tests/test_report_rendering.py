@@ -0,0 +1,37 @@
+# tests/test_report_rendering.py
+import threading
+import zipfile
+
+from benchmarks.synthetic import generate_projects
+from core.report_rendering import render_report
+from database import binary_format
+
+def test_concurrent_renders_of_one_artefact_do_not_collide(tmp_path):
+    snapshot = tmp_path / "snapshot.bin"
+    with open(snapshot, 'wb') as f:
+        binary_format.write_projects(f, generate_projects(2000))
+    output = tmp_path / "cache" / "report.zip"
+    output.parent.mkdir()
+
+    rows, errors = [], []
+
+    def render(name):
+        work = tmp_path / name
+        work.mkdir()
+        try:
+            rows.append(render_report(str(snapshot), str(output), str(work / "progress.json"), "csv", {"statuses": []}))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=render, args=(f"job{i}",)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and rows == [2000] * 3
+    with zipfile.ZipFile(output) as archive:
+        assert archive.testzip() is None
+        with archive.open("projects.csv") as f:
+            assert sum(1 for _ in f) == 2001
+    assert [p.name for p in output.parent.iterdir()] == ["report.zip"]
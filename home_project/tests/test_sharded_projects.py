@@ -0,0 +1,55 @@
+# tests/test_sharded_projects.py
+import json
+import threading
+
+from benchmarks.synthetic import generate_projects
+from database.project_store import ProjectStore
+
+def test_replace_never_leaves_the_store_empty(tmp_path):
+    root = tmp_path / "projects"
+    projects = list(generate_projects(300))
+    writer = ProjectStore(write_behind=False, file_path=root)
+    writer.import_projects(projects)
+
+    seen, errors, done = set(), [], threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                seen.add(len(ProjectStore(write_behind=False, file_path=root).get_all_projects()))
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for size in range(300, 290, -1):
+            writer.import_projects(projects[:size])
+    finally:
+        done.set()
+        reader.join()
+
+    assert not errors
+    assert seen <= set(range(291, 301))
+    manifest = json.loads((root / "manifest.json").read_text())
+    assert sorted(path.name for path in root.iterdir()) == sorted([manifest["data"], "manifest.json"])
+
+def test_layout_1_is_read_and_upgraded(tmp_path):
+    root = tmp_path / "projects"
+    projects = list(generate_projects(20))
+    store = ProjectStore(write_behind=False, file_path=root)
+    for project in projects:
+        path = store._shards.shard_path(project.id, root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(store._serialize_project(project)))
+    (root / "manifest.json").write_text(json.dumps(
+        {"layout_version": 1, "bucket_chars": 2, "shard_format": "json", "generation": "v1"}
+    ))
+
+    legacy = ProjectStore(write_behind=False, file_path=root)
+    assert legacy.get_project(projects[3].id) == projects[3]
+    assert len(legacy.get_all_projects()) == 20
+
+    legacy.import_projects(projects[:10])
+    assert len(ProjectStore(write_behind=False, file_path=root).get_all_projects()) == 10
+    assert len(list(root.iterdir())) == 2
@@ -0,0 +1,101 @@
+# tests/test_spatial_index.py
+import dataclasses
+import random
+
+import pytest
+
+from benchmarks.synthetic import generate_projects
+from database.project_store import ProjectStore
+from database.spatial_index import SpatialIndex, haversine_km
+
+def _spread(projects, seed=0):
+    """Move projects all over the globe, with a band along the antimeridian and one unlocated"""
+    rng = random.Random(seed)
+    moved = []
+    for i, project in enumerate(projects):
+        if i == 0:
+            moved.append(dataclasses.replace(project, latitude=None, longitude=None))
+        elif i % 5 == 0:
+            longitude = rng.choice([-1, 1]) * rng.uniform(179.0, 180.0)
+            moved.append(dataclasses.replace(project, latitude=rng.uniform(-60, 60), longitude=longitude))
+        else:
+            moved.append(dataclasses.replace(project, latitude=rng.uniform(-89, 89), longitude=rng.uniform(-180, 180)))
+    return moved
+
+def _brute_within(projects, south, west, north, east):
+    width = east - west if east >= west else east - west + 360.0
+    return {
+        p.id for p in projects
+        if p.location is not None and south <= p.latitude <= north and (p.longitude - west) % 360.0 <= width
+    }
+
+def _brute_nearest(projects, latitude, longitude, k):
+    distances = sorted(
+        haversine_km(latitude, longitude, p.latitude, p.longitude) for p in projects if p.location is not None
+    )
+    return distances[:k]
+
+def _boxes(rng, count):
+    for _ in range(count):
+        south = rng.uniform(-90, 80)
+        north = min(90.0, south + rng.uniform(0.5, 60))
+        west = rng.uniform(-180, 180)
+        east = (west + rng.uniform(0.5, 120) + 180.0) % 360.0 - 180.0  # crosses the antimeridian at times
+        yield south, west, north, east
+
+def _points(rng, count):
+    for _ in range(count):
+        yield rng.uniform(-89, 89), rng.choice([rng.uniform(-180, 180), 179.95, -179.95])
+
+@pytest.fixture
+def store(tmp_path):
+    return ProjectStore(write_behind=False, file_path=tmp_path / "projects.json")
+
+@pytest.mark.parametrize("cell_degrees", [0.5, 5.0])
+def test_queries_match_brute_force(store, cell_degrees):
+    projects = _spread(generate_projects(800))
+    store.import_projects(projects)
+    index = SpatialIndex(store, cell_degrees=cell_degrees)
+    rng = random.Random(1)
+
+    assert len(index) == len(projects) - 1
+    for box in _boxes(rng, 100):
+        assert {location.project_id for location in index.within(*box)} == _brute_within(projects, *box)
+    for latitude, longitude in _points(rng, 100):
+        found = [distance for _, distance in index.nearest(latitude, longitude, 10)]
+        assert found == pytest.approx(_brute_nearest(projects, latitude, longitude, 10))
+
+def test_nearest_in_a_dense_cluster(store):
+    # Synthetic projects sit around ten European cities, filling many small cells
+    projects = list(generate_projects(3000))
+    store.import_projects(projects)
+    index = SpatialIndex(store)
+    rng = random.Random(2)
+    for _ in range(50):
+        latitude, longitude = rng.uniform(40, 53), rng.uniform(-2, 14)
+        found = [distance for _, distance in index.nearest(latitude, longitude, 5)]
+        assert found == pytest.approx(_brute_nearest(projects, latitude, longitude, 5))
+    assert index.nearest(48.0, 2.0, 0) == []
+
+def test_changes_are_applied_in_place(store, monkeypatch):
+    projects = _spread(generate_projects(300), seed=3)
+    store.import_projects(projects)
+    index = SpatialIndex(store, cell_degrees=1.0)
+    len(index)
+
+    def no_rebuild(*args):
+        raise AssertionError("index was rebuilt")
+    monkeypatch.setattr(index, "rebuild", no_rebuild)
+
+    moved = dataclasses.replace(store.get_project(projects[1].id), latitude=-33.9, longitude=151.2)
+    store.update_project(moved)
+    store.delete_project(projects[2].id)
+    located = dataclasses.replace(store.get_project(projects[0].id), latitude=35.7, longitude=139.7)
+    store.update_project(located)
+    current = store.get_all_projects()
+
+    assert len(index) == len(projects) - 1
+    for box in [(-35, 150, -33, 152), (35, 139, 36, 140), (-90, -180, 90, 180), (-60, 170, 60, -170)]:
+        assert {location.project_id for location in index.within(*box)} == _brute_within(current, *box)
+    nearest, distance = index.nearest(-33.9, 151.2, 1)[0]
+    assert nearest.project_id == moved.id and distance == pytest.approx(0.0, abs=1e-6)
@@ -0,0 +1,106 @@
+# tests/test_write_behind.py
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+
+from core.exceptions import DatabaseError
+from database.project_store import ProjectStore
+from database.write_behind import WriteBehindQueue
+
+class _Recorder:
+    """flush_batch stand-in that records batches and can fail the first few"""
+
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.written = []
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    def __call__(self, batch):
+        with self.lock:
+            self.batches.append(batch)
+            if self.failures:
+                self.failures -= 1
+                raise OSError("disk full")
+            self.written.append(batch)
+
+def test_changes_within_the_interval_coalesce_into_one_batch():
+    recorder = _Recorder()
+    queue = WriteBehindQueue(recorder, interval=0.3)
+    try:
+        queue.put("a", 1)
+        queue.put("b", 1)
+        queue.put("a", 2)
+        queue.put("b", None)
+        assert queue.lookup("a") == (True, 2)
+        assert queue.lookup("c") == (False, None)
+        queue.flush()
+    finally:
+        queue.close()
+    assert recorder.written == [{"a": 2, "b": None}]
+
+def test_flush_returns_only_after_earlier_changes_are_written():
+    recorder = _Recorder()
+    queue = WriteBehindQueue(recorder, interval=10.0)
+    try:
+        queue.put("a", 1)
+        started = time.monotonic()
+        queue.flush(timeout=5)
+        # The barrier cuts the coalescing window short instead of waiting it out
+        assert time.monotonic() - started < 5
+        assert recorder.written == [{"a": 1}]
+        assert queue.pending() == {}
+        assert queue.lookup("a") == (False, None)
+    finally:
+        queue.close()
+
+def test_flush_with_nothing_pending_keeps_the_next_window():
+    recorder = _Recorder()
+    queue = WriteBehindQueue(recorder, interval=0.3)
+    try:
+        queue.flush()
+        queue.put("a", 1)
+        time.sleep(0.05)
+        queue.put("b", 1)
+        queue.flush()
+    finally:
+        queue.close()
+    assert recorder.written == [{"a": 1, "b": 1}]
+
+def test_failed_batch_is_retried_with_newer_changes_winning():
+    recorder = _Recorder(failures=1)
+    queue = WriteBehindQueue(recorder, interval=0.2)
+    try:
+        queue.put("a", 1)
+        queue.put("b", 1)
+        with pytest.raises(DatabaseError):
+            queue.flush()
+        # Still pending, so reads keep seeing the unwritten values
+        assert queue.pending() == {"a": 1, "b": 1}
+        queue.put("a", 2)
+        queue.flush(timeout=5)
+    finally:
+        queue.close()
+    assert recorder.batches[0] == {"a": 1, "b": 1}
+    assert recorder.written == [{"a": 2, "b": 1}]
+
+def test_close_writes_outstanding_changes_and_rejects_new_ones():
+    recorder = _Recorder()
+    queue = WriteBehindQueue(recorder, interval=10.0)
+    queue.put("a", 1)
+    queue.close()
+    assert recorder.written == [{"a": 1}]
+    with pytest.raises(DatabaseError):
+        queue.put("b", 1)
+
+def test_closed_store_is_released(tmp_path):
+    store = ProjectStore(write_behind=True, file_path=tmp_path / "projects.json")
+    store.close()
+    released = weakref.ref(store)
+    del store
+    gc.collect()
+    # Nothing, such as an exit hook, keeps the store and its projects alive
+    assert released() is None
@@ -0,0 +1,172 @@
+# ui/assets.py
+import base64
+import hashlib
+import io
+import logging
+import mimetypes
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config.settings import settings
+from ui.styles import Styles
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; images are then served unmodified
+    Image = None
+
+class AssetPipeline:
+    """
+    Prepares static assets once per process instead of once per render.
+
+    Images are downscaled to their display size and optimized, then either
+    inlined as data URLs (small assets) or written to Streamlit's static
+    folder under a content-hashed name and referenced by URL. Generated
+    CSS/HTML is minified and cached.
+
+    Attributes:
+        source_dir (Path): Directory holding the original images
+        static_dir (Path): Directory served by Streamlit at STATIC_URL_PREFIX
+        inline_limit (int): Largest asset, in bytes, that is inlined
+    """
+
+    def __init__(
+        self,
+        source_dir: Optional[Path] = None,
+        static_dir: Optional[Path] = None,
+        inline_limit: Optional[int] = None,
+        static_serving: Optional[bool] = None
+    ):
+        self.source_dir = source_dir or settings.LOGO_DIR
+        self.static_dir = static_dir or settings.STATIC_DIR
+        self.inline_limit = settings.INLINE_ASSET_LIMIT if inline_limit is None else inline_limit
+        self.static_serving = _static_serving_enabled() if static_serving is None else static_serving
+        self._lock = threading.Lock()
+        self._urls: Dict[Tuple[str, Optional[int]], str] = {}
+        self._markup: Dict[Tuple, str] = {}
+
+    def image_url(self, name: str, display_width: Optional[int] = None) -> str:
+        """
+        URL for an image, preferring an SVG with the same stem when present
+
+        Args:
+            name (str): File name inside the source directory
+            display_width (Optional[int]): CSS width the image is shown at
+
+        Returns:
+            str: Static file URL or data URL
+
+        Raises:
+            FileNotFoundError: If neither the image nor an SVG variant exists
+        """
+        key = (name, display_width)
+        url = self._urls.get(key)
+        if url is None:
+            with self._lock:
+                url = self._urls.get(key)
+                if url is None:
+                    url = self._build_image(name, display_width)
+                    self._urls[key] = url
+        return url
+
+    def animation_css(self, duration: float, fade_out: float) -> str:
+        """Minified animation styles"""
+        key = ("animation_css", duration, fade_out)
+        if key not in self._markup:
+            self._markup[key] = minify_html(Styles.get_animation_css(duration, fade_out))
+        return self._markup[key]
+
+    def animation_html(self, logo_url: str) -> str:
+        """Minified animation markup"""
+        key = ("animation_html", logo_url)
+        if key not in self._markup:
+            self._markup[key] = minify_html(Styles.get_animation_html(logo_url))
+        return self._markup[key]
+
+    def build(self) -> Dict[str, str]:
+        """
+        Prepare every asset the UI uses
+
+        Returns:
+            Dict[str, str]: Asset name to URL
+        """
+        logo_url = self.image_url("logo_grey.png", settings.LOGO_DISPLAY_WIDTH)
+        self.animation_css(settings.ANIMATION_DURATION, settings.ANIMATION_FADE_OUT)
+        self.animation_html(logo_url)
+        return {"logo_grey.png": logo_url}
+
+    def _build_image(self, name: str, display_width: Optional[int]) -> str:
+        source = self.source_dir / name
+        svg = source.with_suffix(".svg")
+        if svg.exists():
+            source = svg
+        elif not source.exists():
+            raise FileNotFoundError(f"Asset not found: {source}")
+
+        data = source.read_bytes()
+        if source.suffix.lower() != ".svg" and display_width:
+            data = _optimize_image(data, display_width)
+        mime = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+
+        if len(data) <= self.inline_limit or not self.static_serving:
+            return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed_name = f"{source.stem}.{digest}{source.suffix}"
+        target = self.static_dir / hashed_name
+        if not target.exists():
+            self.static_dir.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(target.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+        return f"{settings.STATIC_URL_PREFIX}/{hashed_name}"
+
+def _optimize_image(data: bytes, display_width: int) -> bytes:
+    """Downscale to twice the display width (for high-DPI screens) and recompress"""
+    if Image is None:
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            target_width = display_width * 2
+            if image.width > target_width:
+                height = round(image.height * target_width / image.width)
+                image = image.resize((target_width, height), Image.LANCZOS)
+            out = io.BytesIO()
+            image.save(out, format="PNG", optimize=True)
+        optimized = out.getvalue()
+        return optimized if len(optimized) < len(data) else data
+    except Exception as e:
+        logging.warning("Image optimization failed, serving original: %s", e)
+        return data
+
+_STYLE_BLOCK = re.compile(r"(<style>)(.*?)(</style>)", re.DOTALL)
+
+def _minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+def minify_html(markup: str) -> str:
+    """
+    Minify inline <style> blocks and strip indentation from the rest.
+
+    Leading whitespace matters to st.markdown, which would otherwise render
+    indented HTML as a code block.
+    """
+    markup = _STYLE_BLOCK.sub(lambda m: m.group(1) + _minify_css(m.group(2)) + m.group(3), markup)
+    return "\n".join(line.strip() for line in markup.splitlines() if line.strip())
+
+def _static_serving_enabled() -> bool:
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+if __name__ == "__main__":
+    # Build-time entry point: python -m ui.assets
+    for asset, url in AssetPipeline(static_serving=True).build().items():
+        print(f"{asset}: {url[:80]}")
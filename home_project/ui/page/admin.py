@@ -0,0 +1,59 @@
+# ui/page/admin.py
+import streamlit as st
+from typing import Optional
+from core.services import ServiceRegistry, services as default_services
+from utils.profiler import profiler
+
+class AdminPerformancePage:
+    """Admin-only view of render and storage latency"""
+
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+
+    def render(self) -> None:
+        st.title("Performance")
+
+        if st.session_state.get('user_role') != 'admin':
+            st.error("This page is only available to administrators")
+            return
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            profiler.enabled = st.toggle(
+                "Profiling enabled",
+                value=profiler.enabled,
+                help="Record wall time for reruns, pages, tabs and store calls"
+            )
+        with col2:
+            if st.button("Reset measurements"):
+                profiler.reset()
+
+        if not profiler.enabled:
+            st.info("Profiling is off; measurements below are from when it was last on.")
+
+        st.subheader("Operations")
+        rows = profiler.operation_stats()
+        if rows:
+            st.dataframe(
+                rows,
+                use_container_width=True,
+                column_config={
+                    "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.2f"),
+                    "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.2f"),
+                    "p99_ms": st.column_config.NumberColumn("p99 (ms)", format="%.2f"),
+                    "parse_ms": st.column_config.NumberColumn("parse (ms)", format="%.2f"),
+                }
+            )
+        else:
+            st.write("No measurements yet.")
+
+        st.subheader("Slowest recent reruns")
+        for rerun in profiler.slowest_reruns():
+            title = (
+                f"{rerun.label} · {rerun.duration * 1000:.1f} ms · "
+                f"{rerun.started_at:%H:%M:%S} · read {rerun.bytes_read:,} B · wrote {rerun.bytes_written:,} B"
+            )
+            with st.expander(title):
+                breakdown = sorted(rerun.breakdown.items(), key=lambda item: item[1], reverse=True)
+                for name, seconds in breakdown:
+                    st.text(f"{name:<40} {seconds * 1000:10.2f} ms")
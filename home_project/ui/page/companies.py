@@ -0,0 +1,135 @@
+# ui/page/companies.py
+import streamlit as st
+from typing import Optional
+from models.company import Company, CompanyType
+from core.services import ServiceRegistry, services as default_services
+from utils.timing import Timer
+import uuid
+
+class CompaniesPage:
+    """SPVs and counterparties with typeahead search and linked projects"""
+
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+        self.company_store = self.services.company_store
+        self.project_store = self.services.project_store
+
+    def render(self) -> None:
+        st.title("Companies")
+        # Set by a form before the rerun that shows its effect
+        if "company_notice" in st.session_state:
+            st.success(st.session_state.pop("company_notice"))
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            query = st.text_input(
+                "Search companies", placeholder="Start typing a name", key="company_query"
+            )
+        with col2:
+            st.metric("Companies", f"{self.company_store.count():,}")
+
+        # Only the best matches are sent to the browser, never the full list
+        with Timer("companies:search"):
+            matches = self.company_store.search(query)
+
+        if matches:
+            labels = {c.id: f"{c.name} · {c.type.value}" for c in matches}
+            selected = st.selectbox(
+                "Company", options=list(labels), format_func=labels.get, key="company_selected"
+            )
+            self._render_company(self.company_store.get_company(selected))
+        elif query:
+            st.info(f"No company matches \"{query}\".")
+        else:
+            st.info("No companies yet.")
+
+        with st.expander("Add company"):
+            self._render_company_form()
+
+    def _saved(self, notice: str) -> None:
+        st.session_state["company_notice"] = notice
+        st.rerun()
+
+    def _render_company(self, company: Company) -> None:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Type", company.type.value)
+        with col2:
+            st.metric("Jurisdiction", company.jurisdiction or "—")
+        with col3:
+            st.metric("Registration", company.registration_number or "—")
+
+        st.subheader("Linked Projects")
+        # Projects deleted since they were linked are skipped
+        linked = [
+            project for project in map(self.project_store.get_project, company.project_ids)
+            if project is not None
+        ]
+        if linked:
+            st.dataframe(
+                [
+                    {
+                        "Project": p.name,
+                        "Status": p.status.value,
+                        "Budget": p.budget,
+                        "Spent": p.spent,
+                        "Progress (%)": p.progress,
+                    }
+                    for p in linked
+                ],
+                use_container_width=True,
+                column_config={
+                    "Budget": st.column_config.NumberColumn(format="$%.2f"),
+                    "Spent": st.column_config.NumberColumn(format="$%.2f"),
+                    "Progress (%)": st.column_config.NumberColumn(format="%.1f"),
+                }
+            )
+        else:
+            st.info("No projects linked to this company.")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            with st.form(key="link_project"):
+                projects = self.project_store.get_all_projects()
+                names = {p.id: p.name for p in projects if p.id not in company.project_ids}
+                project_id = st.selectbox("Link project", options=list(names), format_func=names.get)
+                if st.form_submit_button("Link") and project_id:
+                    self.company_store.link_project(company.id, project_id)
+                    self._saved(f"Linked {names[project_id]} to {company.name}")
+        with col2:
+            if linked:
+                with st.form(key="unlink_project"):
+                    names = {p.id: p.name for p in linked}
+                    project_id = st.selectbox("Unlink project", options=list(names), format_func=names.get)
+                    if st.form_submit_button("Unlink"):
+                        self.company_store.unlink_project(company.id, project_id)
+                        self._saved(f"Unlinked {names[project_id]} from {company.name}")
+            if st.button("Delete company", key=f"delete_company_{company.id}"):
+                self.company_store.delete_company(company.id)
+                self._saved(f"Deleted {company.name}")
+
+    def _render_company_form(self) -> None:
+        with st.form(key="new_company", clear_on_submit=True):
+            name = st.text_input("Company Name")
+            company_type = st.selectbox("Type", options=[t.value for t in CompanyType])
+            jurisdiction = st.text_input("Jurisdiction")
+            registration_number = st.text_input("Registration Number")
+
+            if st.form_submit_button("Create Company"):
+                if not name.strip():
+                    st.error("Company name is required")
+                    return
+                try:
+                    company = Company(
+                        id=str(uuid.uuid4()),
+                        name=name.strip(),
+                        type=CompanyType(company_type),
+                        jurisdiction=jurisdiction.strip() or None,
+                        registration_number=registration_number.strip() or None
+                    )
+                    if self.company_store.create_company(company):
+                        self._saved("Company created successfully!")
+                    else:
+                        st.error("Failed to create company")
+                except Exception as e:
+                    st.error(f"Error saving company: {str(e)}")
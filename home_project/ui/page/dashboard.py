@@ -1,43 +1,125 @@
 # ui/pages/dashboard.py
+import math
+import pydeck as pdk
 import streamlit as st
 from datetime import datetime
 from typing import Optional
 from models.project import Project, ProjectStatus, ProjectPriority, ProjectMilestone
-from database.project_store import ProjectStore
+from core.exceptions import ValidationError
+from core.scenario import Scenario
+from core.services import ServiceRegistry, services as default_services
+from config.settings import settings
+from utils.timing import Timer
 import uuid
 
+def _viewport_bounds(latitude: float, longitude: float, zoom: float, width: int, height: int):
+    """(south, west, north, east) visible on a Web Mercator map of the given size in pixels"""
+    world = 256 * 2 ** zoom
+    x = (longitude + 180.0) / 360.0 * world
+    phi = math.radians(max(-85.0, min(85.0, latitude)))
+    y = (1 - math.log(math.tan(phi) + 1 / math.cos(phi)) / math.pi) / 2 * world
+
+    def to_latitude(pixel_y: float) -> float:
+        pixel_y = max(0.0, min(world, pixel_y))
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * pixel_y / world))))
+
+    if width >= world:
+        west, east = -180.0, 180.0
+    else:
+        west = (x - width / 2) / world * 360.0 - 180.0
+        east = (x + width / 2) / world * 360.0 - 180.0
+        west, east = (west + 180.0) % 360.0 - 180.0, (east + 180.0) % 360.0 - 180.0
+    return to_latitude(y + height / 2), west, to_latitude(y - height / 2), east
+
+def _rgb(hex_color: str) -> list:
+    return [int(hex_color[i:i + 2], 16) for i in (1, 3, 5)]
+
 class DashboardPage:
-    def __init__(self):
-        self.project_store = ProjectStore()
+    TABS = ["Projects Overview", "Project Details", "Analytics", "What-if", "Map"]
+
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+        self.project_store = self.services.project_store
+        # Created up front so it is listening before this page writes anything
+        self.history = self.services.progress_history
 
     def render(self) -> None:
         st.title("Company Portfolio Dashboard")
-        
-        # Sidebar filters
-        with st.sidebar:
-            st.subheader("Filters")
-            status_filter = st.multiselect(
-                "Status",
-                options=[status.value for status in ProjectStatus],
-                default=[]
-            )
-            priority_filter = st.multiselect(
-                "Priority",
-                options=[priority.value for priority in ProjectPriority],
-                default=[]
-            )
 
-        # Main content
-        tabs = st.tabs(["Projects Overview", "Project Details", "Analytics"])
-        
-        with tabs[0]:
+        # Tab switches requested from inside a fragment are applied here,
+        # before the tab selector is instantiated
+        if "dashboard_pending_tab" in st.session_state:
+            st.session_state["dashboard_tab"] = st.session_state.pop("dashboard_pending_tab")
+
+        # Only the active tab is computed; each one reruns on its own
+        active_tab = st.radio(
+            "View", self.TABS, horizontal=True, key="dashboard_tab", label_visibility="collapsed"
+        )
+
+        if active_tab == "Projects Overview":
+            self._projects_overview_fragment()
+        elif active_tab == "Project Details":
+            self._project_details_fragment()
+        elif active_tab == "Analytics":
+            self._analytics_fragment()
+        elif active_tab == "What-if":
+            self._scenario_fragment()
+        else:
+            self._map_fragment()
+
+    def _switch_tab(self, tab: str) -> None:
+        st.session_state["dashboard_pending_tab"] = tab
+        st.rerun()
+
+    @st.fragment
+    def _projects_overview_fragment(self) -> None:
+        with Timer("fragment:overview") as timer, self.project_store.read_scope():
+            # Filters live inside the fragment so changing them reruns only this tab
+            filter_col1, filter_col2 = st.columns(2)
+            with filter_col1:
+                status_filter = st.multiselect(
+                    "Status",
+                    options=[status.value for status in ProjectStatus],
+                    default=[],
+                    key="filter_status"
+                )
+            with filter_col2:
+                priority_filter = st.multiselect(
+                    "Priority",
+                    options=[priority.value for priority in ProjectPriority],
+                    default=[],
+                    key="filter_priority"
+                )
             self._render_projects_overview(status_filter, priority_filter)
-        
-        with tabs[1]:
+        self._render_fragment_latency(timer)
+
+    @st.fragment
+    def _project_details_fragment(self) -> None:
+        with Timer("fragment:details") as timer, self.project_store.read_scope():
             self._render_project_details()
-            
-        with tabs[2]:
+        self._render_fragment_latency(timer)
+
+    @st.fragment
+    def _analytics_fragment(self) -> None:
+        with Timer("fragment:analytics") as timer, self.project_store.read_scope():
             self._render_analytics()
+        self._render_fragment_latency(timer)
+
+    @st.fragment
+    def _scenario_fragment(self) -> None:
+        with Timer("fragment:scenario") as timer, self.project_store.read_scope():
+            self._render_scenario()
+        self._render_fragment_latency(timer)
+
+    @st.fragment
+    def _map_fragment(self) -> None:
+        with Timer("fragment:map") as timer:
+            self._render_map()
+        self._render_fragment_latency(timer)
+
+    def _render_fragment_latency(self, timer: Timer) -> None:
+        if settings.SHOW_TIMINGS:
+            st.caption(f"⏱ {timer.label}: {timer.elapsed * 1000:.1f} ms")
 
     def _render_projects_overview(self, status_filter: list, priority_filter: list) -> None:
         col1, col2 = st.columns([3, 1])
@@ -45,6 +127,8 @@ class DashboardPage:
         with col2:
             if st.button("➕ New Project", type="primary"):
                 st.session_state["show_project_form"] = True
+                st.session_state.pop("selected_project", None)
+                self._switch_tab("Project Details")
 
         projects = self.project_store.get_all_projects()
         
@@ -64,22 +148,37 @@ class DashboardPage:
                     st.text(f"Status: {project.status.value}")
                     
                 with col2:
-                    st.progress(project.progress, text=f"Progress: {project.progress}%")
+                    st.progress(min(project.progress / 100, 1.0), text=f"Progress: {project.progress}%")
                     st.text(f"Budget: ${project.spent:,.2f} / ${project.budget:,.2f}")
                     
                 with col3:
                     st.text(f"Priority: {project.priority.value}")
                     if st.button("Details", key=f"detail_{project.id}"):
                         st.session_state["selected_project"] = project.id
+                        self._switch_tab("Project Details")
 
     def _render_project_details(self) -> None:
         if "selected_project" in st.session_state:
             project = self.project_store.get_project(st.session_state["selected_project"])
             if project:
                 self._render_project_form(project)
+                self._render_project_history(project)
         elif st.session_state.get("show_project_form", False):
             self._render_project_form()
 
+    def _render_project_history(self, project: Project) -> None:
+        st.subheader("History")
+        measure = st.radio(
+            "Measure", ["progress", "spent", "budget"], horizontal=True,
+            format_func=str.title, key="history_measure"
+        )
+        # Downsampled to one low/high/last point per bucket, however long the history
+        rows = self.history.project_series(project.id, measure).rows()
+        if len(rows) < 2:
+            st.info("No history recorded for this project yet.")
+            return
+        st.line_chart(rows, x="time", y=["last", "low", "high"])
+
     def _render_project_form(self, project: Optional[Project] = None) -> None:
         is_edit = project is not None
         form_key = "edit_project" if is_edit else "new_project"
@@ -122,16 +221,37 @@ class DashboardPage:
                     max_value=100.0
                 )
 
+            col1, col2 = st.columns(2)
+            with col1:
+                latitude = st.number_input(
+                    "Latitude (optional)",
+                    value=project.latitude if is_edit else None,
+                    min_value=-90.0,
+                    max_value=90.0,
+                    format="%.6f"
+                )
+            with col2:
+                longitude = st.number_input(
+                    "Longitude (optional)",
+                    value=project.longitude if is_edit else None,
+                    min_value=-180.0,
+                    max_value=180.0,
+                    format="%.6f"
+                )
+
             # Team members
             st.subheader("Team Members")
             team_members = st.multiselect(
                 "Select team members",
-                options=self._get_available_team_members(),
+                options=self._get_available_team_members(project),
                 default=project.team_members if is_edit else []
             )
 
             submitted = st.form_submit_button("Save Project")
             if submitted:
+                if (latitude is None) != (longitude is None):
+                    st.error("Enter both latitude and longitude, or neither")
+                    return
                 try:
                     new_project = Project(
                         id=project.id if is_edit else str(uuid.uuid4()),
@@ -145,7 +265,9 @@ class DashboardPage:
                         progress=progress,
                         team_members=team_members,
                         spent=project.spent if is_edit else 0.0,
-                        created_at=project.created_at if is_edit else datetime.now()
+                        created_at=project.created_at if is_edit else datetime.now(),
+                        latitude=latitude,
+                        longitude=longitude
                     )
                     
                     if is_edit:
@@ -165,23 +287,301 @@ class DashboardPage:
                 except Exception as e:
                     st.error(f"Error saving project: {str(e)}")
 
+    def _get_available_team_members(self, project: Optional[Project] = None) -> list:
+        members = set(self.project_store.get_team_members())
+        if project is not None:
+            members.update(project.team_members)
+        return sorted(members)
+
     def _render_analytics(self) -> None:
-        projects = self.project_store.get_all_projects()
+        summary = self.project_store.get_portfolio_summary()
         
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Projects", len(projects))
+            st.metric("Total Projects", summary["total_projects"])
         
         with col2:
-            active_projects = len([p for p in projects if p.status == ProjectStatus.IN_PROGRESS])
-            st.metric("Active Projects", active_projects)
+            st.metric("Active Projects", summary["active_projects"])
         
         with col3:
-            total_budget = sum(p.budget for p in projects)
-            st.metric("Total Budget", f"${total_budget:,.2f}")
+            st.metric("Total Budget", f"${summary['total_budget']:,.2f}")
         
         with col4:
-            total_spent = sum(p.spent for p in projects)
-            st.metric("Total Spent", f"${total_spent:,.2f}")
\ No newline at end of file
+            st.metric("Total Spent", f"${summary['total_spent']:,.2f}")
+
+        self._render_risk()
+
+    def _scenario(self) -> Scenario:
+        """The session's scenario, carried over to newer data when projects or investments change"""
+        snapshot = self.project_store.snapshot()
+        investments = self.services.investment_store.get_all_investments()
+        scenario = st.session_state.get("scenario")
+        if scenario is None:
+            scenario = Scenario(snapshot, investments, self.services.investment_metrics)
+        elif scenario.base is not snapshot or (
+            [(i.id, i.version) for i in scenario.investments] != [(i.id, i.version) for i in investments]
+        ):
+            scenario = scenario.rebase(snapshot, investments)
+        st.session_state["scenario"] = scenario
+        return scenario
+
+    def _render_scenario(self) -> None:
+        with Timer("scenario:build"):
+            scenario = self._scenario()
+        projects = scenario.base.projects
+        if not projects:
+            st.info("Create a project before modelling scenarios.")
+            return
+        st.caption("A sandbox: changes here update the analytics below but are never saved.")
+
+        names = {p.id: p.name for p in projects}
+        project_id = st.selectbox("Project", options=list(names), format_func=names.get, key="scenario_project")
+        project = scenario.project(project_id)
+        recomputed = scenario.recomputed
+        with st.form(key="scenario_adjust"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                budget = st.number_input("Budget ($)", min_value=0.0, value=float(project.budget), step=1000.0)
+            with col2:
+                end_date = st.date_input(
+                    "End Date", value=project.end_date.date(), min_value=project.start_date.date()
+                )
+            with col3:
+                statuses = [status.value for status in ProjectStatus]
+                status = st.selectbox("Status", options=statuses, index=statuses.index(project.status.value))
+            if st.form_submit_button("Apply to scenario"):
+                try:
+                    scenario.adjust(
+                        project_id,
+                        budget=budget,
+                        end_date=datetime.combine(end_date, project.end_date.time()),
+                        status=ProjectStatus(status)
+                    )
+                except ValidationError as e:
+                    st.error(str(e))
+
+        with Timer("scenario:outlook"):
+            baseline, outlook = scenario.baseline, scenario.outlook()
+        summary, stored = outlook.summary, baseline.summary
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            change = summary["total_budget"] - stored["total_budget"]
+            st.metric("Total Budget", f"${summary['total_budget']:,.2f}", delta=f"${change:,.2f}" if change else None,
+                      delta_color="inverse")
+        with col2:
+            change = summary["active_projects"] - stored["active_projects"]
+            st.metric("Active Projects", summary["active_projects"], delta=change or None)
+        with col3:
+            change = summary["overdue_projects"] - stored["overdue_projects"]
+            st.metric("Overdue Projects", summary["overdue_projects"], delta=change or None, delta_color="inverse")
+        with col4:
+            irr, stored_irr = outlook.returns.irr, baseline.returns.irr
+            change = irr - stored_irr if irr == irr and stored_irr == stored_irr else 0.0
+            st.metric(
+                "Portfolio IRR",
+                f"{irr:.2%}" if irr == irr else "n/a",
+                delta=f"{change * 100:+.2f} pts" if abs(change) >= 5e-5 else None
+            )
+
+        newly_overdue = outlook.overdue - baseline.overdue
+        back_on_time = baseline.overdue - outlook.overdue
+        if newly_overdue:
+            st.warning("Overdue under this scenario: " + ", ".join(sorted(names[i] for i in newly_overdue)))
+        if back_on_time:
+            st.success("No longer overdue: " + ", ".join(sorted(names[i] for i in back_on_time)))
+
+        changes = scenario.changes()
+        if not changes:
+            st.info("No changes yet. Adjust a project above to see its effect.")
+            return
+        st.subheader("Scenario Changes")
+        st.dataframe(
+            [
+                {
+                    "Project": row["project"],
+                    "Field": row["field"].replace("_", " ").title(),
+                    "Stored": self._format_scenario_value(row["stored"]),
+                    "Scenario": self._format_scenario_value(row["scenario"]),
+                }
+                for row in changes
+            ],
+            use_container_width=True
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if project_id in scenario.overlay and st.button(f"Reset {names[project_id]}"):
+                scenario.reset(project_id)
+                st.rerun()
+        with col2:
+            if st.button("Discard scenario"):
+                scenario.reset()
+                st.rerun()
+        st.caption(
+            f"This update recomputed {scenario.recomputed - recomputed} of {scenario.node_count:,} analytics nodes"
+        )
+
+    @staticmethod
+    def _format_scenario_value(value) -> str:
+        if isinstance(value, ProjectStatus):
+            return value.value
+        if isinstance(value, datetime):
+            return value.strftime("%d-%m-%Y")
+        return f"${value:,.2f}"
+
+    def _fit_map(self) -> None:
+        """Center the map on the located projects"""
+        bounds = self.services.spatial_index.bounds()
+        if bounds is None:
+            latitude, longitude, zoom = 20.0, 0.0, 1
+        else:
+            south, west, north, east = bounds
+            latitude, longitude = (south + north) / 2, (west + east) / 2
+            width, height = settings.MAP_SIZE
+            zoom = min(
+                math.log2(width * 360.0 / (256 * (east - west))),
+                math.log2(height * 170.0 / (256 * (north - south)))
+            )
+            zoom = max(1, min(16, math.floor(zoom)))
+        st.session_state.update({"map_latitude": latitude, "map_longitude": longitude, "map_zoom": zoom})
+
+    def _render_map(self) -> None:
+        index = self.services.spatial_index
+        if "map_zoom" not in st.session_state:
+            self._fit_map()
+
+        col1, col2, col3, col4 = st.columns([2, 2, 3, 1])
+        with col1:
+            latitude = st.number_input("Center latitude", min_value=-85.0, max_value=85.0, key="map_latitude")
+        with col2:
+            longitude = st.number_input("Center longitude", min_value=-180.0, max_value=180.0, key="map_longitude")
+        with col3:
+            zoom = st.slider("Zoom", min_value=1, max_value=16, key="map_zoom")
+        with col4:
+            st.button("Fit", on_click=self._fit_map, help="Show every located project")
+
+        # Only what lies inside this view is sent to the browser
+        south, west, north, east = _viewport_bounds(latitude, longitude, zoom, *settings.MAP_SIZE)
+        with Timer("map:viewport"):
+            view = index.viewport(south, west, north, east)
+
+        if view.clusters:
+            st.caption(f"{view.total:,} projects in {len(view.clusters):,} clusters; zoom in to see individual projects")
+            data = [
+                {
+                    "lat": c.latitude,
+                    "lon": c.longitude,
+                    "radius": 8 + 4 * math.sqrt(c.count),
+                    "label": f"{c.count:,}",
+                    "tooltip": f"{c.count:,} projects\nBudget ${c.budget:,.0f}",
+                }
+                for c in view.clusters
+            ]
+            layers = [
+                pdk.Layer(
+                    "ScatterplotLayer", data, get_position=["lon", "lat"], get_radius="radius",
+                    radius_units="pixels", get_fill_color=_rgb(settings.COLORS["primary"]) + [160], pickable=True
+                ),
+                pdk.Layer(
+                    "TextLayer", data, get_position=["lon", "lat"], get_text="label",
+                    get_size=12, get_color=[255, 255, 255]
+                ),
+            ]
+        else:
+            st.caption(f"{view.total:,} projects in view")
+            data = [
+                {
+                    "lat": l.latitude,
+                    "lon": l.longitude,
+                    "color": _rgb(settings.STATUS_COLORS[l.status.value]),
+                    "tooltip": f"{l.name}\n{l.status.value}\nBudget ${l.budget:,.0f}",
+                }
+                for l in view.locations
+            ]
+            layers = [
+                pdk.Layer(
+                    "ScatterplotLayer", data, get_position=["lon", "lat"], get_radius=6,
+                    radius_units="pixels", get_fill_color="color", pickable=True
+                )
+            ]
+        st.pydeck_chart(
+            pdk.Deck(
+                layers=layers,
+                initial_view_state=pdk.ViewState(latitude=latitude, longitude=longitude, zoom=zoom),
+                map_style=None,
+                tooltip={"text": "{tooltip}"}
+            ),
+            height=settings.MAP_SIZE[1]
+        )
+
+        with Timer("map:nearest"):
+            nearest = index.nearest(latitude, longitude, settings.MAP_NEAREST)
+        if nearest:
+            st.subheader("Closest to the Map Center")
+            st.dataframe(
+                [
+                    {
+                        "Project": location.name,
+                        "Status": location.status.value,
+                        "Budget": location.budget,
+                        "Distance (km)": distance,
+                    }
+                    for location, distance in nearest
+                ],
+                use_container_width=True,
+                column_config={
+                    "Budget": st.column_config.NumberColumn(format="$%.2f"),
+                    "Distance (km)": st.column_config.NumberColumn(format="%.1f"),
+                }
+            )
+
+    def _render_risk(self) -> None:
+        st.subheader("Schedule & Budget Risk")
+        projects = self.project_store.get_all_projects()
+        with Timer("analytics:risk"):
+            risk = self.services.risk_simulator.simulate_portfolio(projects)
+        if not risk.projects:
+            st.info("No active projects to simulate.")
+            return
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Expected Late Projects", f"{risk.expected_late:,.1f} / {len(risk.projects)}")
+        with col2:
+            st.metric("Expected Overruns", f"{risk.expected_overruns:,.1f} / {len(risk.projects)}")
+        with col3:
+            st.metric("Cost at Completion (P50)", f"${risk.p50_cost:,.2f}")
+        with col4:
+            st.metric(
+                "Cost at Completion (P90)",
+                f"${risk.p90_cost:,.2f}",
+                delta=f"${risk.p90_cost - risk.budget:,.2f} vs budget",
+                delta_color="inverse"
+            )
+
+        by_id = {p.id: p for p in projects}
+        riskiest = sorted(risk.projects, key=lambda r: (r.overrun_probability, r.late_probability), reverse=True)
+        st.dataframe(
+            [
+                {
+                    "Project": by_id[r.project_id].name,
+                    "End Date": by_id[r.project_id].end_date.date(),
+                    "P50 Finish": r.p50_finish_date,
+                    "P90 Finish": r.p90_finish_date,
+                    "Late (%)": r.late_probability * 100,
+                    "Budget": by_id[r.project_id].budget,
+                    "P90 Cost": r.p90_cost,
+                    "Overrun (%)": r.overrun_probability * 100,
+                }
+                for r in riskiest[:settings.RISK_TABLE_ROWS]
+            ],
+            use_container_width=True,
+            column_config={
+                "Late (%)": st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100),
+                "Overrun (%)": st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100),
+                "Budget": st.column_config.NumberColumn(format="$%.2f"),
+                "P90 Cost": st.column_config.NumberColumn(format="$%.2f"),
+            }
+        )
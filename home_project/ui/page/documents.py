@@ -0,0 +1,116 @@
+# ui/page/documents.py
+import streamlit as st
+from typing import Optional
+from core.exceptions import DatabaseError
+from core.services import ServiceRegistry, services as default_services
+from models.document import Document, DocumentCategory
+from utils.timing import Timer
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:,.0f} {unit}" if unit == "B" else f"{size:,.1f} {unit}"
+        size /= 1024
+
+class DocumentCenterPage:
+    """Leases, valuations and contracts attached to projects"""
+
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+        self.project_store = self.services.project_store
+        self.documents = self.services.document_store
+        self.previews = self.services.document_previews
+
+    def render(self) -> None:
+        st.title("Document Center")
+
+        projects = self.project_store.get_all_projects()
+        if not projects:
+            st.info("Create a project before attaching documents.")
+            return
+        names = {p.id: p.name for p in projects}
+        project_id = st.selectbox(
+            "Project", options=list(names), format_func=names.get, key="documents_project"
+        )
+
+        self._render_upload(project_id)
+
+        with Timer("documents:list"):
+            documents = self.documents.get_documents(project_id)
+        if not documents:
+            st.info("No documents attached to this project yet.")
+            return
+        for document in documents:
+            self._render_document(document, names)
+
+    def _render_upload(self, project_id: str) -> None:
+        with st.form(key="upload_documents", clear_on_submit=True):
+            files = st.file_uploader("Attach files", accept_multiple_files=True)
+            category = st.selectbox("Category", options=[c.value for c in DocumentCategory])
+            if st.form_submit_button("Upload") and files:
+                stored = 0
+                for uploaded in files:
+                    try:
+                        # Streamed from the upload buffer in chunks; never copied whole
+                        self.documents.attach(
+                            project_id,
+                            uploaded.name,
+                            uploaded,
+                            content_type=uploaded.type,
+                            category=DocumentCategory(category),
+                            uploaded_by=st.session_state.get('user_id')
+                        )
+                        stored += 1
+                    except DatabaseError as e:
+                        st.error(f"Failed to upload {uploaded.name}: {str(e)}")
+                if stored:
+                    st.success(f"Attached {stored} file(s)")
+
+    def _render_document(self, document: Document, names: dict) -> None:
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([1, 3, 2])
+            with col1:
+                preview = self.previews.get(document)
+                if preview.thumbnail is not None:
+                    st.image(str(preview.thumbnail))
+                elif preview.status == "pending":
+                    st.caption("Generating preview…")
+                else:
+                    st.markdown("📄")
+            with col2:
+                st.markdown(f"**{document.name}**")
+                st.caption(
+                    f"{document.category.value} · {_format_size(document.size)} · "
+                    f"uploaded {document.uploaded_at:%d-%m-%Y %H:%M}"
+                    + (f" by {document.uploaded_by}" if document.uploaded_by else "")
+                )
+                shared = self.documents.reference_count(document.digest) - 1
+                if shared:
+                    st.caption(f"Same file shared with {shared} other attachment(s)")
+                if preview.text is not None:
+                    with st.expander("Preview"):
+                        st.text(preview.text)
+            with col3:
+                st.download_button(
+                    "Download",
+                    # Opened only when clicked, so rendering the list reads no blobs. Streamlit
+                    # then copies the file into its per-session media store, which costs its
+                    # size in memory until the session lets the button go.
+                    data=lambda path=self.documents.blobs.path(document.digest): open(path, "rb"),
+                    file_name=document.name,
+                    mime=document.content_type or "application/octet-stream",
+                    key=f"download_{document.id}"
+                )
+                others = [pid for pid in names if pid != document.project_id]
+                target = st.selectbox(
+                    "Also attach to",
+                    options=[""] + others,
+                    format_func=lambda pid: names.get(pid, "—"),
+                    key=f"link_target_{document.id}"
+                )
+                if target and st.button("Attach", key=f"link_{document.id}"):
+                    self.documents.link(document.id, target, uploaded_by=st.session_state.get('user_id'))
+                    st.success(f"Attached to {names[target]}")
+                if st.button("Remove", key=f"remove_{document.id}"):
+                    self.documents.detach(document.id)
+                    st.rerun()
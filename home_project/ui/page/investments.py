@@ -0,0 +1,149 @@
+# ui/page/investments.py
+import math
+import streamlit as st
+from datetime import datetime
+from typing import Optional
+from models.investment import CashFlow, CashFlowType, Investment
+from core.services import ServiceRegistry, services as default_services
+from utils.timing import Timer
+import uuid
+
+def _percent(value: float) -> str:
+    return "n/a" if math.isnan(value) else f"{value * 100:,.2f}%"
+
+def _money(value: float) -> str:
+    return "n/a" if math.isnan(value) else f"${value:,.2f}"
+
+def _multiple(value: float) -> str:
+    return "n/a" if math.isnan(value) else f"{value:,.2f}x"
+
+class InvestmentTrackingPage:
+    """Cash flows per investment with portfolio IRR, NPV, MOIC and DPI"""
+
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+        self.investment_store = self.services.investment_store
+        self.metrics = self.services.investment_metrics
+
+    def render(self) -> None:
+        st.title("Investment Tracking")
+        # Set by a form before the rerun that shows its effect
+        if "investment_notice" in st.session_state:
+            st.success(st.session_state.pop("investment_notice"))
+
+        investments = self.investment_store.get_all_investments()
+        with Timer("investments:metrics"):
+            portfolio = self.metrics.compute(investments)
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Portfolio IRR", _percent(portfolio.irr))
+        with col2:
+            st.metric(f"NPV @ {self.metrics.discount_rate:.0%}", _money(portfolio.npv))
+        with col3:
+            st.metric("MOIC", _multiple(portfolio.moic))
+        with col4:
+            st.metric("DPI", _multiple(portfolio.dpi))
+        with col5:
+            st.metric("Contributed", f"${portfolio.contributed:,.2f}")
+
+        if investments:
+            names = {investment.id: investment.name for investment in investments}
+            st.dataframe(
+                [
+                    {
+                        "Investment": names[m.investment_id],
+                        "IRR (%)": None if math.isnan(m.irr) else m.irr * 100,
+                        "NPV": m.npv,
+                        "MOIC": None if math.isnan(m.moic) else m.moic,
+                        "DPI": None if math.isnan(m.dpi) else m.dpi,
+                        "Contributed": m.contributed,
+                        "Distributed": m.distributed,
+                        "Exit Value": m.exit_value,
+                    }
+                    for m in portfolio.investments
+                ],
+                use_container_width=True,
+                column_config={
+                    "IRR (%)": st.column_config.NumberColumn(format="%.2f"),
+                    "NPV": st.column_config.NumberColumn(format="$%.2f"),
+                    "MOIC": st.column_config.NumberColumn(format="%.2fx"),
+                    "DPI": st.column_config.NumberColumn(format="%.2fx"),
+                    "Contributed": st.column_config.NumberColumn(format="$%.2f"),
+                    "Distributed": st.column_config.NumberColumn(format="$%.2f"),
+                    "Exit Value": st.column_config.NumberColumn(format="$%.2f"),
+                }
+            )
+        else:
+            st.info("No investments yet.")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            self._render_investment_form()
+        with col2:
+            if investments:
+                self._render_cash_flow_form(investments)
+
+    def _saved(self, notice: str) -> None:
+        """Rerun so the metrics above reflect the write"""
+        st.session_state["investment_notice"] = notice
+        st.rerun()
+
+    def _render_investment_form(self) -> None:
+        with st.form(key="new_investment"):
+            st.subheader("New Investment")
+            name = st.text_input("Investment Name")
+            project_id = st.text_input("Project ID (optional)")
+            exit_value = st.number_input("Exit / Current Value ($)", value=0.0, min_value=0.0)
+            realized = st.checkbox("Realized")
+            exit_date = st.date_input("Exit Date", value=datetime.now().date())
+
+            if st.form_submit_button("Create Investment"):
+                if not name.strip():
+                    st.error("Investment name is required")
+                    return
+                try:
+                    investment = Investment(
+                        id=str(uuid.uuid4()),
+                        name=name.strip(),
+                        project_id=project_id.strip() or None,
+                        exit_value=exit_value,
+                        exit_date=datetime.combine(exit_date, datetime.min.time()) if realized else None
+                    )
+                    if self.investment_store.create_investment(investment):
+                        self._saved("Investment created successfully!")
+                    else:
+                        st.error("Failed to create investment")
+                except Exception as e:
+                    st.error(f"Error saving investment: {str(e)}")
+
+    def _render_cash_flow_form(self, investments: list) -> None:
+        with st.form(key="new_cash_flow"):
+            st.subheader("Record Cash Flow")
+            selected = st.selectbox(
+                "Investment",
+                options=[investment.id for investment in investments],
+                format_func={investment.id: investment.name for investment in investments}.get
+            )
+            flow_type = st.selectbox("Type", options=[t.value for t in CashFlowType])
+            amount = st.number_input("Amount ($)", value=0.0, min_value=0.0)
+            date = st.date_input("Date", value=datetime.now().date())
+            note = st.text_input("Note")
+
+            if st.form_submit_button("Add Cash Flow"):
+                if amount <= 0:
+                    st.error("Amount must be positive")
+                    return
+                try:
+                    cash_flow = CashFlow(
+                        date=datetime.combine(date, datetime.min.time()),
+                        amount=amount,
+                        type=CashFlowType(flow_type),
+                        note=note or None
+                    )
+                    if self.investment_store.add_cash_flow(selected, cash_flow):
+                        self._saved("Cash flow recorded!")
+                    else:
+                        st.error("Investment not found")
+                except Exception as e:
+                    st.error(f"Error saving cash flow: {str(e)}")
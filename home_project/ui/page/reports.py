@@ -0,0 +1,175 @@
+# ui/page/reports.py
+import streamlit as st
+from datetime import datetime
+from typing import Optional
+from config.settings import settings
+from core.exceptions import ValidationError
+from core.report_rendering import FORMATS, available_formats
+from core.services import ServiceRegistry, services as default_services
+from models.project import ProjectStatus
+from models.report_job import JobStatus, ReportJob
+from utils.timing import Timer
+
+class FinancialReportsPage:
+    """Monthly budget vs spent, read from the materialized rollups"""
+
+    DIMENSIONS = {"Total": "total", "By Status": "status", "By Priority": "priority"}
+
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+        self.rollups = self.services.rollups
+        self.history = self.services.progress_history
+        self.report_jobs = self.services.report_jobs
+
+    def render(self) -> None:
+        st.title("Financial Reports")
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            view = st.radio("Breakdown", list(self.DIMENSIONS), horizontal=True, key="report_dimension")
+        with col2:
+            start = st.date_input("From", value=None, key="report_start")
+        with col3:
+            end = st.date_input("To", value=None, key="report_end")
+
+        dimension = self.DIMENSIONS[view]
+        start = datetime.combine(start, datetime.min.time()) if start else None
+        end = datetime.combine(end, datetime.min.time()) if end else None
+
+        with Timer("reports:rollups"):
+            rows = self.rollups.report(dimension, start, end)
+
+        if not rows:
+            st.info("No project activity in this period.")
+            self._render_report_jobs()
+            return
+
+        totals = self.rollups.report("total", start, end)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Budget (period)", f"${sum(r['budget'] for r in totals):,.2f}")
+        with col2:
+            st.metric("Spent (period)", f"${sum(r['spent'] for r in totals):,.2f}")
+        with col3:
+            st.metric("Variance (period)", f"${sum(r['variance'] for r in totals):,.2f}")
+
+        st.subheader("Budget vs Spent per Month")
+        st.line_chart(totals, x="month", y=["budget", "spent"])
+
+        self._render_spend_curve(start, end)
+
+        if dimension != "total":
+            st.subheader(f"Spent per Month by {dimension.title()}")
+            st.bar_chart(rows, x="month", y="spent", color=dimension)
+
+        st.dataframe(
+            rows,
+            use_container_width=True,
+            column_config={
+                "budget": st.column_config.NumberColumn("Budget", format="$%.2f"),
+                "spent": st.column_config.NumberColumn("Spent", format="$%.2f"),
+                "variance": st.column_config.NumberColumn("Variance", format="$%.2f"),
+            }
+        )
+
+        st.download_button(
+            "Export CSV",
+            data=self.rollups.export_csv(dimension, start, end),
+            file_name=f"monthly_report_{dimension}.csv",
+            mime="text/csv"
+        )
+
+        self._render_report_jobs()
+
+    def _render_spend_curve(self, start: Optional[datetime], end: Optional[datetime]) -> None:
+        """Recorded portfolio spent and budget over time, one point per chart bucket"""
+        with Timer("reports:history"):
+            spent = self.history.portfolio_series("spent", start, end).rows()
+            budget = self.history.portfolio_series("budget", start, end).rows()
+        if len(spent) < 2:
+            return
+        st.subheader("Recorded Spend Curve")
+        st.line_chart(
+            [
+                {"time": s["time"], "spent": s["last"], "spent (peak)": s["high"], "budget": b["last"]}
+                for s, b in zip(spent, budget)
+            ],
+            x="time", y=["spent", "spent (peak)", "budget"]
+        )
+
+    def _render_report_jobs(self) -> None:
+        st.subheader("Portfolio Reports and Exports")
+        formats = available_formats()
+        if len(formats) < len(FORMATS):
+            st.caption("Install openpyxl (Excel) and reportlab (PDF) for more formats.")
+
+        with st.form(key="report_request"):
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                fmt = st.selectbox("Format", options=formats, format_func=lambda f: FORMATS[f][0])
+            with col2:
+                statuses = st.multiselect("Statuses", options=[s.value for s in ProjectStatus], placeholder="All")
+            if st.form_submit_button("Generate"):
+                try:
+                    # Returns at once; rendering happens on the process pool
+                    job = self.report_jobs.request(fmt, {"statuses": statuses}, st.session_state.get('user_id'))
+                    if job.status == JobStatus.DONE:
+                        st.success("This file is up to date and ready to download.")
+                except ValidationError as e:
+                    st.error(str(e))
+
+        jobs = self._visible_jobs()
+        if any(job.is_active for job in jobs):
+            # Poll only while something is running; the fragment reruns on its own
+            st.fragment(self._render_job_list, run_every=settings.REPORT_POLL_SECONDS)()
+        else:
+            self._render_job_list()
+
+    def _visible_jobs(self):
+        """The signed-in user's jobs; admins see everyone's"""
+        if st.session_state.get('user_role') == "admin":
+            return self.report_jobs.jobs()
+        return self.report_jobs.jobs(requested_by=st.session_state.get('user_id'))
+
+    def _render_job_list(self) -> None:
+        jobs = self._visible_jobs()
+        if not jobs:
+            return
+        polling = st.session_state.get("report_jobs_polling", False)
+        active = any(job.is_active for job in jobs)
+        st.session_state["report_jobs_polling"] = active
+        if polling and not active:
+            # Everything finished: one full rerun stops the polling fragment
+            st.rerun()
+        for job in jobs:
+            self._render_job(job)
+
+    def _render_job(self, job: ReportJob) -> None:
+        with st.container(border=True):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                statuses = ", ".join(job.params.get("statuses") or []) or "all statuses"
+                st.markdown(f"**{FORMATS[job.format][0]}** · {statuses}")
+                st.caption(
+                    f"Requested {job.created_at:%d-%m-%Y %H:%M}"
+                    + (f" · {job.rows:,} projects" if job.rows else "")
+                )
+                if job.is_active:
+                    st.progress(min(max(job.progress, 0.0), 1.0), text=job.message)
+                elif job.status == JobStatus.FAILED:
+                    st.error(job.error or job.message)
+            with col2:
+                path = self.report_jobs.artefact_path(job)
+                if path is not None:
+                    st.download_button(
+                        "Download",
+                        # Opened only when clicked. Streamlit then reads the file into its
+                        # media store for the session, so it costs the artefact's size in
+                        # memory until the session lets the button go.
+                        data=lambda path=path: open(path, "rb"),
+                        file_name=self.report_jobs.artefact_name(job),
+                        mime=FORMATS[job.format][2],
+                        key=f"report_download_{job.id}"
+                    )
+                elif job.status == JobStatus.DONE:
+                    st.caption("Expired from the cache")
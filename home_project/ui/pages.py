@@ -2,17 +2,22 @@
 
 import streamlit as st
 import streamlit.components.v1 as components
-from pathlib import Path
-import base64
-from core.authentication import AuthenticationService
+from typing import Optional
+from core.exceptions import AuthenticationError
+from core.services import ServiceRegistry, services as default_services
 from ui.styles import Styles
+from ui.page.companies import CompaniesPage
+from ui.page.investments import InvestmentTrackingPage
+from ui.page.reports import FinancialReportsPage
+from ui.page.documents import DocumentCenterPage
 from config.settings import Settings
 import time
 
 
 class BasePage:
-    def __init__(self):
-        self.auth_service = AuthenticationService()
+    def __init__(self, services: Optional[ServiceRegistry] = None):
+        self.services = services or default_services
+        self.auth_service = self.services.auth_service
         self.init_session_state()
 
     def show_error(self, message: str) -> None:
@@ -47,7 +52,9 @@ class LoginPage(BasePage):
                 elif self.auth_service.login(username, password):
                     st.session_state.update({
                         'authenticated': True,
+                        'user_id': username,
                         'name': username,
+                        'user_role': self.auth_service.get_user_role(username),
                         'show_animation': True
                     })
                     st.rerun()
@@ -61,10 +68,13 @@ class LoginPage(BasePage):
 class SignupPage(BasePage):
     def render(self) -> None:
         st.title("Sign Up")
-        
+
+        # Kept outside the form so availability is checked as the user types
+        username = st.text_input("Username", key="signup_username").strip()
+        self._render_username_availability(username)
+
         with st.form("signup_form"):
             name = st.text_input("Full Name").strip()
-            username = st.text_input("Username").strip()
             password = st.text_input("Password", type="password")
             confirm_password = st.text_input("Confirm Password", type="password")
             submitted = st.form_submit_button("Sign Up")
@@ -92,42 +102,50 @@ class SignupPage(BasePage):
             st.session_state['signup'] = False
             st.rerun()
 
+    def _render_username_availability(self, username: str) -> None:
+        if not username:
+            return
+        try:
+            if self.auth_service.is_username_available(username):
+                st.caption(f"✅ '{username}' is available")
+            else:
+                st.caption(f"❌ '{username}' is already taken")
+        except AuthenticationError as e:
+            st.caption(f"⚠️ {e}")
+
 class MainPage(BasePage):
     def render(self) -> None:
         if st.session_state.get('show_animation', False):
             self.show_animation()
-        else:
-            self.show_dashboard()
+        self.show_dashboard()
 
     def show_animation(self) -> None:
+        """
+        Play the post-login animation as a self-dismissing overlay.
+
+        The overlay fades out on the client, so the script keeps running and
+        renders the dashboard underneath while the project data is loaded in
+        the background.
+        """
         try:
+            self.services.executor.submit(self.services.project_store.warm_up)
+
             st.markdown('<div class="stApp">', unsafe_allow_html=True)
-            current_dir = Path(__file__).parent.parent
-            logo_path = current_dir / "statics" / "image" / "logo_grey.png"
-            
-            if not logo_path.exists():
-                st.error(f"Logo not found at: {logo_path}")
-                return
-            
-            with open(logo_path, "rb") as f:
-                logo_contents = f.read()
-                logo_data_url = f"data:image/png;base64,{base64.b64encode(logo_contents).decode()}"
-            
-            st.markdown(Styles.get_animation_css(), unsafe_allow_html=True)
-            st.markdown(Styles.get_animation_html(logo_data_url), unsafe_allow_html=True)
-            
-            time.sleep(Settings.ANIMATION_DURATION)
+            assets = self.services.assets
+            logo_url = assets.image_url("logo_grey.png", Settings.LOGO_DISPLAY_WIDTH)
+            st.markdown(
+                assets.animation_css(Settings.ANIMATION_DURATION, Settings.ANIMATION_FADE_OUT),
+                unsafe_allow_html=True
+            )
+            st.markdown(assets.animation_html(logo_url), unsafe_allow_html=True)
             
+        except Exception as e:
+            st.error(f"Animation error: {str(e)}")
+        finally:
             st.session_state.update({
                 'show_animation': False,
                 'animation_complete': True
             })
-            st.rerun()
-            
-        except Exception as e:
-            st.error(f"Animation error: {str(e)}")
-            st.session_state['show_animation'] = False
-            st.rerun()
 
     def show_dashboard(self) -> None:
         # Sidebar with navigation and user info
@@ -169,6 +187,14 @@ class MainPage(BasePage):
                 """,
                 height=800,
             )
+        elif selected_page == "Companies":
+            CompaniesPage(self.services).render()
+        elif selected_page == "Financial Reports":
+            FinancialReportsPage(self.services).render()
+        elif selected_page == "Document Center":
+            DocumentCenterPage(self.services).render()
+        elif selected_page == "Investment Tracking":
+            InvestmentTrackingPage(self.services).render()
         else:
             st.title(selected_page)
             st.write(f"{selected_page} content coming soon...")
@@ -1,7 +1,22 @@
 class Styles:
     @staticmethod
-    def get_animation_css() -> str:
-        return """
+    def get_animation_css(duration: float, fade_out: float = 0.6) -> str:
+        """
+        Animation styles. The overlay dismisses itself in the browser after
+        `duration` seconds, so the server never waits for it.
+        """
+        return f"""
+        <style>
+            .animation-container {{
+                animation: overlayOut {fade_out}s ease-in {duration}s forwards;
+            }}
+
+            @keyframes overlayOut {{
+                from {{ opacity: 1; visibility: visible; }}
+                to {{ opacity: 0; visibility: hidden; pointer-events: none; }}
+            }}
+        </style>
+        """ + """
         <style>
             .animation-container {
                 display: flex;
@@ -0,0 +1,72 @@
+# utils/bloom_filter.py
+import hashlib
+import math
+from typing import Iterable
+
+class BloomFilter:
+    """
+    Compact probabilistic set membership filter.
+
+    A negative answer is exact; a positive answer means "possibly present"
+    and must be confirmed against the authoritative data.
+
+    Attributes:
+        capacity (int): Number of items the filter is sized for
+        error_rate (float): Target false-positive rate at full capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        """
+        Build a filter pre-populated with the given items
+
+        Args:
+            items: Items to add
+            capacity: Number of items the filter is sized for
+            error_rate: Target false-positive rate at full capacity
+
+        Returns:
+            BloomFilter: Populated filter
+        """
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str):
+        """Derive bit positions with double hashing over a single digest"""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter"""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def is_saturated(self) -> bool:
+        """True once more items were added than the filter was sized for"""
+        return self._count > self.capacity
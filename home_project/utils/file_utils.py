@@ -0,0 +1,26 @@
+# utils/file_utils.py
+import os
+from pathlib import Path
+
+def fsync_directory(path) -> None:
+    """Persist a rename on filesystems that need the directory synced"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace a file with data via a synced temporary file and a rename"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_directory(path.parent)
@@ -0,0 +1,191 @@
+# utils/profiler.py
+import functools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from config.settings import settings
+
+@dataclass
+class OperationStats:
+    """Aggregated measurements for one named operation"""
+    count: int = 0
+    durations: Deque[float] = field(default_factory=lambda: deque(maxlen=settings.PROFILER_HISTORY))
+    bytes_read: int = 0
+    bytes_written: int = 0
+    parse_time: float = 0.0
+
+@dataclass
+class RerunProfile:
+    """Wall time of one top-level unit (rerun or fragment rerun) and its breakdown"""
+    label: str
+    started_at: datetime
+    duration: float
+    breakdown: Dict[str, float] = field(default_factory=dict)
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+class _NullSpan:
+    """Shared no-op span handed out while profiling is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("profiler", "name", "start", "profile")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+        self.profile: Optional[RerunProfile] = None
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        if not stack:
+            # A span with no parent is a rerun of its own
+            self.profile = RerunProfile(self.name, datetime.now(), 0.0)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack()
+        stack.pop()
+        self.profiler._finish(self, elapsed, stack)
+        return False
+
+class Profiler:
+    """
+    Process-wide wall-time profiler.
+
+    Spans nest per thread; a span opened with no enclosing span is recorded
+    as a rerun in a ring buffer together with the time spent in each nested
+    operation. Every span and I/O record also feeds per-operation stats.
+    When disabled, span() returns a shared no-op object and record_io()
+    returns immediately.
+
+    Attributes:
+        enabled (bool): Whether measurements are recorded
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 500):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._operations: Dict[str, OperationStats] = {}
+        self._reruns: Deque[RerunProfile] = deque(maxlen=history)
+
+    def span(self, name: str):
+        """Context manager timing one operation"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def profiled(self, name: str) -> Callable:
+        """Decorator timing every call of a function as a span"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_io(self, name: str, bytes_read: int = 0, bytes_written: int = 0, parse_time: float = 0.0) -> None:
+        """
+        Record storage I/O for an operation
+
+        Args:
+            name (str): Operation name, e.g. "ProjectStore.read"
+            bytes_read (int): Bytes read from storage
+            bytes_written (int): Bytes written to storage
+            parse_time (float): Seconds spent decoding or encoding
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._operations.setdefault(name, OperationStats())
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
+            stats.parse_time += parse_time
+        stack = self._stack()
+        if stack:
+            profile = stack[0].profile
+            profile.bytes_read += bytes_read
+            profile.bytes_written += bytes_written
+
+    def operation_stats(self) -> List[Dict]:
+        """
+        Latency percentiles and I/O totals per operation
+
+        Returns:
+            List[Dict]: One row per operation, slowest p95 first
+        """
+        with self._lock:
+            items = [(name, stats, sorted(stats.durations)) for name, stats in self._operations.items()]
+        rows = [
+            {
+                "operation": name,
+                "count": stats.count,
+                "p50_ms": _percentile(durations, 50) * 1000,
+                "p95_ms": _percentile(durations, 95) * 1000,
+                "p99_ms": _percentile(durations, 99) * 1000,
+                "bytes_read": stats.bytes_read,
+                "bytes_written": stats.bytes_written,
+                "parse_ms": stats.parse_time * 1000,
+            }
+            for name, stats, durations in items
+        ]
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def slowest_reruns(self, limit: int = 10) -> List[RerunProfile]:
+        """The slowest reruns still held in the ring buffer"""
+        with self._lock:
+            reruns = list(self._reruns)
+        return sorted(reruns, key=lambda r: r.duration, reverse=True)[:limit]
+
+    def reset(self) -> None:
+        """Discard all measurements"""
+        with self._lock:
+            self._operations.clear()
+            self._reruns.clear()
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: _Span, elapsed: float, stack: List[_Span]) -> None:
+        with self._lock:
+            stats = self._operations.setdefault(span.name, OperationStats())
+            stats.count += 1
+            stats.durations.append(elapsed)
+            if span.profile is not None:
+                span.profile.duration = elapsed
+                self._reruns.append(span.profile)
+        if stack:
+            breakdown = stack[0].profile.breakdown
+            breakdown[span.name] = breakdown.get(span.name, 0.0) + elapsed
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+profiler = Profiler(enabled=settings.PROFILING_ENABLED, history=settings.PROFILER_HISTORY)
@@ -0,0 +1,55 @@
+# utils/timing.py
+import time
+from collections import deque
+from typing import Optional
+
+import streamlit as st
+from config.settings import settings
+from utils.profiler import profiler
+
+class Timer:
+    """
+    Context manager measuring the wall time of one interaction.
+
+    Each measurement is appended to a per-session history so full reruns
+    and fragment reruns can be compared side by side, and is reported to
+    the process-wide profiler as a span.
+
+    Attributes:
+        label (str): Name of the measured unit, e.g. "rerun" or "fragment:overview"
+        elapsed (Optional[float]): Seconds taken, set on exit
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.elapsed: Optional[float] = None
+        self._start = 0.0
+        self._span = None
+
+    def __enter__(self) -> "Timer":
+        self._span = profiler.span(self.label)
+        self._span.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        self._span.__exit__(*exc_info)
+        record_timing(self.label, self.elapsed)
+
+def record_timing(label: str, seconds: float) -> None:
+    """Append a measurement to the session's timing history"""
+    history = st.session_state.get('interaction_timings')
+    if history is None:
+        history = deque(maxlen=settings.TIMING_HISTORY)
+        st.session_state['interaction_timings'] = history
+    history.append((label, seconds))
+
+def render_timings() -> None:
+    """Show recent interaction latencies in the sidebar when enabled"""
+    if not settings.SHOW_TIMINGS:
+        return
+    history = st.session_state.get('interaction_timings') or []
+    with st.sidebar.expander("⏱ Interaction latency"):
+        for label, seconds in reversed(history):
+            st.text(f"{label:<24} {seconds * 1000:8.1f} ms")